@@ -1,5 +1,5 @@
-from fastapi import FastAPI, File, UploadFile, Body, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, Form, UploadFile, Body, Header, HTTPException, Query, WebSocket
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from dotenv import load_dotenv
@@ -10,9 +10,25 @@ from services.impl.whisper_service_impl import WhisperServiceImpl
 from services.impl.intent_service_impl import IntentServiceImpl
 from services.impl.voice_agent_service_impl import VoiceAgentServiceImpl
 from services.impl.order_service_impl import OrderServiceImpl
-from constants.app_constants import DEFAULT_REPLY
+from services.impl.order_stores.base import InvalidCursorError
+from services.impl.order_event_service_impl import order_event_service
+from services.impl.analytics_service_impl import AnalyticsServiceImpl
+from services.impl.menu_service_impl import menu_service, MenuLoadError
+from services.impl.branch_service_impl import branch_service, current_branch, UnknownBranchError
+from services.impl import json_codec
+from services.impl.json_codec import FastJSONResponse
+from services.impl.twilio_media_stream_service_impl import TwilioMediaStreamServiceImpl
+from services.impl.session_service_impl import SessionServiceImpl
+from services.impl.metrics_service_impl import metrics_service, PROMETHEUS_CONTENT_TYPE
+from services.impl.tracing_service_impl import tracing_service
+from services.impl.admission_service_impl import AdmissionServiceImpl, AdmissionRejectedError
+from fastapi.concurrency import run_in_threadpool
+from constants.app_constants import DEFAULT_REPLY, SESSION_ID_HEADER, TRACE_ID_HEADER, BRANCH_HEADER, BRANCH_PATH_PREFIX
+from constants.telephony_constants import TWILIO_MEDIA_STREAM_PATH
+from constants.order_constants import ORDER_PAGE_SIZE, ORDER_PAGE_SIZE_MAX, ANALYTICS_DEFAULT_HOURS, ANALYTICS_HOURLY_RETENTION_HOURS
 from fastapi import Request
 import uuid
+from datetime import datetime
 
 try:
     load_dotenv()
@@ -26,6 +42,7 @@ app = FastAPI(
     title="Syrian Arabic AI Voice Agent API",
     description="A simple API for Charco Chicken's Arabic voice assistant. Provides endpoints for voice, order, and intent processing.",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json"
@@ -39,16 +56,70 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Give every request a trace ID; slow requests are logged with their span tree"""
+    trace_id = request.headers.get(TRACE_ID_HEADER) or uuid.uuid4().hex
+    with tracing_service.trace(f"{request.method} {request.url.path}", trace_id):
+        response = await call_next(request)
+    response.headers[TRACE_ID_HEADER] = trace_id
+    return response
+
+@app.middleware("http")
+async def select_branch(request: Request, call_next):
+    """Serve the request as the branch named by /branch/{branch_id}/... or the X-Branch-ID header"""
+    branch_id = request.headers.get(BRANCH_HEADER)
+    path = request.scope["path"]
+    if path.startswith(BRANCH_PATH_PREFIX):
+        branch_id, _, rest = path[len(BRANCH_PATH_PREFIX):].partition("/")
+        # Route the rest of the path as usual
+        request.scope["path"] = "/" + rest
+        request.scope["raw_path"] = request.scope["path"].encode("utf-8")
+    try:
+        with branch_service.use(branch_id):
+            return await call_next(request)
+    except UnknownBranchError as e:
+        return FastJSONResponse({"error": f"الفرع غير موجود: {e.branch_id}"}, status_code=404)
+
+@app.exception_handler(AdmissionRejectedError)
+async def admission_rejected(request: Request, exc: AdmissionRejectedError):
+    return FastJSONResponse(
+        {"error": "الخدمة مشغولة حالياً، يرجى المحاولة بعد قليل."},
+        status_code=503,
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # ========== Dependency Injection ==========
 tts_service = TTSServiceImpl()
 whisper_service = WhisperServiceImpl()
 intent_service = IntentServiceImpl()
-voice_agent_service = VoiceAgentServiceImpl(tts_service, whisper_service, intent_service)
-order_service = OrderServiceImpl()
+session_service = SessionServiceImpl()
+admission_service = AdmissionServiceImpl()
+order_service = OrderServiceImpl(event_service=order_event_service)
+# Orders placed before lines carried a unit price are priced from their own branch's menu
+analytics_service = AnalyticsServiceImpl(prices=menu_service.catalog.price_texts,
+                                         branch_prices=lambda branch_id: branch_service.get(branch_id).catalog.prices,
+                                         source=order_service.export_orders)
+analytics_service.rebuild(order_service.export_orders())
+order_event_service.add_listener(analytics_service.record)
+# Events come from the store's change feed, so every worker's stream and
+# analytics see every worker's writes
+order_event_service.follow(order_service.store)
+voice_agent_service = VoiceAgentServiceImpl(tts_service, whisper_service, intent_service, session_service,
+                                            order_service=order_service)
+twilio_media_stream_service = TwilioMediaStreamServiceImpl(whisper_service, voice_agent_service, tts_service,
+                                                           admission_service=admission_service)
 
 orders_db = []
 
 
+def resolve_session_id(*candidates) -> str:
+    """Return the first session ID the client sent, or open a new session"""
+    for candidate in candidates:
+        if candidate:
+            return session_service.get_or_create(candidate).session_id
+    return session_service.get_or_create().session_id
+
 
 # ========== Routes ==========
 
@@ -65,13 +136,24 @@ async def health_check():
     "/voice-agent",
     summary="Process Arabic audio",
     description="Takes an audio file in Arabic and returns a transcription, intent, and audio reply.",
-    response_description="A JSON object with transcription, intent, reply_text, and audio_base64."
+    response_description="A JSON object with transcription, intent, reply_text, audio_base64 and session_id."
 )
-async def handle_audio_request(file: UploadFile = File(...)):
+async def handle_audio_request(
+    file: UploadFile = File(...),
+    session_id: str = Form(None),
+    x_session_id: str = Header(None, alias=SESSION_ID_HEADER)
+):
     try:
-        audio_bytes = await file.read()
-        response = await voice_agent_service.handle_audio_request(audio_bytes)
-        return response
+        # A slow upload must not hold a model slot, so read it first
+        with tracing_service.span("upload_read"):
+            audio_bytes = await file.read()
+        session_id = resolve_session_id(session_id, x_session_id)
+        async with admission_service.slot("voice-agent"):
+            response = await voice_agent_service.handle_audio_request(audio_bytes, session_id)
+        with tracing_service.span("serialize"):
+            return FastJSONResponse(response)
+    except AdmissionRejectedError:
+        raise
     except Exception as e:
         print(f"[ERROR] {e}")
         raise HTTPException(status_code=500, detail="Internal server error.")
@@ -79,7 +161,7 @@ async def handle_audio_request(file: UploadFile = File(...)):
 @app.post(
     "/submit-order",
     summary="Submit a customer order",
-    description="Submit an order with name, items, and optional dialog history.",
+    description="Submit an order with name and items, and optionally lines with quantities and modifiers. With a session_id, a missing name and items are taken from the server-side dialog session, and missing lines from the session's lines for the ordered items; dialog_history is still accepted from older clients.",
     response_description="Order confirmation with order_id and eta."
 )
 async def submit_order(
@@ -88,7 +170,7 @@ async def submit_order(
         example={
             "name": "أحمد",
             "order": ["دجاج مشوي", "بطاطا مقلية"],
-            "dialog_history": ["مرحبا", "أريد طلب دجاج مشوي"]
+            "session_id": "3f1c2b7e9a8d4c6b"
         },
         description="Example order body for Swagger UI. Ignored by backend logic."
     )
@@ -96,26 +178,83 @@ async def submit_order(
     data = await request.json()
     name = data.get("name")
     order = data.get("order")
+    lines = data.get("lines")
     dialog_history = data.get("dialog_history", [])
-    response_dict, status_code = order_service.process_order_api_request(name, order, dialog_history)
-    return JSONResponse(response_dict, status_code=status_code)
+    session = session_service.get(data.get("session_id") or request.headers.get(SESSION_ID_HEADER))
+    if session:
+        name = name or session.name
+        if not order and not lines:
+            order = list(session.items)
+        if not lines:
+            # Quantities and modifiers of the ordered items, as heard over the session
+            lines = [dict(line) for line in session.lines if line["item"] in order]
+    # The order write blocks until its group commit is on disk; keep it off the event loop
+    response_dict, status_code = await run_in_threadpool(
+        order_service.process_order_api_request, name, order, dialog_history, lines
+    )
+    if session and status_code == 200:
+        session_service.record_order(session.session_id, response_dict)
+    return FastJSONResponse(response_dict, status_code=status_code)
+
+def parse_time_filter(value: str, field: str) -> str:
+    """Normalize an ISO date/time query parameter so it compares with stored timestamps"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {field}: expected an ISO date or datetime.")
 
 @app.get(
     "/list-orders",
-    summary="List all orders",
-    description="Retrieve all orders from the database.",
-    response_description="A list of all orders."
+    summary="List orders",
+    description="Retrieve one page of orders sorted by time, optionally filtered by status, customer name and time range (since inclusive, until exclusive). Pass next_cursor back as cursor for the following page.",
+    response_description="A page of orders and the cursor for the next page (null on the last page)."
 )
-async def list_orders():
+async def list_orders(
+    status: str = None,
+    name: str = None,
+    since: str = None,
+    until: str = None,
+    cursor: str = None,
+    limit: int = Query(ORDER_PAGE_SIZE, ge=1, le=ORDER_PAGE_SIZE_MAX)
+):
+    since = parse_time_filter(since, "since")
+    until = parse_time_filter(until, "until")
     try:
-        orders = order_service.list_orders()
-        return JSONResponse({
-            "orders": orders,
-            "total_count": len(orders)
-        })
+        with tracing_service.span("load_orders"):
+            orders, next_cursor = order_service.query_orders(status, name, since, until, cursor, limit)
+    except InvalidCursorError:
+        return FastJSONResponse({"error": "Invalid cursor."}, status_code=400)
     except Exception as e:
         print(f"[ERROR] {e}")
-        return JSONResponse({"error": "Failed to retrieve orders."}, status_code=500)
+        return FastJSONResponse({"error": "Failed to retrieve orders."}, status_code=500)
+    with tracing_service.span("serialize"):
+        return FastJSONResponse({
+            "orders": orders,
+            "count": len(orders),
+            "next_cursor": next_cursor
+        })
+
+@app.get(
+    "/export-orders",
+    summary="Export orders as NDJSON",
+    description="Stream every order matching the same filters as /list-orders, one JSON object per line. Orders are read a page at a time, so the full list is never held in memory.",
+    response_description="application/x-ndjson stream of orders."
+)
+async def export_orders(status: str = None, name: str = None, since: str = None, until: str = None):
+    filters = {
+        "status": status,
+        "name": name,
+        "since": parse_time_filter(since, "since"),
+        "until": parse_time_filter(until, "until"),
+    }
+
+    def ndjson_lines():
+        for order in order_service.export_orders(**filters):
+            yield json_codec.dumps_bytes(order) + b"\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 @app.get(
     "/order/{order_id}",
@@ -127,12 +266,99 @@ async def get_order_by_id(order_id: str):
     try:
         order = order_service.get_order_by_id(order_id)
         if order:
-            return JSONResponse(order)
+            return FastJSONResponse(order)
         else:
-            return JSONResponse({"error": "Order not found."}, status_code=404)
+            return FastJSONResponse({"error": "Order not found."}, status_code=404)
     except Exception as e:
         print(f"[ERROR] {e}")
-        return JSONResponse({"error": "Failed to retrieve order."}, status_code=500)
+        return FastJSONResponse({"error": "Failed to retrieve order."}, status_code=500)
+
+@app.post(
+    "/order/{order_id}/status",
+    summary="Update order status",
+    description="Move an order through pending -> preparing -> ready -> delivered, or to cancelled before it is ready. Each change is appended to the order's status_history.",
+    response_description="The updated order, or an error for unknown orders (404), unknown statuses (400) and disallowed moves (409)."
+)
+async def update_order_status(order_id: str, status: str = Body(..., embed=True)):
+    response_dict, status_code = await run_in_threadpool(
+        order_service.process_status_update_api_request, order_id, status
+    )
+    return FastJSONResponse(response_dict, status_code=status_code)
+
+@app.get(
+    "/orders/stream",
+    summary="Live order feed (SSE)",
+    description="Server-Sent Events stream of order_created and order_updated events, each carrying the full order. Reconnect with the Last-Event-ID header (or last_event_id query parameter) to receive missed events; a reset event means the resume point is gone and the client should reload /list-orders.",
+    response_description="text/event-stream of order events."
+)
+async def stream_orders(
+    last_event_id: str = Query(None),
+    last_event_id_header: str = Header(None, alias="Last-Event-ID")
+):
+    return StreamingResponse(
+        order_event_service.stream(last_event_id_header or last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get(
+    "/analytics",
+    summary="Order analytics",
+    description="Rollups maintained as orders are written: items sold and revenue per item, the last `hours` hourly buckets, hour-of-day and weekday peak curves, and orders per customer. Pass `name` for one customer's order count.",
+    response_description="Analytics summary."
+)
+async def analytics(
+    hours: int = Query(ANALYTICS_DEFAULT_HOURS, ge=0, le=ANALYTICS_HOURLY_RETENTION_HOURS),
+    name: str = None
+):
+    return FastJSONResponse(analytics_service.summary(hours, name))
+
+@app.get(
+    "/branches",
+    summary="List branches",
+    description="The branches served by this process with their contact details and menu versions. Prefix any route with /branch/{branch_id} or send an X-Branch-ID header to use a branch other than the default.",
+    response_description="Default branch ID and the branches."
+)
+async def list_branches():
+    return FastJSONResponse({
+        "default": branch_service.default_id,
+        "branches": [branch.to_dict() for branch in branch_service.branches.values()]
+    })
+
+@app.get(
+    "/menu",
+    summary="Current menu",
+    description="The branch's menu catalog in use: items with numeric and formatted prices, aliases and availability, and the catalog version (a hash of the menu file).",
+    response_description="Menu catalog."
+)
+async def get_menu():
+    return FastJSONResponse(current_branch().catalog.to_dict())
+
+@app.post(
+    "/menu/reload",
+    summary="Reload the menu",
+    description="Re-read the branch's menu file now instead of waiting for the periodic check. The new menu and its match indexes are built in full, then swapped in for subsequent requests.",
+    response_description="The menu version in use and whether it changed, or an error (400) if the file is invalid; the previous menu stays in use."
+)
+async def reload_menu():
+    branch_menu = current_branch().menu_service
+    try:
+        reloaded = await run_in_threadpool(branch_menu.reload, True)
+    except (MenuLoadError, OSError) as e:
+        return FastJSONResponse({"error": str(e), "version": branch_menu.catalog.version}, status_code=400)
+    return FastJSONResponse({"reloaded": reloaded, "version": branch_menu.catalog.version})
+
+@app.get(
+    "/session/{session_id}",
+    summary="Get dialog session",
+    description="Return the server-side dialog state (name, items, last intent, turn count) for a session.",
+    response_description="Session state or error if unknown or expired."
+)
+async def get_session(session_id: str):
+    session = session_service.get(session_id)
+    if not session:
+        return FastJSONResponse({"error": "Session not found."}, status_code=404)
+    return FastJSONResponse(session.to_dict())
 
 @app.post(
     "/detect-intent",
@@ -140,9 +366,16 @@ async def get_order_by_id(order_id: str):
     description="Detect user intent from Arabic text input.",
     response_description="Detected intent and generated reply."
 )
-async def detect_intent_endpoint(text: str = Body(..., embed=True)):
-    result = intent_service.process_intent_request(text, voice_agent_service)
-    return JSONResponse(result)
+async def detect_intent_endpoint(
+    text: str = Body(..., embed=True),
+    session_id: str = Body(None, embed=True),
+    x_session_id: str = Header(None, alias=SESSION_ID_HEADER)
+):
+    session_id = resolve_session_id(session_id, x_session_id)
+    async with admission_service.slot("detect-intent"):
+        result = await run_in_threadpool(intent_service.process_intent_request, text, voice_agent_service, session_id)
+    with tracing_service.span("serialize"):
+        return FastJSONResponse(result)
 
 @app.post(
     "/tts",
@@ -151,8 +384,51 @@ async def detect_intent_endpoint(text: str = Body(..., embed=True)):
     response_description="Base64 encoded audio."
 )
 async def tts_endpoint(text: str = Body(..., embed=True)):
-    audio_base64 = voice_agent_service.generate_audio(text)
-    return JSONResponse({"audio_base64": audio_base64})
+    async with admission_service.slot("tts"):
+        audio_base64 = await run_in_threadpool(voice_agent_service.generate_audio, text)
+    with tracing_service.span("serialize"):
+        return FastJSONResponse({"audio_base64": audio_base64})
+
+@app.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    description="Per-stage latency histograms and cache, error and TTS byte counters in Prometheus text format.",
+    response_description="Prometheus text exposition."
+)
+async def metrics():
+    return Response(content=metrics_service.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.post(
+    "/twilio/voice",
+    summary="Twilio voice webhook",
+    description="Answers an incoming phone call with TwiML that connects it to the media-stream websocket.",
+    response_description="TwiML document."
+)
+async def twilio_voice_webhook(request: Request):
+    stream_path = TWILIO_MEDIA_STREAM_PATH
+    branch_id = current_branch().id
+    if branch_id != branch_service.default_id:
+        # Twilio drops query strings from stream URLs, so the branch goes in the path
+        stream_path = f"{BRANCH_PATH_PREFIX}{branch_id}{TWILIO_MEDIA_STREAM_PATH}"
+    stream_url = os.getenv("TWILIO_STREAM_URL") or f"wss://{request.headers.get('host')}{stream_path}"
+    twiml = TwilioMediaStreamServiceImpl.build_twiml(stream_url)
+    return Response(content=twiml, media_type="application/xml")
+
+@app.websocket(TWILIO_MEDIA_STREAM_PATH)
+@app.websocket(BRANCH_PATH_PREFIX + "{branch_id}" + TWILIO_MEDIA_STREAM_PATH)
+async def twilio_media_stream(websocket: WebSocket, branch_id: str = None):
+    # Websockets skip the HTTP middleware, so the branch comes from the route
+    try:
+        branch = branch_service.get(branch_id)
+    except UnknownBranchError:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    with branch_service.use(branch.id):
+        session = await twilio_media_stream_service.handle_websocket(websocket)
+    if session.reply_latencies:
+        average_ms = sum(session.reply_latencies) / len(session.reply_latencies) * 1000
+        print(f"Call {session.call_sid} ended: {len(session.reply_latencies)} replies, average reply latency {average_ms:.0f} ms")
 
 # ========== Run ==========
 
@@ -0,0 +1,84 @@
+"""
+Fuzzy menu lookup for misheard items: the old scan (SequenceMatcher against
+every menu item for every 1-3 word n-gram of the utterance) against the
+n-gram index with the bit-parallel LCS scorer.
+
+    python benchmarks/bench_fuzzy_match.py --sizes 8 100 1000
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from constants.order_constants import ORDER_KEYWORDS
+from services.impl.text_matching.fuzzy_index import FuzzyMenuIndex
+
+DISHES = ["دجاج", "لحم", "كبة", "فلافل", "شاورما", "بطاطا", "رز", "فتة", "حمص", "متبل", "كباب", "شيش"]
+STYLES = ["مشوي", "مقلي", "بالفرن", "حار", "بالثوم", "عالفحم", "بالجبنة", "سادة", "بالدبس", "محشي"]
+SIZES = ["", "كبير", "وسط", "صغير", "عائلي", "دبل", "سبيشل", "بالخبز", "بالصحن"]
+
+# No exact menu name in these, so extract_order_items reaches the n-gram fallback
+UTTERANCES = [
+    "مرحبا بدي دجاج مشوى وعصيرات وبطاطا لو سمحت",
+    "ممكن تبعتلي شاورمة وصحن رز ومشروب على البيت",
+    "السلام عليكم شو عندكم اليوم من الأكلات الطيبة",
+]
+
+
+def make_menu(size: int, rng: random.Random) -> list:
+    menu = list(ORDER_KEYWORDS[:size])
+    candidates = [f"{dish} {style} {extra}".strip() for dish in DISHES for style in STYLES for extra in SIZES]
+    rng.shuffle(candidates)
+    for name in candidates:
+        if len(menu) >= size:
+            break
+        if name not in menu:
+            menu.append(name)
+    return menu
+
+
+def candidates(text: str) -> list:
+    words = text.split()
+    return [" ".join(words[i:j]) for i in range(len(words)) for j in range(i + 1, min(i + 4, len(words) + 1))
+            if len(" ".join(words[i:j])) > 2]
+
+
+def scan_best_match(candidate: str, menu: list, threshold: float = 0.6):
+    best_match, best_score = None, 0
+    for menu_item in menu:
+        similarity = SequenceMatcher(None, candidate.lower(), menu_item.lower()).ratio()
+        if candidate.lower() in menu_item.lower():
+            similarity = max(similarity, 0.8)
+        if menu_item.lower() in candidate.lower():
+            similarity = max(similarity, 0.9)
+        if similarity > best_score and similarity >= threshold:
+            best_score, best_match = similarity, menu_item
+    return best_match
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 100, 1000])
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    grams = [candidate for text in UTTERANCES for candidate in candidates(text)]
+    print(f"{'items':>6} {'scan':>12} {'index':>12} {'speedup':>8} {'agree':>7}")
+    for size in args.sizes:
+        menu = make_menu(size, rng)
+        index = FuzzyMenuIndex(menu)
+        agree = sum(scan_best_match(g, menu) == index.best_match(g) for g in grams)
+        scan = min(timeit.repeat(lambda: [scan_best_match(g, menu) for g in grams], number=args.number, repeat=3))
+        indexed = min(timeit.repeat(lambda: [index.best_match(g) for g in grams], number=args.number, repeat=3))
+        per_utterance = args.number * len(UTTERANCES) / 1000
+        print(f"{len(menu):>6} {scan / per_utterance:>9.2f} ms {indexed / per_utterance:>9.2f} ms "
+              f"{scan / indexed:>7.1f}x {agree:>3}/{len(grams)}")
+
+
+if __name__ == "__main__":
+    main()
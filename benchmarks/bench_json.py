@@ -0,0 +1,96 @@
+"""
+Stdlib json versus orjson for the payloads this service actually encodes:
+a /list-orders page, a full order snapshot, order log lines, and a
+/voice-agent response carrying base64 audio. Also checks both produce
+identical bytes.
+
+    python benchmarks/bench_json.py --orders 10000 --audio-kb 256
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def make_order(i: int) -> dict:
+    return {
+        "order_id": str(i).zfill(5),
+        "name": "أحمد",
+        "items": ["دجاج مشوي", "بطاطا مقلية"],
+        "eta": "15 دقيقة",
+        "timestamp": "2025-07-27T11:24:50.426451",
+        "status": "pending",
+        "status_history": [{"status": "pending", "at": "2025-07-27T11:24:50.426451"}],
+    }
+
+
+def stdlib_dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def legacy_snapshot_dumps(obj) -> bytes:
+    """How orders.json used to be written"""
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def bench(label: str, payload, repeat: int, encoders: dict):
+    results = {}
+    for name, encode in encoders.items():
+        seconds = min(timeit.repeat(lambda: encode(payload), number=1, repeat=repeat))
+        results[name] = seconds
+    baseline = results["stdlib"]
+    cells = "  ".join(f"{name} {seconds * 1000:>9.3f} ms ({baseline / seconds:>5.1f}x)" for name, seconds in results.items())
+    print(f"{label:<28} {cells}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=10000, help="Orders in the snapshot payload")
+    parser.add_argument("--audio-kb", type=int, default=256, help="Size of the audio behind the base64 payload")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    orders = [make_order(i) for i in range(args.orders)]
+    payloads = {
+        "log line (1 order)": {"op": "put", "order": orders[0]},
+        "list page (50 orders)": {"orders": orders[:50], "count": 50, "next_cursor": "abc"},
+        f"snapshot ({args.orders} orders)": orders,
+        f"voice reply ({args.audio_kb} KB audio)": {
+            "transcription": "بدي دجاج مشوي",
+            "reply_text": "تم استلام طلبك",
+            "audio_base64": base64.b64encode(os.urandom(args.audio_kb * 1024)).decode("ascii"),
+        },
+    }
+    encoders = {"stdlib": stdlib_dumps}
+    if orjson is not None:
+        encoders["orjson"] = orjson.dumps
+        for label, payload in payloads.items():
+            assert orjson.dumps(payload) == stdlib_dumps(payload), f"outputs differ for {label}"
+        print("orjson and stdlib output identical for every payload\n")
+    else:
+        print("orjson not installed; timing the stdlib path only\n")
+
+    print(f"snapshot size: indent=2 {len(legacy_snapshot_dumps(orders)) / 1024:.0f} KB, "
+          f"compact {len(stdlib_dumps(orders)) / 1024:.0f} KB\n")
+    bench(f"snapshot indent=2 (old)", orders, args.repeat, {"stdlib": legacy_snapshot_dumps})
+    for label, payload in payloads.items():
+        bench(label, payload, args.repeat, encoders)
+
+    raw = stdlib_dumps(orders)
+    decoders = {"stdlib": json.loads}
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+    bench(f"parse snapshot", raw, args.repeat, decoders)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Menu item lookup in a transcription: the old per-item `menu_item in text`
+loop against the precompiled Aho-Corasick automaton, for menus of growing
+size (the real menu plus generated items and aliases).
+
+    python benchmarks/bench_menu_matcher.py --sizes 10 100 1000
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from constants.order_constants import ORDER_KEYWORDS
+from services.impl.text_matching.aho_corasick import AhoCorasickMatcher
+
+DISHES = ["دجاج", "لحم", "كبة", "فلافل", "شاورما", "بطاطا", "رز", "فتة", "حمص", "متبل", "كباب", "شيش"]
+STYLES = ["مشوي", "مقلي", "بالفرن", "حار", "بالثوم", "عالفحم", "بالجبنة", "سادة", "بالدبس", "محشي"]
+SIZES = ["", "كبير", "وسط", "صغير", "عائلي", "دبل", "سبيشل", "بالخبز", "بالصحن"]
+
+UTTERANCES = [
+    "مرحبا بدي دجاج مشوي وعصير وبطاطا مقلية لو سمحت",
+    "ممكن تبعتلي تنين شاورما وصحن أرز ومشروب غازي على البيت",
+    "السلام عليكم شو عندكم اليوم من الأكلات",
+]
+
+
+def make_menu(size: int, rng: random.Random) -> list:
+    menu = list(ORDER_KEYWORDS[:size])
+    candidates = [f"{dish} {style} {extra}".strip() for dish in DISHES for style in STYLES for extra in SIZES]
+    rng.shuffle(candidates)
+    for name in candidates:
+        if len(menu) >= size:
+            break
+        if name not in menu:
+            menu.append(name)
+    return menu
+
+
+def naive(menu: list, text: str) -> list:
+    return [item for item in menu if item in text]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'items':>6} {'build':>10} {'naive in-loop':>15} {'automaton':>12} {'speedup':>8}")
+    for size in args.sizes:
+        menu = make_menu(size, rng)
+        build = min(timeit.repeat(lambda: AhoCorasickMatcher(menu), number=1, repeat=5))
+        matcher = AhoCorasickMatcher(menu)
+        for text in UTTERANCES:
+            assert {m.keyword for m in matcher.find_all(text)} == set(naive(menu, text))
+
+        def run_naive():
+            for text in UTTERANCES:
+                naive(menu, text)
+
+        def run_automaton():
+            for text in UTTERANCES:
+                matcher.find(text)
+
+        per_call = len(UTTERANCES) * args.number
+        naive_us = min(timeit.repeat(run_naive, number=args.number, repeat=5)) / per_call * 1e6
+        automaton_us = min(timeit.repeat(run_automaton, number=args.number, repeat=5)) / per_call * 1e6
+        print(f"{len(menu):>6} {build * 1000:>8.2f}ms {naive_us:>12.2f} us {automaton_us:>9.2f} us "
+              f"{naive_us / automaton_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Name extraction on the dataset utterances: the old per-pattern re.search
+chain (plus a regex compiled per dialog message) against the single-pass
+token extractor. Also reports how often each finds the labelled name.
+
+    python benchmarks/bench_name_extraction.py
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from constants.app_constants import NAME_EXTRACTION_STOPWORDS
+from services.impl.text_matching.name_extractor import name_extractor
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', 'resource', 'syrian_arabic_intent_dataset.json')
+
+LEGACY_PATTERNS = [
+    r"اسمي\s+(\w+)",
+    r"أنا\s+(\w+)",
+    r"اسمي\s+(\w+\s+\w+)",
+    r"أنا\s+(\w+\s+\w+)",
+    r"ضيف\s+الطلب\s+باسم\s+(\w+)",
+    r"الطلب\s+باسم\s+(\w+)",
+]
+
+
+def legacy_extract(transcription: str):
+    for pattern in LEGACY_PATTERNS:
+        match = re.search(pattern, transcription)
+        if match:
+            return match.group(1).strip()
+    for word in transcription.split():
+        if word not in NAME_EXTRACTION_STOPWORDS and len(word) > 1:
+            return word
+    return None
+
+
+def legacy_from_dialog(dialog_history: list):
+    for message in reversed(dialog_history):
+        match = re.search(r"اسمي\s+(\w+)", message)
+        if match:
+            return match.group(1)
+    return None
+
+
+def new_from_dialog(dialog_history: list):
+    for message in reversed(dialog_history):
+        name = name_extractor.extract(message, fallback=False)
+        if name:
+            return name
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(DATASET_PATH, encoding="utf-8") as f:
+        dataset = json.load(f)
+    utterances = [row["utterance"] for row in dataset]
+    named = [row for row in dataset if row["target"]["intent"] == "provide_name"]
+    orders = [row["utterance"] for row in dataset if row["target"]["intent"] == "place_order"]
+    dialog = utterances[:9] + ["اسمي أحمد محمد"]
+
+    for label, extract in (("legacy", legacy_extract), ("single-pass", name_extractor.extract)):
+        correct = sum(extract(row["utterance"]) == row["target"]["name"] for row in named)
+        spurious = sum(extract(text) is not None for text in orders)
+        seconds = min(timeit.repeat(lambda: [extract(text) for text in utterances], number=args.number, repeat=3))
+        print(f"{label:<12} {seconds / args.number / len(utterances) * 1e6:6.2f} us/utterance  "
+              f"names {correct}/{len(named)}  names invented for orders {spurious}/{len(orders)}")
+
+    for label, extract in (("legacy", legacy_from_dialog), ("single-pass", new_from_dialog)):
+        seconds = min(timeit.repeat(lambda: extract(dialog), number=args.number * 100, repeat=3))
+        print(f"{label:<12} {seconds / args.number / 100 * 1e6:6.2f} us/10-message dialog  -> {extract(dialog)}")
+
+
+if __name__ == "__main__":
+    main()
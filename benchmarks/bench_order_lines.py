@@ -0,0 +1,91 @@
+"""
+Order lines on the dataset utterances. The dataset orders never state a
+quantity or modifier, so they are also replayed with a quantity word or
+digit put before every item and, for some, a modifier after it. Counts the
+orders read back completely (all quantities and modifiers right): each one
+is a clarification turn ("كم واحد؟") the item-names-only parser needed.
+Also times line parsing against matching the item names alone.
+
+    python benchmarks/bench_order_lines.py
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.impl.menu_service_impl import MenuCatalog
+from services.impl.order_service_impl import OrderServiceImpl
+from services.impl.text_matching.aho_corasick import AhoCorasickMatcher
+from services.impl.text_matching.arabic_normalizer import normalize_arabic
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', 'resource', 'syrian_arabic_intent_dataset.json')
+
+QUANTITIES = [("تنين", 2), ("تلاتة", 3), ("أربع", 4), ("خمسة", 5), ("2", 2), ("٣", 3), ("10", 10)]
+MODIFIERS = [None, None, "بدون بصل", "حار", "زيادة ثوم"]
+
+
+def with_quantities(utterance: str, items: list, rng: random.Random):
+    """The utterance with a quantity before each item, and the lines it should give"""
+    expected = []
+    for item in items:
+        position = utterance.find(item)
+        if position < 0:
+            return None, None
+        word, quantity = rng.choice(QUANTITIES)
+        modifier = rng.choice(MODIFIERS)
+        end = position + len(item)
+        spoken = f"{word} {item}" + (f" {modifier}" if modifier else "")
+        utterance = utterance[:position] + spoken + utterance[end:]
+        expected.append({"item": item, "quantity": quantity, "modifiers": [modifier] if modifier else []})
+    return utterance, expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(DATASET_PATH, encoding="utf-8") as f:
+        dataset = json.load(f)
+    catalog = MenuCatalog.from_constants()
+    orders = [row for row in dataset
+              if row["target"]["intent"] in ("place_order", "provide_name") and row["target"]["items"]]
+
+    stated = sum(any(line.quantity != 1 or line.modifiers
+                     for line in OrderServiceImpl.extract_order_lines(row["utterance"], catalog))
+                 for row in dataset)
+    print(f"dataset as-is: {stated}/{len(dataset)} utterances state a quantity or modifier")
+
+    rng = random.Random(args.seed)
+    replayed, complete, lines_total, lines_right = 0, 0, 0, 0
+    utterances = []
+    for row in orders:
+        utterance, expected = with_quantities(row["utterance"], row["target"]["items"], rng)
+        if utterance is None:
+            continue
+        utterances.append(utterance)
+        replayed += 1
+        lines = [line.to_dict() for line in OrderServiceImpl.extract_order_lines(utterance, catalog)]
+        lines_total += len(expected)
+        lines_right += sum(line in lines for line in expected)
+        complete += lines == expected
+    print(f"with quantities: {replayed} orders, {lines_right}/{lines_total} lines right, "
+          f"{complete}/{replayed} orders complete -> {complete} clarification turns saved "
+          f"({complete / replayed:.2f} per order)")
+
+    names_only = AhoCorasickMatcher({normalize_arabic(name): name for name in catalog.items})
+    for label, extract in (
+        ("item names only", lambda text: names_only.find(normalize_arabic(text))),
+        ("order lines", lambda text: catalog.line_parser.parse(normalize_arabic(text))),
+    ):
+        seconds = min(timeit.repeat(lambda: [extract(text) for text in utterances], number=args.number, repeat=3))
+        print(f"{label:<16} {seconds / args.number / len(utterances) * 1e6:6.2f} us/utterance")
+
+
+if __name__ == "__main__":
+    main()
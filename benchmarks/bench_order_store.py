@@ -0,0 +1,165 @@
+"""
+Compare the legacy order paths (load orders.json, append and rewrite the
+whole file to write; load and scan it to look one order up) with the
+append-only order log and its in-memory index.
+
+    python benchmarks/bench_order_store.py --sizes 10000 100000 1000000
+
+For each history size the store is pre-populated, then `--writes` orders are
+timed through each path, plus one page of pending orders since a given time
+(the kitchen view). Seeded orders have the stored schema: timestamps 30 s
+apart, the newest OPEN_ORDERS pending and the rest delivered. Legacy rewrites
+are sampled (they get very slow at 1M orders) and reported per write.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from constants.app_constants import DEFAULT_BRANCH_ID
+from constants.order_constants import ORDER_ETA, ORDER_PAGE_SIZE, PRICING_MAPPING
+from enums.order_status_enum import OrderStatusEnum
+from services.impl.analytics_service_impl import parse_price
+from services.impl.order_stores.json_log_store import JsonLogOrderStore
+
+PENDING = OrderStatusEnum.PENDING.code
+DELIVERED = OrderStatusEnum.DELIVERED.code
+FIRST_ORDER_AT = datetime(2025, 1, 1, 10, 0)
+NAMES = ["أحمد", "سارة", "محمد", "ليلى", "يوسف"]
+# Orders older than this many are delivered; the rest are still pending
+OPEN_ORDERS = 200
+
+
+def order_timestamp(i: int) -> str:
+    return (FIRST_ORDER_AT + timedelta(seconds=30 * i)).isoformat()
+
+
+def make_order(i: int, status: str = PENDING) -> dict:
+    """An order shaped like OrderServiceImpl.process_order_request writes it, one every 30 s"""
+    timestamp = order_timestamp(i)
+    history = [{"status": PENDING, "at": timestamp}]
+    if status != PENDING:
+        history.append({"status": status, "at": timestamp})
+    lines = [{"item": item, "quantity": 1 + i % 3, "modifiers": [], "unit_price": parse_price(PRICING_MAPPING[item])}
+             for item in ("دجاج مشوي", "بطاطا مقلية")]
+    return {
+        "order_id": str(i),
+        "name": NAMES[i % len(NAMES)],
+        "items": [line["item"] for line in lines],
+        "branch": DEFAULT_BRANCH_ID,
+        "eta": ORDER_ETA,
+        "timestamp": timestamp,
+        "status": status,
+        "status_history": history,
+        "lines": lines,
+    }
+
+
+def seed_snapshot(path: str, size: int):
+    orders = [make_order(i, DELIVERED if i < size - OPEN_ORDERS else PENDING) for i in range(size)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(orders, f, ensure_ascii=False)
+
+
+def bench_legacy(path: str, size: int, writes: int) -> float:
+    """The pre-log write path: read everything, append one, rewrite everything"""
+    start = time.perf_counter()
+    for i in range(writes):
+        with open(path, "r", encoding="utf-8") as f:
+            orders = json.load(f)
+        orders.append(make_order(size + i))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(orders, f, ensure_ascii=False, indent=2)
+    return (time.perf_counter() - start) / writes
+
+
+def bench_log(path: str, size: int, writes: int) -> float:
+    store = JsonLogOrderStore(path, compact_every=0)
+    start = time.perf_counter()
+    for i in range(writes):
+        store.append(make_order(size + i))
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed / writes
+
+
+def bench_legacy_lookup(path: str, size: int, lookups: int) -> float:
+    """The pre-index lookup: parse the whole file, then scan it"""
+    start = time.perf_counter()
+    for i in range(lookups):
+        order_id = str((i * 7919) % size)
+        with open(path, "r", encoding="utf-8") as f:
+            orders = json.load(f)
+        next((order for order in orders if order.get("order_id") == order_id), None)
+    return (time.perf_counter() - start) / lookups
+
+
+def bench_lookup(path: str, size: int, lookups: int) -> float:
+    store = JsonLogOrderStore(path, compact_every=0)
+    start = time.perf_counter()
+    for i in range(lookups):
+        store.get(str((i * 7919) % size))
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed / lookups
+
+
+def bench_legacy_query(path: str, size: int, queries: int) -> float:
+    """The pre-index kitchen view: parse the whole file, filter and sort it"""
+    since = order_timestamp(size - OPEN_ORDERS)
+    start = time.perf_counter()
+    for _ in range(queries):
+        with open(path, "r", encoding="utf-8") as f:
+            orders = json.load(f)
+        page = sorted((order for order in orders
+                       if order.get("status") == PENDING and order.get("timestamp", "") >= since),
+                      key=lambda order: order.get("timestamp", ""))[:ORDER_PAGE_SIZE]
+    return (time.perf_counter() - start) / queries
+
+
+def bench_query(path: str, size: int, queries: int) -> float:
+    """One /list-orders page of pending orders since the open ones started"""
+    store = JsonLogOrderStore(path, compact_every=0)
+    since = order_timestamp(size - OPEN_ORDERS)
+    start = time.perf_counter()
+    for _ in range(queries):
+        page, _ = store.query(status=PENDING, since=since, limit=ORDER_PAGE_SIZE)
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed / queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--writes", type=int, default=1000, help="Orders written through the log per size")
+    parser.add_argument("--legacy-writes", type=int, default=5, help="Orders written through the legacy path per size")
+    parser.add_argument("--lookups", type=int, default=10000, help="get_order_by_id calls through the index per size")
+    parser.add_argument("--queries", type=int, default=200, help="Pending-orders pages through the index per size")
+    args = parser.parse_args()
+
+    header = (f"{'orders':>10} {'legacy ms/write':>16} {'log ms/write':>13} {'legacy ms/get':>14} {'index ms/get':>13}"
+              f" {'legacy ms/page':>15} {'index ms/page':>14}")
+    print(header)
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy_file = os.path.join(tmp, "legacy.json")
+            log_file = os.path.join(tmp, "orders.json")
+            seed_snapshot(legacy_file, size)
+            seed_snapshot(log_file, size)
+            legacy_get = bench_legacy_lookup(legacy_file, size, args.legacy_writes)
+            legacy_page = bench_legacy_query(legacy_file, size, args.legacy_writes)
+            legacy = bench_legacy(legacy_file, size, args.legacy_writes)
+            log = bench_log(log_file, size, args.writes)
+            get = bench_lookup(log_file, size, args.lookups)
+            page = bench_query(log_file, size, args.queries)
+        print(f"{size:>10} {legacy * 1000:>16.2f} {log * 1000:>13.4f} {legacy_get * 1000:>14.2f} {get * 1000:>13.4f}"
+              f" {legacy_page * 1000:>15.2f} {page * 1000:>14.4f}")
+
+if __name__ == "__main__":
+    main()
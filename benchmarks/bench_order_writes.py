@@ -0,0 +1,104 @@
+"""
+Concurrent order writes: orders/sec and lost writes for the legacy
+read-modify-write of orders.json versus the group-commit order log.
+
+    python benchmarks/bench_order_writes.py --processes 4 --threads 8 --orders 200
+
+Each of `--processes` worker processes runs `--threads` threads that each
+place `--orders` orders with unique IDs, all against the same files. Lost
+writes are counted by reloading the store afterwards.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.impl.order_stores.json_log_store import JsonLogOrderStore
+
+
+def make_order(order_id: str) -> dict:
+    return {"order_id": order_id, "name": "أحمد", "items": ["دجاج مشوي"],
+            "timestamp": "2025-01-01T12:00:00", "status": "pending"}
+
+
+def legacy_write(path: str, order: dict):
+    """The pre-log write path, with no locking"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            orders = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        orders = []
+    orders.append(order)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(orders, f, ensure_ascii=False, indent=2)
+
+
+def run_worker(backend: str, path: str, worker: int, threads: int, orders: int):
+    store = JsonLogOrderStore(path) if backend == "log" else None
+    write = store.append if store is not None else (lambda order: legacy_write(path, order))
+
+    def place(thread: int):
+        for i in range(orders):
+            write(make_order(f"{worker}-{thread}-{i}"))
+
+    pool = [threading.Thread(target=place, args=(t,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    if store is not None:
+        store.close()
+
+
+def count_orders(backend: str, path: str) -> int:
+    if backend == "log":
+        store = JsonLogOrderStore(path)
+        count = len(store)
+        store.close()
+        return count
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return len(json.load(f))
+    except json.JSONDecodeError:
+        return 0
+
+
+def bench(backend: str, processes: int, threads: int, orders: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "orders.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([], f)
+        workers = [multiprocessing.Process(target=run_worker, args=(backend, path, w, threads, orders))
+                   for w in range(processes)]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+        expected = processes * threads * orders
+        stored = count_orders(backend, path)
+    print(f"{backend:>7} {expected:>9} {stored:>9} {expected - stored:>6} {expected / elapsed:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--orders", type=int, default=200, help="Orders per thread")
+    parser.add_argument("--legacy-orders", type=int, default=20, help="Orders per thread on the legacy path")
+    args = parser.parse_args()
+
+    print(f"{'path':>7} {'placed':>9} {'stored':>9} {'lost':>6} {'orders/sec':>12}")
+    bench("legacy", args.processes, args.threads, args.legacy_orders)
+    bench("log", args.processes, args.threads, args.orders)
+
+
+if __name__ == "__main__":
+    main()
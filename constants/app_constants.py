@@ -20,18 +20,49 @@ ORDER_EXTRACTION_STOPWORDS = {
     "حابب", "أحب", "أرغب", "من", "لو", "ممكن"
 }
 
-# Name extraction patterns
-NAME_EXTRACTION_PATTERNS = [
-    r"اسمي\s+(\w+)",  # "اسمي أحمد"
-    r"أنا\s+(\w+)",   # "أنا أحمد"
-    r"اسمي\s+(\w+\s+\w+)",  # "اسمي أحمد محمد"
-    r"أنا\s+(\w+\s+\w+)",   # "أنا أحمد محمد"
-    r"ضيف\s+الطلب\s+باسم\s+(\w+)",  # "ضيف الطلب باسم أحمد"
-    r"الطلب\s+باسم\s+(\w+)",  # "الطلب باسم أحمد"
-]
+# Phrases a name follows ("اسمي أحمد", "أنا سارة", "ضيف الطلب باسم نور"); longest phrase wins
+NAME_TRIGGER_PHRASES = ["اسمي", "أنا", "ضيف الطلب باسم", "الطلب باسم"]
+# A name is at most a first name and a family name
+NAME_MAX_WORDS = 2
+# Words that end a name after a trigger ("أنا أحمد و بدي شاورما")
+NAME_TERMINATORS = {"و", "بدي", "أريد", "اطلب", "أطلب", "من", "لو", "ممكن", "فضلك", "سمحت", "رقم", "الطلب"}
 
 # Arabic numerals mapping
 ARABIC_NUMERALS = {
     0: "٠", 1: "١", 2: "٢", 3: "٣", 4: "٤",
     5: "٥", 6: "٦", 7: "٧", 8: "٨", 9: "٩"
-}
\ No newline at end of file
+}
+
+# Server-side dialog sessions
+SESSION_MAX_COUNT = 10000
+SESSION_IDLE_TTL_SECONDS = 30 * 60
+SESSION_ID_HEADER = "X-Session-ID"
+
+# Replies are few and repetitive, so synthesized audio is cached by reply text
+TTS_CACHE_SIZE = 256
+
+# Request tracing: span trees of requests slower than the threshold go to a rotating JSON Lines log
+SLOW_TRACE_THRESHOLD_MS = 2000
+SLOW_TRACE_LOG_PATH = "slow_traces.jsonl"
+SLOW_TRACE_LOG_MAX_BYTES = 10 * 1024 * 1024
+SLOW_TRACE_LOG_BACKUP_COUNT = 5
+TRACE_ID_HEADER = "X-Trace-ID"
+
+# Admission control for the model-backed routes: concurrent requests allowed,
+# requests allowed to wait for a slot, and how long a queued request may wait.
+# Override per route with e.g. ADMISSION_VOICE_AGENT_CONCURRENCY / _QUEUE / _TIMEOUT.
+ADMISSION_LIMITS = {
+    "voice-agent": {"concurrency": 1, "queue": 8, "timeout": 30},
+    "detect-intent": {"concurrency": 2, "queue": 16, "timeout": 15},
+    "tts": {"concurrency": 4, "queue": 16, "timeout": 15},
+}
+ADMISSION_RETRY_AFTER_SECONDS = 5
+
+# Branches: each has its own menu file and contact details, all sharing one set of models.
+# A request picks its branch with the header, or a /branch/{branch_id}/... path prefix.
+BRANCHES_FILE = "resource/branches.json"
+DEFAULT_BRANCH_ID = "main"
+BRANCH_HEADER = "X-Branch-ID"
+BRANCH_PATH_PREFIX = "/branch/"
+# Number given in complaint replies (CUSTOMER_SERVICE_NUMBER is the general enquiries line)
+COMPLAINTS_PHONE = "011-123-4567"
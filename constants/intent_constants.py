@@ -1,4 +1,36 @@
+from constants.app_constants import MENU_KEYWORDS, GREETING_KEYWORDS
+
 MODEL_DIR = "./resource/arat5_intent_model"
 MAX_INPUT_LENGTH = 128
 MAX_OUTPUT_LENGTH = 64
-NUM_BEAMS = 4 
\ No newline at end of file
+NUM_BEAMS = 4 
+
+# Keyword categories the intent handlers branch on, compiled into one router
+# at startup. Spelling variants are folded by the Arabic normalizer and
+# keywords match inside longer words ("الغي" in "ألغيت"), so list each word
+# once, in its shortest form.
+INTENT_KEYWORDS = {
+    "greeting": GREETING_KEYWORDS,
+    "menu_request": MENU_KEYWORDS,
+    "question_hours": ["مواعيد", "ساعات العمل", "متى"],
+    "question_phone": ["رقم", "هاتف", "اتصال"],
+    "question_address": ["عنوان", "موقع", "اين"],
+    "question_prices": ["اسعار", "سعر", "التكلفة", "كم يكلف"],
+    "question_price_list": ["قائمة الاسعار"],
+    "cancel_explicit": ["إلغاء", "ألغى"],
+    "cancel_unwanted": ["لا أريد", "بدي ألغى", "بدي إلغاء"],
+    "cancel_change": ["تغيير", "غير", "بدل"],
+    "complaint_delay": ["تأخر", "بطيء", "بطيئ"],
+    "complaint_error": ["خطأ", "غلط", "مشكلة", "مشاكل"],
+    "complaint_bad_experience": ["سيء", "رديء", "مزعج"],
+    "complaint_price": ["سعر", "غالي", "مكلف", "تكلفة"],
+    "complaint_quality": ["جودة", "طعام", "مذاق", "طعم"],
+    "gratitude_thanks": ["شكرا", "مشكور", "أشكرك"],
+    "gratitude_greeting": ["أهلا", "مرحبا"],
+    "gratitude_praise": ["ممتاز", "رائع", "جميل", "حلو"],
+}
+
+# Installed packages can add intent handlers under this entry point group:
+#   [project.entry-points."charco_voice_agent.intent_handlers"]
+#   ask_eta = "my_plugin.handlers:AskEtaHandler"
+INTENT_HANDLER_ENTRY_POINT_GROUP = "charco_voice_agent.intent_handlers"
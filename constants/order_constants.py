@@ -13,4 +13,96 @@ PRICING_MAPPING = {
     "دجاج مقلي": "27,000 ليرة"
 }
 
-ORDER_ETA = '15 دقيقة' 
\ No newline at end of file
+ORDER_ETA = '15 دقيقة' 
+
+# Append-only order log (orders.json is the compacted snapshot)
+ORDERS_FILE = "orders.json"
+# Writes queued together are committed with one fsync; under concurrent load the
+# writer also waits this long for more orders to join the batch
+ORDER_LOG_GROUP_COMMIT_WINDOW_SECONDS = 0.002
+ORDER_LOG_GROUP_COMMIT_MAX = 256
+ORDER_LOG_COMPACT_EVERY = 10000
+
+# Order store backend: "json" (orders.json + log, shared by workers through a
+# file lock on POSIX) or "sqlite" (shared by workers through the database)
+ORDER_STORE_BACKEND = "json"
+ORDER_DB_FILE = "orders.db"
+ORDER_DB_BUSY_TIMEOUT_MS = 5000
+# Change feed: the latest writes each store keeps, numbered in write order, so every
+# worker's /orders/stream and analytics see writes made by the others
+ORDER_CHANGE_HISTORY_SIZE = 1000
+
+# /list-orders pagination; exports stream in pages of ORDER_EXPORT_PAGE_SIZE
+ORDER_PAGE_SIZE = 50
+ORDER_PAGE_SIZE_MAX = 500
+ORDER_EXPORT_PAGE_SIZE = 500
+
+# Order IDs: a persisted counter, reserved ORDER_ID_BLOCK_SIZE numbers at a time per process
+ORDER_ID_DIGITS = 5
+ORDER_ID_BLOCK_SIZE = 20
+
+# Allowed order status moves: pending -> preparing -> ready -> delivered, cancel until ready
+ORDER_STATUS_TRANSITIONS = {
+    "pending": ("preparing", "cancelled"),
+    "preparing": ("ready", "cancelled"),
+    "ready": ("delivered",),
+    "delivered": (),
+    "cancelled": (),
+}
+
+# /orders/stream: recent events kept for Last-Event-ID resume, and per-subscriber buffer
+ORDER_EVENT_HISTORY_SIZE = 1000
+ORDER_EVENT_SUBSCRIBER_BUFFER = 100
+ORDER_EVENT_KEEPALIVE_SECONDS = 15
+# How often each worker reads the store's change feed for other workers' writes
+ORDER_EVENT_POLL_SECONDS = 0.25
+
+# Analytics rollups: hourly buckets kept for /analytics (older ones are dropped)
+ANALYTICS_HOURLY_RETENTION_HOURS = 24 * 30
+ANALYTICS_DEFAULT_HOURS = 24
+ANALYTICS_CURRENCY = "ليرة"
+
+# Menu catalog (items, aliases, prices, availability); reloaded when the file changes.
+# ORDER_KEYWORDS / PRICING_MAPPING above are the built-in menu used if it cannot be read.
+MENU_FILE = "resource/menu.json"
+MENU_RELOAD_CHECK_SECONDS = 5
+
+# Order lines: spoken quantities ("تنين شاورما", "3 عصير") and simple modifiers.
+# Spellings are folded by normalize_arabic, so one form per word is enough.
+ORDER_QUANTITY_WORDS = {
+    "واحد": 1, "وحدة": 1, "واحدة": 1,
+    "اثنين": 2, "اتنين": 2, "تنين": 2, "تنتين": 2, "ثنتين": 2,
+    "ثلاث": 3, "ثلاثة": 3, "تلات": 3, "تلاتة": 3,
+    "أربع": 4, "أربعة": 4,
+    "خمس": 5, "خمسة": 5,
+    "ست": 6, "ستة": 6,
+    "سبع": 7, "سبعة": 7,
+    "ثمان": 8, "ثمانية": 8, "تمانية": 8, "تماني": 8,
+    "تسع": 9, "تسعة": 9,
+    "عشر": 10, "عشرة": 10,
+    "حدعش": 11, "احدعش": 11, "اتنعش": 12, "تنعش": 12, "اطنعش": 12,
+    "تلتعش": 13, "تلطعش": 13, "أربعتعش": 14, "أربعطعش": 14, "خمستعش": 15, "خمسطعش": 15,
+    "ستعش": 16, "سطعش": 16, "سبعتعش": 17, "سبعطعش": 17, "تمنتعش": 18, "تمنطعش": 18,
+    "تسعتعش": 19, "تسعطعش": 19,
+    "عشرين": 20, "ثلاثين": 30, "تلاتين": 30, "أربعين": 40, "خمسين": 50,
+    "ستين": 60, "سبعين": 70, "ثمانين": 80, "تمانين": 80, "تسعين": 90,
+    "مية": 100, "مئة": 100,
+}
+# Counting words that may stand between an item and its trailing number ("شاورما حبات تلاتة")
+ORDER_QUANTITY_UNIT_WORDS = [
+    "حبة", "حبات", "قطعة", "قطع", "صحن", "صحون", "سندويشة", "سندويشات", "كاسة", "كاسات", "علبة", "علب",
+]
+# Quantities above this are asked about again instead of being taken as said
+ORDER_LINE_MAX_QUANTITY = 50
+# Numbers this large are prices or phone numbers, not quantities, and are ignored
+ORDER_LINE_IGNORED_NUMBER = 1000
+# Modifier words that take the next word as their object ("بدون ثوم"), by canonical form
+ORDER_MODIFIER_PREFIXES = {
+    "بدون": "بدون", "بلا": "بدون", "من غير": "بدون",
+    "زيادة": "زيادة", "اكسترا": "زيادة",
+}
+# Modifiers on their own ("شاورما حار"), by canonical form
+ORDER_MODIFIER_WORDS = {
+    "حار": "حار", "سبايسي": "حار",
+    "كبير": "كبير", "صغير": "صغير", "وسط": "وسط",
+}
@@ -0,0 +1,57 @@
+from constants.app_constants import ORDER_ETA
+from constants.order_constants import ORDER_LINE_MAX_QUANTITY
+
+# Every reply the intent handlers give, by key. Menu and branch slots
+# ({menu_text}, {menu_names}, {price_list}, {price_list_lines}, {hours},
+# {phone}, {address}, {complaints_phone}, {eta}, {max_quantity}) are filled in once per menu
+# version; the rest ({items}, {name}, ...) per reply.
+REPLY_TEMPLATES = {
+    # greeting_and_menu_request
+    "greeting_and_menu": "أهلاً وسهلاً بك! عندنا قائمة متنوعة من الأطباق الشهية:\n\n{menu_text}\n\nشو بتحب تجرب؟",
+    "menu": "أهلاً! عندنا قائمة متنوعة من الأطباق الشهية:\n\n{menu_text}\n\nشو بتحب تجرب؟",
+    "greeting": "أهلاً وسهلاً بك في مطعمنا! كيف يمكنني مساعدتك اليوم؟",
+
+    # place_order / provide_name
+    "items_unavailable": "عذراً، {missing_items} غير متوفر حالياً. الأطباق المتوفرة لدينا: {menu_names}. يرجى اختيار صنف من القائمة المتوفرة.",
+    "no_items": "أهلاً! الأطباق المتوفرة لدينا: {menu_names}. من فضلك أخبرني ماذا تريد أن تطلب.",
+    "ask_quantity": "كم {items} بدك بالضبط؟ منقدر نحضّر لحد {max_quantity} من كل صنف.",
+    "ask_name": "ممتاز! {items} متوفر لدينا. من فضلك أخبرني باسمك لإكمال الطلب.",
+    "order_received": "تم استلام طلبك {items}! رقم الطلب: [سيتم تحديده], الوقت المتوقع: {eta}",
+    "ask_order_and_name": "يرجى تحديد الطلب واسمك لإكمال العملية.",
+    "item_unavailable": "عذراً، الصنف المطلوب غير متوفر. الأطباق المتوفرة لدينا: {menu_names}.",
+    "welcome_name": "أهلاً {name}! الأطباق المتوفرة لدينا: {menu_names}. ما الذي ترغب بطلبه اليوم؟",
+    "ask_name_only": "يرجى تزويدي باسمك.",
+
+    # question
+    "hours": "{hours}",
+    "phone": "رقم خدمة العملاء هو {phone}.",
+    "address": "عنواننا: {address}.",
+    "prices": "أسعارنا كالتالي: {price_list}. الأسعار تشمل الضريبة!",
+    "price_list": "قائمة الأسعار الكاملة:\n{price_list_lines}",
+    "question_unclear": "سؤالك مهم! يرجى توضيح السؤال أو التواصل مع خدمة العملاء.",
+
+    # complaint
+    "complaint_delay": "عذراً على التأخير! نحن نعمل بجد لتسريع الطلبات. الوقت المتوقع للطلبات هو 15-20 دقيقة. إذا كان طلبك متأخر أكثر من ذلك، يرجى الاتصال بنا على الرقم: {complaints_phone}",
+    "complaint_error": "عذراً على المشكلة! نحن نعتذر عن أي إزعاج. يرجى الاتصال بنا على الرقم: {complaints_phone} وسنحل المشكلة فوراً",
+    "complaint_bad_experience": "نعتذر بشدة عن التجربة السيئة! نحن نعمل على تحسين خدمتنا باستمرار. يرجى الاتصال بنا على الرقم: {complaints_phone} لنسمع منك ونحسن خدمتنا",
+    "complaint_price": "نفهم قلقك بخصوص الأسعار! نحن نقدم أفضل جودة بأفضل سعر ممكن. يمكنك الاطلاع على قائمة الأسعار أو الاتصال بنا للمناقشة",
+    "complaint_quality": "نعتذر إذا لم تكن جودة الطعام كما توقعتم! نحن نستخدم أفضل المكونات الطازجة. يرجى الاتصال بنا على الرقم: {complaints_phone} لنسمع ملاحظاتكم",
+    "complaint_other": "نعتذر عن أي إزعاج! نحن هنا لمساعدتك. يرجى الاتصال بنا على الرقم: {complaints_phone} أو زيارة مطعمنا مباشرة لنحل المشكلة",
+
+    # gratitude
+    "gratitude_thanks": "نحنا بخدمتك دايماً! إن شاء الله يعجبك طلبك الجاي.",
+    "gratitude_greeting": "أهلاً وسهلاً بك! كيف يمكنني مساعدتك اليوم؟",
+    "gratitude_praise": "شكراً لك! نحن سعداء أن نقدم لك أفضل خدمة ممكنة.",
+
+    # cancel_order
+    "cancel_ask_order_id": "يرجى ذكر رقم الطلب الذي تريد إلغاءه.",
+    "cancel_explicit": "تم إلغاء طلبك. إذا كنت تريد إعادة الطلب، يمكنك طلب جديد في أي وقت.",
+    "cancel_unwanted": "فهمت! تم إلغاء طلبك. إذا غيرت رأيك، يمكنك طلب جديد في أي وقت.",
+    "cancel_change": "إذا كنت تريد تغيير طلبك، يمكنك طلب جديد بالتفاصيل المطلوبة.",
+    "cancelled": "تم إلغاء طلبك. شكراً لك!",
+    "cancel_not_found": "لم أجد طلباً بالرقم {order_id}. يرجى التأكد من رقم الطلب.",
+    "cancel_not_allowed": "عذراً، لا يمكن إلغاء الطلب {order_id} لأنه {status}.",
+}
+
+# Slots with a fixed value for every menu version
+REPLY_STATIC_SLOTS = {"eta": ORDER_ETA, "max_quantity": ORDER_LINE_MAX_QUANTITY}
@@ -0,0 +1,18 @@
+TWILIO_SAMPLE_RATE = 8000
+WHISPER_SAMPLE_RATE = 16000
+TWILIO_FRAME_BYTES = 160  # 20 ms of 8 kHz mu-law audio
+
+# Voice activity detection (energy based, measured on decoded 16-bit PCM)
+SPEECH_RMS_THRESHOLD = 500
+SPEECH_PREROLL_MS = 200
+END_OF_UTTERANCE_SILENCE_MS = 700
+MIN_UTTERANCE_MS = 300
+MAX_UTTERANCE_MS = 15000
+
+# ElevenLabs can render straight to the format Twilio plays back
+TTS_TELEPHONY_OUTPUT_FORMAT = "ulaw_8000"
+
+# Phone replies run the same models as /voice-agent, so they queue for its admission slots
+TELEPHONY_ADMISSION_ROUTE = "voice-agent"
+
+TWILIO_MEDIA_STREAM_PATH = "/twilio/media-stream"
@@ -0,0 +1,24 @@
+from enum import Enum
+
+class OrderStatusEnum(Enum):
+    PENDING = ("pending", "قيد الانتظار")
+    PREPARING = ("preparing", "قيد التحضير")
+    READY = ("ready", "جاهز")
+    DELIVERED = ("delivered", "تم التسليم")
+    CANCELLED = ("cancelled", "ملغى")
+
+    def __init__(self, code, arabic):
+        self.code = code
+        self.arabic = arabic
+
+    @classmethod
+    def from_code(cls, code):
+        for status in cls:
+            if status.code == code:
+                return status
+        return None
+
+    @classmethod
+    def get_arabic(cls, code):
+        status = cls.from_code(code)
+        return status.arabic if status else code
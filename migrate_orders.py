@@ -0,0 +1,38 @@
+"""
+One-shot migration of the JSON order store (orders.json plus its append-only
+log) into the SQLite order store. Safe to re-run: orders are upserted by ID.
+
+    python migrate_orders.py                              # orders.json -> orders.db
+    python migrate_orders.py --source old.json --db prod.db
+
+Then start the API with ORDER_STORE=sqlite.
+"""
+import argparse
+
+from constants.order_constants import ORDERS_FILE, ORDER_DB_FILE
+from services.impl.order_stores.json_log_store import JsonLogOrderStore
+from services.impl.order_stores.sqlite_store import SqliteOrderStore
+
+
+def migrate(source: str, db_file: str) -> int:
+    source_store = JsonLogOrderStore(source)
+    target_store = SqliteOrderStore(db_file)
+    try:
+        return target_store.bulk_insert(source_store.list())
+    finally:
+        source_store.close()
+        target_store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate orders.json into the SQLite order store")
+    parser.add_argument("--source", default=ORDERS_FILE, help="JSON order snapshot to read")
+    parser.add_argument("--db", default=ORDER_DB_FILE, help="SQLite database to write")
+    args = parser.parse_args()
+
+    count = migrate(args.source, args.db)
+    print(f"Migrated {count} orders from {args.source} to {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from constants.app_constants import ADMISSION_LIMITS, ADMISSION_RETRY_AFTER_SECONDS
+from services.impl.metrics_service_impl import metrics_service as default_metrics_service
+
+
+class AdmissionRejectedError(Exception):
+    def __init__(self, route: str, reason: str, retry_after: int):
+        super().__init__(f"{route} is overloaded ({reason})")
+        self.route = route
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limit with a bounded wait queue. Requests beyond
+    `concurrency` wait for a slot; once `queue` requests are already waiting,
+    or a request has waited `timeout` seconds, it is rejected straight away
+    instead of adding to everyone's latency.
+    """
+
+    def __init__(self, route: str, concurrency: int, queue: int, timeout: float,
+                 retry_after: int = ADMISSION_RETRY_AFTER_SECONDS, metrics_service=None):
+        self.route = route
+        self.concurrency = concurrency
+        self.queue = queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.metrics_service = metrics_service or default_metrics_service
+        self.waiting = 0
+        self.in_flight = 0
+        self._semaphore = None
+        self._queue_depth = self.metrics_service.gauge(
+            "admission_queue_depth", "Requests waiting for a model slot")
+        self._in_flight_gauge = self.metrics_service.gauge(
+            "admission_in_flight", "Requests holding a model slot")
+        self._rejections = self.metrics_service.counter(
+            "admission_rejections_total", "Requests rejected with 503 by admission control")
+        self._wait_time = self.metrics_service.histogram(
+            "admission_wait_seconds", "Time spent queued for a model slot")
+
+    def _reject(self, reason: str):
+        self._rejections.inc(route=self.route, reason=reason)
+        raise AdmissionRejectedError(self.route, reason, self.retry_after)
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        if not self._semaphore.locked():
+            # Free slot: acquire() completes without yielding
+            await self._semaphore.acquire()
+            self._wait_time.observe(0, route=self.route)
+        else:
+            if self.waiting >= self.queue:
+                self._reject("queue_full")
+            start = time.perf_counter()
+            self.waiting += 1
+            self._queue_depth.set(self.waiting, route=self.route)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self._reject("timeout")
+            finally:
+                self.waiting -= 1
+                self._queue_depth.set(self.waiting, route=self.route)
+            self._wait_time.observe(time.perf_counter() - start, route=self.route)
+
+        self.in_flight += 1
+        self._in_flight_gauge.set(self.in_flight, route=self.route)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._in_flight_gauge.set(self.in_flight, route=self.route)
+            self._semaphore.release()
+
+
+class AdmissionServiceImpl:
+    def __init__(self, limits: Dict[str, dict] = None, metrics_service=None):
+        self.limiters: Dict[str, AdmissionLimiter] = {}
+        for route, config in (limits or ADMISSION_LIMITS).items():
+            config = self._apply_env_overrides(route, config)
+            self.limiters[route] = AdmissionLimiter(
+                route, config["concurrency"], config["queue"], config["timeout"],
+                metrics_service=metrics_service
+            )
+
+    @staticmethod
+    def _apply_env_overrides(route: str, config: dict) -> dict:
+        prefix = "ADMISSION_" + route.upper().replace("-", "_")
+        return {
+            "concurrency": int(os.getenv(f"{prefix}_CONCURRENCY", config["concurrency"])),
+            "queue": int(os.getenv(f"{prefix}_QUEUE", config["queue"])),
+            "timeout": float(os.getenv(f"{prefix}_TIMEOUT", config["timeout"])),
+        }
+
+    def slot(self, route: str):
+        return self.limiters[route].slot()
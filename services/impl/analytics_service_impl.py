@@ -0,0 +1,177 @@
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, Mapping, Optional
+
+from constants.order_constants import (
+    PRICING_MAPPING, ANALYTICS_HOURLY_RETENTION_HOURS, ANALYTICS_DEFAULT_HOURS, ANALYTICS_CURRENCY
+)
+from enums.order_status_enum import OrderStatusEnum
+from services.impl.order_event_service_impl import ORDER_CREATED, ORDER_UPDATED, ORDER_EVENTS_RESET
+
+
+def parse_price(price: str) -> int:
+    """"25,000 ليرة" -> 25000"""
+    digits = re.sub(r"[^0-9]", "", price or "")
+    return int(digits) if digits else 0
+
+
+class AnalyticsServiceImpl:
+    """
+    Order rollups kept up to date as orders are written: per-item counts and
+    revenue, per-hour buckets, an hour-of-day and weekday peak-time curve,
+    and orders per customer. Every write is a handful of dict updates, and
+    /analytics reads the rollups without touching order history. A
+    cancelled order's items and revenue are taken back out. `rebuild()`
+    recomputes everything from the order store.
+
+    Revenue uses the unit price stored on each order line when the order
+    was placed, so menu reloads don't change past totals. Older orders
+    without one are priced from their branch's current menu
+    (`branch_prices`), or from `prices`.
+
+    The rollups are fed by order events. When the event service follows
+    the order store, those are every worker's writes, so each worker's
+    rollups cover all orders. A reset event means the feed skipped writes;
+    the rollups are then rebuilt from `source`, the order store's orders.
+    """
+
+    def __init__(self, prices: Dict[str, str] = None,
+                 hourly_retention: int = ANALYTICS_HOURLY_RETENTION_HOURS,
+                 branch_prices: Callable[[Optional[str]], Mapping[str, int]] = None,
+                 source: Callable[[], Iterable[Dict]] = None):
+        self.prices = {item: parse_price(price) for item, price in (prices or PRICING_MAPPING).items()}
+        self.branch_prices = branch_prices
+        self.source = source
+        self.hourly_retention = hourly_retention
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _menu_prices(self, order: Dict) -> Mapping[str, int]:
+        """Current menu prices for an order placed before lines carried their unit price"""
+        if self.branch_prices:
+            try:
+                return self.branch_prices(order.get("branch"))
+            except LookupError:
+                pass
+        return self.prices
+
+    def _reset(self):
+        self.orders = 0
+        self.cancelled = 0
+        self.revenue = 0
+        self.items: Dict[str, Dict[str, int]] = {}
+        self.hourly: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+        self.hour_of_day = [0] * 24
+        self.weekday_hour = [[0] * 24 for _ in range(7)]
+        self.customers: Dict[str, int] = {}
+        # Number of customers who have placed exactly N orders
+        self.orders_per_customer: Dict[int, int] = {}
+
+    def _hour_bucket(self, hour: str, create: bool):
+        bucket = self.hourly.get(hour)
+        if bucket is None and create:
+            bucket = self.hourly[hour] = {"orders": 0, "items": 0, "revenue": 0}
+            if len(self.hourly) > self.hourly_retention:
+                # Orders arrive (and are rebuilt) in time order, so the first bucket is the oldest
+                self.hourly.popitem(last=False)
+        return bucket
+
+    def _add_items(self, order: Dict, bucket: Dict, sign: int):
+        lines = order.get("lines")
+        if not lines:
+            # Orders placed before order lines existed: one of each item
+            lines = [{"item": item} for item in order.get("items") or []]
+        menu_prices = None
+        for line in lines:
+            item = line["item"]
+            unit_price = line.get("unit_price")
+            if unit_price is None:
+                menu_prices = menu_prices or self._menu_prices(order)
+                unit_price = menu_prices.get(item, 0)
+            count = sign * line.get("quantity", 1)
+            revenue = count * unit_price
+            stats = self.items.setdefault(item, {"count": 0, "revenue": 0})
+            stats["count"] += count
+            stats["revenue"] += revenue
+            self.revenue += revenue
+            if bucket is not None:
+                bucket["items"] += count
+                bucket["revenue"] += revenue
+
+    def _add_order(self, order: Dict):
+        timestamp = order.get("timestamp") or ""
+        self.orders += 1
+        bucket = None
+        try:
+            placed = datetime.fromisoformat(timestamp)
+        except ValueError:
+            placed = None
+        if placed is not None:
+            bucket = self._hour_bucket(timestamp[:13], create=True)
+            bucket["orders"] += 1
+            self.hour_of_day[placed.hour] += 1
+            self.weekday_hour[placed.weekday()][placed.hour] += 1
+        self._add_items(order, bucket, 1)
+
+        name = order.get("name")
+        if name:
+            count = self.customers.get(name, 0) + 1
+            self.customers[name] = count
+            if count > 1:
+                self.orders_per_customer[count - 1] -= 1
+                if not self.orders_per_customer[count - 1]:
+                    del self.orders_per_customer[count - 1]
+            self.orders_per_customer[count] = self.orders_per_customer.get(count, 0) + 1
+
+    def _cancel_order(self, order: Dict):
+        self.cancelled += 1
+        bucket = self._hour_bucket((order.get("timestamp") or "")[:13], create=False)
+        self._add_items(order, bucket, -1)
+
+    def record(self, event):
+        """Order event listener"""
+        if event.type == ORDER_EVENTS_RESET:
+            if self.source is not None:
+                self.rebuild(self.source())
+            return
+        with self._lock:
+            if event.type == ORDER_CREATED:
+                self._add_order(event.order)
+            elif event.type == ORDER_UPDATED and event.order.get("status") == OrderStatusEnum.CANCELLED.code:
+                # Cancelled is terminal, so this fires once per order
+                self._cancel_order(event.order)
+
+    def rebuild(self, orders: Iterable[Dict]):
+        """Recompute the rollups from the current orders, e.g. at startup"""
+        with self._lock:
+            self._reset()
+            for order in orders:
+                self._add_order(order)
+                if order.get("status") == OrderStatusEnum.CANCELLED.code:
+                    self._cancel_order(order)
+
+    def summary(self, hours: int = ANALYTICS_DEFAULT_HOURS, name: str = None) -> Dict:
+        """Rollups for /analytics; cost depends on menu size and `hours`, not on order history"""
+        with self._lock:
+            recent = list(islice(reversed(self.hourly.items()), hours))[::-1]
+            summary = {
+                "orders": self.orders,
+                "cancelled": self.cancelled,
+                "revenue": self.revenue,
+                "currency": ANALYTICS_CURRENCY,
+                "items": {item: dict(stats) for item, stats in self.items.items() if stats["count"]},
+                "hourly": [{"hour": hour, **bucket} for hour, bucket in recent],
+                "peak_hours": list(self.hour_of_day),
+                "peak_weekday_hours": [list(row) for row in self.weekday_hour],
+                "customers": {
+                    "total": len(self.customers),
+                    "orders_per_customer": {str(count): customers
+                                            for count, customers in sorted(self.orders_per_customer.items())},
+                },
+            }
+            if name:
+                summary["customer"] = {"name": name, "orders": self.customers.get(name, 0)}
+            return summary
@@ -0,0 +1,116 @@
+import json
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from constants.app_constants import (
+    BRANCHES_FILE, DEFAULT_BRANCH_ID, CUSTOMER_SERVICE_NUMBER, CUSTOMER_SERVICE_HOURS, CUSTOMER_SERVICE_ADDRESS,
+    COMPLAINTS_PHONE
+)
+from services.impl.menu_service_impl import MenuCatalog, MenuServiceImpl, menu_service as default_menu_service
+
+
+class UnknownBranchError(LookupError):
+    def __init__(self, branch_id: str):
+        super().__init__(f"Unknown branch {branch_id}")
+        self.branch_id = branch_id
+
+
+class Branch:
+    __slots__ = ("id", "name", "phone", "complaints_phone", "hours", "address", "menu_service")
+
+    def __init__(self, branch_id: str, menu_service: MenuServiceImpl, name: str = None,
+                 phone: str = CUSTOMER_SERVICE_NUMBER, complaints_phone: str = COMPLAINTS_PHONE,
+                 hours: str = CUSTOMER_SERVICE_HOURS, address: str = CUSTOMER_SERVICE_ADDRESS):
+        self.id = branch_id
+        self.name = name or branch_id
+        self.phone = phone
+        self.complaints_phone = complaints_phone
+        self.hours = hours
+        self.address = address
+        self.menu_service = menu_service
+
+    @property
+    def catalog(self) -> MenuCatalog:
+        return self.menu_service.catalog
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "phone": self.phone,
+            "complaints_phone": self.complaints_phone,
+            "hours": self.hours,
+            "address": self.address,
+            "menu_version": self.catalog.version,
+        }
+
+
+_current_branch: ContextVar[Optional[Branch]] = ContextVar("current_branch", default=None)
+
+
+class BranchServiceImpl:
+    """
+    Per-branch configuration: contact details and a menu service each, so
+    every branch has its own catalog, match indexes and reply strings while
+    the speech and intent models stay loaded once per process. The branch
+    for a request is set with `use()` and read anywhere below it with
+    `current()`; code outside a request gets the default branch.
+    """
+
+    def __init__(self, branches_file: str = None, menu_service: MenuServiceImpl = None):
+        self.branches_file = branches_file or os.getenv("BRANCHES_FILE", BRANCHES_FILE)
+        self.branches: Dict[str, Branch] = {}
+        shared_menu = menu_service or default_menu_service
+        try:
+            with open(self.branches_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            config = {}
+        except ValueError as e:
+            print(f"Warning: {self.branches_file} is not valid JSON, serving the default branch only: {e}")
+            config = {}
+        self.default_id = config.get("default", DEFAULT_BRANCH_ID)
+        # Menu services are shared by branches that use the same menu file
+        menus = {os.path.abspath(shared_menu.menu_file): shared_menu}
+        for branch_id, settings in config.get("branches", {}).items():
+            settings = dict(settings)
+            menu_file = os.path.abspath(settings.pop("menu_file", shared_menu.menu_file))
+            if menu_file not in menus:
+                menus[menu_file] = MenuServiceImpl(menu_file)
+            self.branches[branch_id] = Branch(branch_id, menus[menu_file], **settings)
+        if self.default_id not in self.branches:
+            self.branches[self.default_id] = Branch(self.default_id, shared_menu)
+
+    @property
+    def default(self) -> Branch:
+        return self.branches[self.default_id]
+
+    def get(self, branch_id: str = None) -> Branch:
+        if not branch_id:
+            return self.default
+        branch = self.branches.get(branch_id)
+        if branch is None:
+            raise UnknownBranchError(branch_id)
+        return branch
+
+    def current(self) -> Branch:
+        return _current_branch.get() or self.default
+
+    @contextmanager
+    def use(self, branch_id: str = None):
+        """Run the block as `branch_id` (the default branch if empty)"""
+        token = _current_branch.set(self.get(branch_id))
+        try:
+            yield _current_branch.get()
+        finally:
+            _current_branch.reset(token)
+
+
+# Shared by app.py, the order service and the intent handlers
+branch_service = BranchServiceImpl()
+
+
+def current_branch() -> Branch:
+    return branch_service.current()
@@ -1,27 +1,77 @@
+import re
 from .base import IntentHandler
+from .registry import intent_handler_registry
 from constants.app_constants import DEFAULT_REPLY
 from enums.intent_enum import IntentEnum
+from enums.order_status_enum import OrderStatusEnum
+from services.impl.order_service_impl import OrderNotFoundError, InvalidStatusTransitionError
+from services.impl.order_stores.order_id_allocator import to_arabic_digits
+from services.impl.reply_service_impl import reply_service
+from services.impl.text_matching.arabic_normalizer import normalize_arabic
+from services.impl.text_matching.keyword_router import intent_keyword_router
 
+# Order IDs are read out as five or more digits, in either digit set
+ORDER_ID_PATTERN = re.compile(r"[0-9٠-٩]{5,}")
+
+@intent_handler_registry.register(IntentEnum.CANCEL_ORDER.code)
 class CancelOrderHandler(IntentHandler):
+    @staticmethod
+    def find_order_id(transcription, intent_info):
+        """An order number spoken in this turn, else the session's last order"""
+        match = ORDER_ID_PATTERN.search(transcription)
+        if match:
+            return to_arabic_digits(match.group(0))
+        return intent_info.get("last_order_id")
+
+    @staticmethod
+    def may_cancel(order_id, intent_info, order_service) -> bool:
+        """
+        Whether the caller may cancel the order: the one placed in this
+        session, or a spoken number whose order carries the caller's name.
+        Order numbers are sequential, so a number alone proves nothing.
+        """
+        if order_id == intent_info.get("last_order_id"):
+            return True
+        name = intent_info.get("name")
+        order = order_service.get_order_by_id(order_id) if name else None
+        return bool(order) and normalize_arabic(order.get("name") or "").strip() == normalize_arabic(name).strip()
+
     def handle(self, transcription, intent_info, service) -> dict:
         order_is_valid = False
         reply_text = intent_info.get("reply_text", DEFAULT_REPLY)
-        lower_trans = transcription.lower()
+        order_id = self.find_order_id(transcription, intent_info)
+        keywords = intent_keyword_router.route(transcription)
         
-        # Handle different types of order cancellation
-        if any(word in lower_trans for word in ["إلغاء", "إلغي", "ألغى", "ألغيت"]):
-            reply_text = "تم إلغاء طلبك. إذا كنت تريد إعادة الطلب، يمكنك طلب جديد في أي وقت."
-        elif any(word in lower_trans for word in ["لا أريد", "لا اريد", "بدي ألغى", "بدي إلغاء"]):
-            reply_text = "فهمت! تم إلغاء طلبك. إذا غيرت رأيك، يمكنك طلب جديد في أي وقت."
-        elif any(word in lower_trans for word in ["تغيير", "غير", "بدل"]):
-            reply_text = "إذا كنت تريد تغيير طلبك، يمكنك طلب جديد بالتفاصيل المطلوبة."
+        if "cancel_change" in keywords and keywords.isdisjoint(("cancel_explicit", "cancel_unwanted")):
+            # Changing an order ("بدي غير الطلب") is a new order, not a cancellation; "غير" is also
+            # the modifier "من غير", so nothing is cancelled here
+            reply_text = reply_service.render("cancel_change")
+        elif not order_id:
+            reply_text = reply_service.render("cancel_ask_order_id")
+        elif not self.may_cancel(order_id, intent_info, service.order_service):
+            # Same reply as an unknown number, so other customers' orders can't be probed
+            reply_text = reply_service.render("cancel_not_found", order_id=order_id)
         else:
-            reply_text = "تم إلغاء طلبك. شكراً لك!"
+            try:
+                service.order_service.cancel_order(order_id)
+                # Handle different types of order cancellation
+                if "cancel_explicit" in keywords:
+                    reply_text = reply_service.render("cancel_explicit")
+                elif "cancel_unwanted" in keywords:
+                    reply_text = reply_service.render("cancel_unwanted")
+                else:
+                    reply_text = reply_service.render("cancelled")
+            except OrderNotFoundError:
+                reply_text = reply_service.render("cancel_not_found", order_id=order_id)
+            except InvalidStatusTransitionError as e:
+                reply_text = reply_service.render("cancel_not_allowed", order_id=order_id,
+                                                  status=OrderStatusEnum.get_arabic(e.current))
         
         return {
             "intent": IntentEnum.CANCEL_ORDER.code,
             "name": intent_info.get("name"),
             "items": [],  # Cancellation doesn't need order items
+            "order_id": order_id,
             "reply_text": reply_text,
             "order_is_valid": order_is_valid
-        } 
\ No newline at end of file
+        }
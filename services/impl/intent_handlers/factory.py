@@ -1,3 +1,4 @@
+# Importing the handler modules registers them
 from .place_order import PlaceOrderHandler
 from .provide_name import ProvideNameHandler
 from .question import QuestionHandler
@@ -6,10 +7,11 @@ from .complaint import ComplaintHandler
 from .gratitude import GratitudeHandler
 from .cancel_order import CancelOrderHandler
 from .base import IntentHandler
-from enums.intent_enum import IntentEnum
+from .registry import intent_handler_registry
 from constants.app_constants import DEFAULT_REPLY
 from services.impl.order_service_impl import OrderServiceImpl
 
+@intent_handler_registry.register_default
 class DefaultHandler(IntentHandler):
     def handle(self, transcription, intent_info, service) -> dict:
         intent_type = intent_info.get("intent", "")
@@ -27,23 +29,10 @@ class DefaultHandler(IntentHandler):
             "order_is_valid": False
         }
 
+intent_handler_registry.load_entry_points()
+
 class IntentHandlerFactory:
     @staticmethod
     def get_handler(intent_type):
-        match intent_type:
-            case IntentEnum.PLACE_ORDER.code:
-                return PlaceOrderHandler()
-            case IntentEnum.PROVIDE_NAME.code:
-                return ProvideNameHandler()
-            case IntentEnum.QUESTION.code:
-                return QuestionHandler()
-            case IntentEnum.GREETING_AND_MENU_REQUEST.code:
-                return GreetingAndMenuRequestHandler()
-            case IntentEnum.COMPLAINT.code:
-                return ComplaintHandler()
-            case IntentEnum.GRATITUDE.code:
-                return GratitudeHandler()
-            case IntentEnum.CANCEL_ORDER.code:
-                return CancelOrderHandler()
-            case _:
-                return DefaultHandler() 
\ No newline at end of file
+        """The registered handler for the intent, or DefaultHandler; shared, not created per call"""
+        return intent_handler_registry.get_handler(intent_type)
@@ -1,23 +1,27 @@
 from .base import IntentHandler
+from .registry import intent_handler_registry
 from constants.app_constants import DEFAULT_REPLY
 from enums.intent_enum import IntentEnum
+from services.impl.reply_service_impl import reply_service
+from services.impl.text_matching.keyword_router import intent_keyword_router
 
+@intent_handler_registry.register(IntentEnum.GRATITUDE.code)
 class GratitudeHandler(IntentHandler):
     def handle(self, transcription, intent_info, service) -> dict:
         order_is_valid = False
         reply_text = intent_info.get("reply_text", DEFAULT_REPLY)
-        lower_trans = transcription.lower()
+        keywords = intent_keyword_router.route(transcription)
         intent_name_arabic =IntentEnum.GRATITUDE.code
         # Handle different types of gratitude expressions
-        if any(word in lower_trans for word in ["شكرا", "شكراً", "مشكور", "مشكورة", "أشكرك", "أشكركم"]):
-            reply_text = "نحنا بخدمتك دايماً! إن شاء الله يعجبك طلبك الجاي."
-        elif any(word in lower_trans for word in ["أهلا", "أهلاً", "مرحبا", "مرحباً"]):
-            reply_text = "أهلاً وسهلاً بك! كيف يمكنني مساعدتك اليوم؟"
+        if "gratitude_thanks" in keywords:
+            reply_text = reply_service.render("gratitude_thanks")
+        elif "gratitude_greeting" in keywords:
+            reply_text = reply_service.render("gratitude_greeting")
             intent_name_arabic = "ترحيب"
-        elif any(word in lower_trans for word in ["ممتاز", "رائع", "جميل", "حلو"]):
-            reply_text = "شكراً لك! نحن سعداء أن نقدم لك أفضل خدمة ممكنة."
+        elif "gratitude_praise" in keywords:
+            reply_text = reply_service.render("gratitude_praise")
         else:
-            reply_text = "نحنا بخدمتك دايماً! إن شاء الله يعجبك طلبك الجاي."
+            reply_text = reply_service.render("gratitude_thanks")
         
         return {
             "intent": intent_name_arabic,
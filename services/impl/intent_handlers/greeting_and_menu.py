@@ -1,30 +1,31 @@
 from .base import IntentHandler
-from constants.order_constants import ORDER_KEYWORDS
-from constants.app_constants import DEFAULT_REPLY, MENU_KEYWORDS, GREETING_KEYWORDS
+from .registry import intent_handler_registry
+from constants.app_constants import DEFAULT_REPLY
 from enums.intent_enum import IntentEnum
 from services.impl.order_service_impl import OrderServiceImpl
+from services.impl.branch_service_impl import current_branch
+from services.impl.reply_service_impl import reply_service
+from services.impl.text_matching.keyword_router import intent_keyword_router
 
+@intent_handler_registry.register(IntentEnum.GREETING_AND_MENU_REQUEST.code)
 class GreetingAndMenuRequestHandler(IntentHandler):
     def handle(self, transcription, intent_info, service) -> dict:
         order_is_valid = False
         reply_text = intent_info.get("reply_text", DEFAULT_REPLY)
-        lower_trans = transcription.lower()
-        has_menu_request = any(keyword in lower_trans for keyword in MENU_KEYWORDS)
-        has_greeting = any(keyword in lower_trans for keyword in GREETING_KEYWORDS)
+        catalog = current_branch().catalog
+        keywords = intent_keyword_router.route(transcription)
+        has_menu_request = "menu_request" in keywords
+        has_greeting = "greeting" in keywords
         if has_menu_request and has_greeting:
-            menu_items = [f"🍽️ {item}" for item in ORDER_KEYWORDS]
-            menu_text = "، ".join(menu_items)
-            reply_text = f"أهلاً وسهلاً بك! عندنا قائمة متنوعة من الأطباق الشهية:\n\n{menu_text}\n\nشو بتحب تجرب؟"
+            reply_text = reply_service.render("greeting_and_menu")
         elif has_menu_request:
-            menu_items = [f"🍽️ {item}" for item in ORDER_KEYWORDS]
-            menu_text = "، ".join(menu_items)
-            reply_text = f"أهلاً! عندنا قائمة متنوعة من الأطباق الشهية:\n\n{menu_text}\n\nشو بتحب تجرب؟"
+            reply_text = reply_service.render("menu")
         else:
-            reply_text = "أهلاً وسهلاً بك في مطعمنا! كيف يمكنني مساعدتك اليوم؟"
+            reply_text = reply_service.render("greeting")
         return {
             "intent": IntentEnum.GREETING_AND_MENU_REQUEST.code,
             "name": intent_info.get("name"),
-            "items": OrderServiceImpl.extract_order_items(transcription),
+            "items": OrderServiceImpl.extract_order_items(transcription, catalog),
             "reply_text": reply_text,
             "order_is_valid": order_is_valid
         } 
\ No newline at end of file
@@ -1,43 +1,53 @@
 from .base import IntentHandler
-from constants.order_constants import ORDER_KEYWORDS, PRICING_MAPPING
-from constants.app_constants import DEFAULT_REPLY, ORDER_ETA
+from .registry import intent_handler_registry
+from enums.intent_enum import IntentEnum
+from constants.app_constants import DEFAULT_REPLY
 from services.impl.order_service_impl import OrderServiceImpl
+from services.impl.branch_service_impl import current_branch
+from services.impl.reply_service_impl import reply_service
 
+@intent_handler_registry.register(IntentEnum.PLACE_ORDER.code)
 class PlaceOrderHandler(IntentHandler):
     def handle(self, transcription, intent_info, service) -> dict:
         name = intent_info.get("name")
-        items = OrderServiceImpl.extract_order_items(transcription)
+        catalog = current_branch().catalog
+        lines = OrderServiceImpl.extract_order_lines(transcription, catalog)
+        items = list(dict.fromkeys(line.item for line in lines))
         order_is_valid = False
         reply_text = intent_info.get("reply_text", DEFAULT_REPLY)
         
         # Check if we found any valid items
-        valid_items = [item for item in items if item in ORDER_KEYWORDS]
-        missing_items = [item for item in items if item not in ORDER_KEYWORDS]
+        valid_lines = [line for line in lines if catalog.is_available(line.item)]
+        valid_items = [item for item in items if catalog.is_available(item)]
+        missing_items = [item for item in items if not catalog.is_available(item)]
         
         if not valid_items and items:
             # No valid items found, show menu
-            menu_list = "، ".join(ORDER_KEYWORDS)
-            reply_text = f"عذراً، {', '.join(missing_items)} غير متوفر حالياً. الأطباق المتوفرة لدينا: {menu_list}. يرجى اختيار صنف من القائمة المتوفرة."
+            reply_text = reply_service.render("items_unavailable", missing_items=', '.join(missing_items))
         elif not valid_items and not items:
             # No items detected at all
-            menu_list = "، ".join(ORDER_KEYWORDS)
-            reply_text = f"أهلاً! الأطباق المتوفرة لدينا: {menu_list}. من فضلك أخبرني ماذا تريد أن تطلب."
+            reply_text = reply_service.render("no_items")
+        elif any(line.quantity_unclear for line in valid_lines):
+            # A quantity above the line maximum is asked about instead of guessed
+            unclear_items = " و ".join(line.item for line in valid_lines if line.quantity_unclear)
+            reply_text = reply_service.render("ask_quantity", items=unclear_items)
         elif not name and valid_items:
             # Valid items found but no name provided
-            items_str = " و ".join(valid_items)
-            reply_text = f"ممتاز! {items_str} متوفر لدينا. من فضلك أخبرني باسمك لإكمال الطلب."
+            items_str = " و ".join(line.describe() for line in valid_lines)
+            reply_text = reply_service.render("ask_name", items=items_str)
         elif valid_items and name:
             # Both valid items and name provided
-            items_str = " و ".join(valid_items)
-            reply_text = f"تم استلام طلبك {items_str}! رقم الطلب: [سيتم تحديده], الوقت المتوقع: {ORDER_ETA}"
+            items_str = " و ".join(line.describe() for line in valid_lines)
+            reply_text = reply_service.render("order_received", items=items_str)
             order_is_valid = True
         else:
-            reply_text = "يرجى تحديد الطلب واسمك لإكمال العملية."
+            reply_text = reply_service.render("ask_order_and_name")
         
         return {
             "intent": "place_order",
             "name": name,
             "items": items,
+            "lines": [line.to_dict() for line in lines],
             "reply_text": reply_text,
             "order_is_valid": order_is_valid
         } 
\ No newline at end of file
@@ -1,8 +1,12 @@
 from .base import IntentHandler
-from constants.order_constants import ORDER_KEYWORDS
-from constants.app_constants import DEFAULT_REPLY, ORDER_ETA
+from .registry import intent_handler_registry
+from enums.intent_enum import IntentEnum
+from constants.app_constants import DEFAULT_REPLY
 from services.impl.order_service_impl import OrderServiceImpl
+from services.impl.branch_service_impl import current_branch
+from services.impl.reply_service_impl import reply_service
 
+@intent_handler_registry.register(IntentEnum.PROVIDE_NAME.code)
 class ProvideNameHandler(IntentHandler):
     def handle(self, transcription, intent_info, service) -> dict:
         # Extract name from transcription if not already provided
@@ -10,30 +14,34 @@ class ProvideNameHandler(IntentHandler):
         if not name:
             name = OrderServiceImpl.extract_name_from_transcription(transcription)
         
-        items = OrderServiceImpl.extract_order_items(transcription)
+        catalog = current_branch().catalog
+        lines = OrderServiceImpl.extract_order_lines(transcription, catalog)
+        items = list(dict.fromkeys(line.item for line in lines))
         order_is_valid = False
         reply_text = intent_info.get("reply_text", DEFAULT_REPLY)
         
         if name and items:
-            valid_items = [item for item in items if item in ORDER_KEYWORDS]
-            if valid_items:
-                items_str = " و ".join(valid_items)
-                reply_text = f"تم استلام طلبك {items_str}! رقم الطلب: [سيتم تحديده], الوقت المتوقع: {ORDER_ETA}"
+            valid_lines = [line for line in lines if catalog.is_available(line.item)]
+            if any(line.quantity_unclear for line in valid_lines):
+                unclear_items = " و ".join(line.item for line in valid_lines if line.quantity_unclear)
+                reply_text = reply_service.render("ask_quantity", items=unclear_items)
+            elif valid_lines:
+                items_str = " و ".join(line.describe() for line in valid_lines)
+                reply_text = reply_service.render("order_received", items=items_str)
                 order_is_valid = True
                 intent_type = "place_order"
             else:
-                menu_list = "، ".join(ORDER_KEYWORDS)
-                reply_text = f"عذراً، الصنف المطلوب غير متوفر. الأطباق المتوفرة لدينا: {menu_list}."
+                reply_text = reply_service.render("item_unavailable")
         elif name:
-            menu_list = "، ".join(ORDER_KEYWORDS)
-            reply_text = f"أهلاً {name}! الأطباق المتوفرة لدينا: {menu_list}. ما الذي ترغب بطلبه اليوم؟"
+            reply_text = reply_service.render("welcome_name", name=name)
         else:
-            reply_text = "يرجى تزويدي باسمك."
+            reply_text = reply_service.render("ask_name_only")
         
         return {
             "intent": "provide_name",
             "name": name,
             "items": items,
+            "lines": [line.to_dict() for line in lines],
             "reply_text": reply_text,
             "order_is_valid": order_is_valid
         } 
\ No newline at end of file
@@ -0,0 +1,89 @@
+import time
+from importlib.metadata import entry_points
+from typing import Callable, Dict, Optional, Type
+
+from constants.intent_constants import INTENT_HANDLER_ENTRY_POINT_GROUP
+from services.impl.metrics_service_impl import metrics_service as default_metrics_service
+from .base import IntentHandler
+
+DEFAULT_HANDLER_LABEL = "default"
+
+
+class IntentHandlerRegistry:
+    """
+    Intent code -> the one handler instance serving it. Handler classes
+    register with the `register` decorator when their module is imported,
+    or from an installed package's entry point, and are instantiated once
+    then; dispatch is a dict lookup. Every call through `invoke` is counted
+    and timed per handler.
+    """
+
+    def __init__(self, metrics_service=None):
+        self.metrics_service = metrics_service or default_metrics_service
+        self._handlers: Dict[str, IntentHandler] = {}
+        self._default: Optional[IntentHandler] = None
+        # handler instance -> metrics label
+        self._labels: Dict[IntentHandler, str] = {}
+        self._invocations = self.metrics_service.counter(
+            "intent_handler_invocations_total", "Intent handler calls by handler")
+        self._errors = self.metrics_service.counter(
+            "intent_handler_errors_total", "Intent handler calls that raised, by handler")
+        self._latency = self.metrics_service.histogram(
+            "intent_handler_duration_seconds", "Intent handler latency by handler")
+
+    def register(self, intent_code: str, replace: bool = False) -> Callable[[Type[IntentHandler]], Type[IntentHandler]]:
+        """Class decorator: serve `intent_code` with one instance of the class"""
+        def decorator(handler_class: Type[IntentHandler]) -> Type[IntentHandler]:
+            if intent_code in self._handlers and not replace:
+                raise ValueError(f"Intent {intent_code} already has a handler")
+            handler = handler_class()
+            self._handlers[intent_code] = handler
+            self._labels[handler] = intent_code
+            return handler_class
+        return decorator
+
+    def register_default(self, handler_class: Type[IntentHandler]) -> Type[IntentHandler]:
+        """Class decorator: serve intents without a handler of their own"""
+        self._default = handler_class()
+        self._labels[self._default] = DEFAULT_HANDLER_LABEL
+        return handler_class
+
+    def load_entry_points(self, group: str = INTENT_HANDLER_ENTRY_POINT_GROUP):
+        """
+        Register handlers from installed packages. An entry point named after
+        an intent code may point at an undecorated handler class, or at a
+        module whose handlers register themselves when imported.
+        """
+        for entry_point in entry_points(group=group):
+            try:
+                loaded = entry_point.load()
+                if isinstance(loaded, type) and issubclass(loaded, IntentHandler):
+                    if entry_point.name not in self._handlers:
+                        self.register(entry_point.name)(loaded)
+            except Exception as e:
+                print(f"Warning: could not load intent handler plugin {entry_point.name}: {e}")
+
+    def intents(self):
+        return tuple(self._handlers)
+
+    def get_handler(self, intent_code: str) -> IntentHandler:
+        return self._handlers.get(intent_code, self._default)
+
+    def invoke(self, handler: IntentHandler, transcription: str, intent_info: dict, service) -> dict:
+        label = self._labels.get(handler, type(handler).__name__)
+        self._invocations.inc(handler=label)
+        start = time.perf_counter()
+        try:
+            return handler.handle(transcription, intent_info, service)
+        except Exception:
+            self._errors.inc(handler=label)
+            raise
+        finally:
+            self._latency.observe(time.perf_counter() - start, handler=label)
+
+    def dispatch(self, intent_code: str, transcription: str, intent_info: dict, service) -> dict:
+        return self.invoke(self.get_handler(intent_code), transcription, intent_info, service)
+
+
+# Handlers register here when their modules are imported (see factory.py)
+intent_handler_registry = IntentHandlerRegistry()
@@ -1,9 +1,11 @@
 import torch
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 from constants.intent_constants import MODEL_DIR, MAX_INPUT_LENGTH, MAX_OUTPUT_LENGTH, NUM_BEAMS
+from services.impl.metrics_service_impl import metrics_service as default_metrics_service
 
 class IntentServiceImpl:
-    def __init__(self):
+    def __init__(self, metrics_service=None):
+        self.metrics_service = metrics_service or default_metrics_service
         self.tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
         self.model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_DIR)
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
@@ -11,14 +13,15 @@ class IntentServiceImpl:
         self.model.eval()
 
     def detect_intent(self, utterance: str) -> str:
-        inputs = self.tokenizer(
-            utterance,
-            return_tensors="pt",
-            truncation=True,
-            padding=True,
-            max_length=MAX_INPUT_LENGTH
-        ).to(self.device)
-        with torch.no_grad():
+        with self.metrics_service.time_stage("tokenize"):
+            inputs = self.tokenizer(
+                utterance,
+                return_tensors="pt",
+                truncation=True,
+                padding=True,
+                max_length=MAX_INPUT_LENGTH
+            ).to(self.device)
+        with self.metrics_service.time_stage("generate"), torch.no_grad():
             outputs = self.model.generate(
                 input_ids=inputs["input_ids"],
                 attention_mask=inputs["attention_mask"],
@@ -26,16 +29,21 @@ class IntentServiceImpl:
                 num_beams=NUM_BEAMS,
                 early_stopping=True
             )
-        return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+        with self.metrics_service.time_stage("decode_output"):
+            return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
 
-    def process_intent_request(self, text: str, voice_agent_service) -> dict:
+    def process_intent_request(self, text: str, voice_agent_service, session_id: str = None) -> dict:
+        self.metrics_service.requests.inc(route="detect-intent")
         transcription = text
-        intent_info = voice_agent_service.extract_intent(transcription)
+        with self.metrics_service.time_stage("extract_intent"):
+            intent_info = voice_agent_service.extract_intent(transcription, session_id)
         reply_text = intent_info.get("reply_text", "")
-        audio_base64 = voice_agent_service.generate_audio(reply_text)
+        with self.metrics_service.time_stage("generate_audio"):
+            audio_base64 = voice_agent_service.generate_audio(reply_text)
         return {
             "transcription": transcription,
             "intent": intent_info,
             "reply_text": reply_text,
-            "audio_base64": audio_base64
+            "audio_base64": audio_base64,
+            "session_id": session_id
         } 
\ No newline at end of file
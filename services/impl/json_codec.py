@@ -0,0 +1,58 @@
+"""
+JSON encoding for order storage and API responses. Uses orjson when it is
+installed (JSON_CODEC=stdlib forces the standard library) and falls back to
+`json` otherwise. Both paths produce the same compact UTF-8 output:
+no whitespace, and Arabic text written as-is rather than \\u-escaped.
+"""
+import json
+import os
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_USE_ORJSON = orjson is not None and os.getenv("JSON_CODEC", "").lower() != "stdlib"
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def backend() -> str:
+    return "orjson" if _USE_ORJSON else "stdlib"
+
+
+def stdlib_dumps_bytes(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    if _USE_ORJSON:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Values orjson rejects (e.g. integers beyond 64 bits) take the stdlib path
+            pass
+    return stdlib_dumps_bytes(obj)
+
+
+def dumps(obj: Any) -> str:
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def loads(data) -> Any:
+    """Parse str or bytes; malformed input raises json.JSONDecodeError on both paths"""
+    if _USE_ORJSON:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered through this codec"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from constants.order_constants import (
+    ORDER_KEYWORDS, PRICING_MAPPING, ANALYTICS_CURRENCY, MENU_FILE, MENU_RELOAD_CHECK_SECONDS
+)
+from services.impl.text_matching.arabic_normalizer import normalize_arabic
+from services.impl.text_matching.fuzzy_index import FuzzyMenuIndex
+from services.impl.text_matching.name_extractor import NameExtractor
+from services.impl.text_matching.order_line_parser import OrderLineParser
+
+
+class MenuLoadError(ValueError):
+    pass
+
+
+class MenuItem(NamedTuple):
+    name: str
+    price: int
+    aliases: Tuple[str, ...] = ()
+    available: bool = True
+
+
+def format_price(price: int, currency: str = ANALYTICS_CURRENCY) -> str:
+    """25000 -> "25,000 ليرة\""""
+    return f"{price:,} {currency}"
+
+
+class MenuCatalog:
+    """
+    One version of the menu and everything derived from it: the order-line
+    automaton and fuzzy index over names and aliases, the name extractor's
+    menu vocabulary, and the menu and price strings used in replies. Built
+    in full before it is published and never modified afterwards.
+    """
+
+    def __init__(self, items: Iterable[MenuItem], version: str, currency: str = ANALYTICS_CURRENCY):
+        self.version = version
+        self.currency = currency
+        self.items: Dict[str, MenuItem] = {}
+        spellings: Dict[str, str] = {}
+        for item in items:
+            if item.name in self.items:
+                raise MenuLoadError(f"Duplicate menu item {item.name}")
+            self.items[item.name] = item
+            for spelling in (item.name,) + item.aliases:
+                key = normalize_arabic(spelling)
+                if spellings.setdefault(key, item.name) != item.name:
+                    raise MenuLoadError(f"{spelling} names both {spellings[key]} and {item.name}")
+        if not self.items:
+            raise MenuLoadError("Menu has no items")
+
+        # Unavailable items are still recognized, so the reply can say they are sold out
+        self.names: Tuple[str, ...] = tuple(name for name, item in self.items.items() if item.available)
+        self.prices: Dict[str, int] = {name: item.price for name, item in self.items.items()}
+        self.price_texts: Dict[str, str] = {name: format_price(price, currency) for name, price in self.prices.items()}
+        aliases = {spelling: item.name for item in self.items.values() for spelling in (item.name,) + item.aliases}
+        self.line_parser = OrderLineParser({normalize_arabic(spelling): name for spelling, name in aliases.items()})
+        # Aliases are exact alternative names; fuzzy matching over them too only adds false positives
+        self.fuzzy_index = FuzzyMenuIndex(tuple(self.items))
+        self.name_extractor = NameExtractor(menu_items=aliases)
+
+        self.names_text = "، ".join(self.names)
+        self.menu_text = "، ".join(f"🍽️ {name}" for name in self.names)
+        price_entries = [f"🍽️ {name}: {self.price_texts[name]}" for name in self.names]
+        self.price_list_text = "، ".join(price_entries)
+        self.price_list_lines = "\n".join(price_entries)
+
+    def is_available(self, name: str) -> bool:
+        item = self.items.get(name)
+        return bool(item and item.available)
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.version,
+            "currency": self.currency,
+            "items": [
+                {"name": item.name, "price": item.price, "price_text": self.price_texts[item.name],
+                 "aliases": list(item.aliases), "available": item.available}
+                for item in self.items.values()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, version: str) -> "MenuCatalog":
+        try:
+            items = [
+                MenuItem(
+                    name=str(entry["name"]).strip(),
+                    price=int(entry["price"]),
+                    aliases=tuple(str(alias).strip() for alias in entry.get("aliases", ()) if str(alias).strip()),
+                    available=bool(entry.get("available", True)),
+                )
+                for entry in data["items"]
+            ]
+        except (KeyError, TypeError, ValueError) as e:
+            raise MenuLoadError(f"Invalid menu item: {e!r}")
+        return cls(items, version, data.get("currency", ANALYTICS_CURRENCY))
+
+    @classmethod
+    def from_file(cls, path: str) -> "MenuCatalog":
+        with open(path, 'rb') as f:
+            raw = f.read()
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise MenuLoadError(f"{path} is not valid JSON: {e}")
+        return cls.from_dict(data, hashlib.sha256(raw).hexdigest()[:12])
+
+    @classmethod
+    def from_constants(cls) -> "MenuCatalog":
+        """The built-in menu from ORDER_KEYWORDS / PRICING_MAPPING"""
+        items = [MenuItem(name, int("".join(filter(str.isdigit, PRICING_MAPPING.get(name, "10,000")))))
+                 for name in ORDER_KEYWORDS]
+        return cls(items, "builtin")
+
+
+class MenuServiceImpl:
+    """
+    Serves the current MenuCatalog and reloads it from MENU_FILE without a
+    restart: `catalog` stats the file at most every `check_interval`
+    seconds, and `reload()` forces a check. A new catalog is built in full
+    and then swapped in with one reference assignment, so a request sees
+    either the old menu or the new one, never a mix. An unreadable or
+    invalid file, or one that vanishes mid-read, leaves the current menu in
+    place.
+    """
+
+    def __init__(self, menu_file: str = None, check_interval: Optional[float] = MENU_RELOAD_CHECK_SECONDS):
+        self.menu_file = menu_file or os.getenv("MENU_FILE", MENU_FILE)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[MenuCatalog], None]] = []
+        self._file_stat = None
+        self._checked_at = 0.0
+        self._catalog = MenuCatalog.from_constants()
+        try:
+            self.reload()
+        except (MenuLoadError, OSError) as e:
+            print(f"Warning: using the built-in menu, {self.menu_file} could not be loaded: {e}")
+        else:
+            if self._file_stat is None:
+                print(f"Warning: {self.menu_file} not found, using the built-in menu")
+
+    @property
+    def catalog(self) -> MenuCatalog:
+        if self.check_interval is not None and time.monotonic() - self._checked_at >= self.check_interval:
+            try:
+                self.reload()
+            except (MenuLoadError, OSError) as e:
+                print(f"Warning: keeping menu {self._catalog.version}, {self.menu_file} could not be loaded: {e}")
+        return self._catalog
+
+    def add_listener(self, listener: Callable[[MenuCatalog], None]):
+        """Called with each newly published catalog"""
+        self._listeners.append(listener)
+
+    def reload(self, force: bool = False) -> bool:
+        """Load the menu file if it changed (or `force`); True if a new catalog was published"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                stat = os.stat(self.menu_file)
+                file_stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                file_stat = None
+            if file_stat is None or (file_stat == self._file_stat and not force):
+                return False
+            try:
+                catalog = MenuCatalog.from_file(self.menu_file)
+            except MenuLoadError:
+                # Don't retry a broken file on every request; wait for it to change
+                self._file_stat = file_stat
+                raise
+            # An OSError (file replaced or removed after the stat) is left unrecorded
+            # and retried on the next check
+            self._file_stat = file_stat
+            if catalog.version == self._catalog.version:
+                return False
+            self._catalog = catalog
+        for listener in self._listeners:
+            try:
+                listener(catalog)
+            except Exception as e:
+                print(f"Warning: menu reload listener failed: {e}")
+        return True
+
+
+# Shared by the order service, the intent handlers and app.py
+menu_service = MenuServiceImpl()
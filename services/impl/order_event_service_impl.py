@@ -0,0 +1,242 @@
+import asyncio
+import threading
+import uuid
+from collections import deque
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from constants.order_constants import (
+    ORDER_EVENT_HISTORY_SIZE, ORDER_EVENT_SUBSCRIBER_BUFFER, ORDER_EVENT_KEEPALIVE_SECONDS,
+    ORDER_EVENT_POLL_SECONDS
+)
+from services.impl import json_codec
+from services.impl.metrics_service_impl import metrics_service as default_metrics_service
+
+ORDER_CREATED = "order_created"
+ORDER_UPDATED = "order_updated"
+# Sent when a resume point is no longer in history; the client should reload /list-orders
+ORDER_EVENTS_RESET = "reset"
+# Stream id of events numbered by a followed order store, the same in every worker
+STORE_STREAM_ID = "store"
+
+
+class OrderEvent:
+    __slots__ = ("id", "seq", "type", "order")
+
+    def __init__(self, event_id: str, seq: int, event_type: str, order: Dict):
+        self.id = event_id
+        self.seq = seq
+        self.type = event_type
+        self.order = order
+
+    def to_sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json_codec.dumps(self.order)}\n\n"
+
+
+class _Subscriber:
+    __slots__ = ("loop", "queue", "lagged")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, buffer: int):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=buffer)
+        self.lagged = False
+
+
+class OrderEventServiceImpl:
+    """
+    In-process fan-out of order writes to /orders/stream subscribers.
+    Recent events are kept in a ring buffer so a reconnecting client can
+    resume from its Last-Event-ID. Each subscriber has a bounded queue; a
+    subscriber that falls `buffer` events behind is disconnected instead of
+    growing server memory, and resumes from history when it reconnects.
+
+    In-process consumers such as the analytics rollups register a
+    synchronous listener, called for every event in order.
+
+    Event IDs are "<stream id>-<sequence>", the stream id being random per
+    process, so a resume point from another worker, or from before a
+    restart, gets a reset event instead of a gap.
+
+    With several workers, `follow()` the shared order store instead: events
+    are then read from the store's change feed, which has every worker's
+    writes, by a poller thread and right after each local write. IDs carry
+    the store's sequence numbers, so a client can resume on any worker; a
+    resume point older than this worker's history is read from the store.
+    """
+
+    def __init__(self, history_size: int = ORDER_EVENT_HISTORY_SIZE,
+                 buffer: int = ORDER_EVENT_SUBSCRIBER_BUFFER,
+                 keepalive_seconds: float = ORDER_EVENT_KEEPALIVE_SECONDS,
+                 metrics_service=None):
+        self.buffer = buffer
+        self.keepalive_seconds = keepalive_seconds
+        self.stream_id = uuid.uuid4().hex[:8]
+        self._history: deque = deque(maxlen=history_size)
+        self._subscribers: List[_Subscriber] = []
+        self._listeners: List[Callable[[OrderEvent], None]] = []
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._store = None
+        self._poll_lock = threading.Lock()
+        self._poller = None
+        self._stopped = threading.Event()
+        self.metrics_service = metrics_service or default_metrics_service
+        self._subscriber_gauge = self.metrics_service.gauge(
+            "order_stream_subscribers", "Connected /orders/stream subscribers")
+        self._lagged = self.metrics_service.counter(
+            "order_stream_lagged_total", "Subscribers disconnected for falling behind")
+
+    def add_listener(self, listener: Callable[["OrderEvent"], None]):
+        self._listeners.append(listener)
+
+    def follow(self, store, poll_interval: float = ORDER_EVENT_POLL_SECONDS):
+        """Take events from `store`'s change feed from now on, polling it every `poll_interval` seconds"""
+        with self._lock:
+            self._store = store
+            self.stream_id = STORE_STREAM_ID
+            self._seq = store.change_seq()
+            self._history.clear()
+        self._stopped.clear()
+        self._poller = threading.Thread(target=self._poll_loop, args=(poll_interval,),
+                                        name="order-event-poller", daemon=True)
+        self._poller.start()
+
+    def _poll_loop(self, poll_interval: float):
+        while not self._stopped.wait(poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Warning: reading order changes failed: {e}")
+
+    def poll(self) -> List[OrderEvent]:
+        """Publish the writes that reached the followed store since the last poll"""
+        events = []
+        with self._poll_lock:
+            limit = self._history.maxlen
+            while True:
+                changes = self._store.changes(self._seq, limit)
+                if changes is None:
+                    # More writes than the store keeps went by: subscribers must reload
+                    events.append(self._publish(ORDER_EVENTS_RESET, {}, self._store.change_seq()))
+                    break
+                for seq, order in changes:
+                    events.append(self._publish(self._event_type(order), order, seq))
+                if len(changes) < limit:
+                    break
+        return events
+
+    @staticmethod
+    def _event_type(order: Dict) -> str:
+        # A store write is an order placement until the order has changed status
+        return ORDER_CREATED if len(order.get("status_history") or ()) <= 1 else ORDER_UPDATED
+
+    def publish(self, event_type: str, order: Dict) -> Optional[OrderEvent]:
+        """
+        Record an order write and fan it out; safe to call from any thread.
+        When following a store the write is already in its change feed, so
+        this polls the feed now instead and returns None.
+        """
+        if self._store is not None:
+            self.poll()
+            return None
+        return self._publish(event_type, order)
+
+    def _publish(self, event_type: str, order: Dict, seq: int = None) -> OrderEvent:
+        with self._lock:
+            self._seq = self._seq + 1 if seq is None else seq
+            event = OrderEvent(f"{self.stream_id}-{self._seq}", self._seq, event_type, order)
+            self._history.append(event)
+            for subscriber in self._subscribers:
+                try:
+                    subscriber.loop.call_soon_threadsafe(self._deliver, subscriber, event)
+                except RuntimeError:
+                    # The subscriber's event loop has closed
+                    subscriber.lagged = True
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                # A failing listener must not fail the order write that triggered it
+                print(f"Warning: order event listener failed: {e}")
+        return event
+
+    def _deliver(self, subscriber: _Subscriber, event: OrderEvent):
+        if subscriber.lagged:
+            return
+        try:
+            subscriber.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            subscriber.lagged = True
+            self._unsubscribe(subscriber)
+            self._lagged.inc()
+
+    def _backlog(self, last_event_id: Optional[str]) -> Optional[List[OrderEvent]]:
+        """Events after `last_event_id`, or None if it can no longer be resumed from"""
+        if not last_event_id:
+            return []
+        stream_id, _, seq = last_event_id.partition("-")
+        if stream_id != self.stream_id or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if self._history and seq >= self._history[0].seq - 1:
+            return [event for event in self._history if event.seq > seq]
+        if self._store is not None:
+            return self._store_backlog(seq)
+        return None if self._history else []
+
+    def _store_backlog(self, seq: int) -> Optional[List[OrderEvent]]:
+        """Events after `seq` read from the followed store, e.g. for a client coming from another worker"""
+        limit = self._history.maxlen
+        changes = self._store.changes(seq, limit + 1)
+        if changes is None or len(changes) > limit:
+            return None
+        return [OrderEvent(f"{self.stream_id}-{number}", number, self._event_type(order), order)
+                for number, order in changes]
+
+    def _subscribe(self, last_event_id: Optional[str]):
+        subscriber = _Subscriber(asyncio.get_running_loop(), self.buffer)
+        # Register and snapshot history under one lock so no event falls in between
+        with self._lock:
+            self._subscribers.append(subscriber)
+            self._subscriber_gauge.set(len(self._subscribers))
+            backlog = self._backlog(last_event_id)
+        return subscriber, backlog
+
+    def _unsubscribe(self, subscriber: _Subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+            self._subscriber_gauge.set(len(self._subscribers))
+
+    async def stream(self, last_event_id: str = None) -> AsyncIterator[str]:
+        """SSE text for one subscriber: missed events first, then live ones"""
+        subscriber, backlog = self._subscribe(last_event_id)
+        try:
+            if backlog is None:
+                yield f"event: {ORDER_EVENTS_RESET}\ndata: {{}}\n\n"
+                backlog = []
+            for event in backlog:
+                yield event.to_sse()
+            # A backlog read from the store can be ahead of this worker's poller
+            sent_seq = backlog[-1].seq if backlog else 0
+            while not (subscriber.lagged and subscriber.queue.empty()):
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event.seq > sent_seq:
+                    yield event.to_sse()
+        finally:
+            self._unsubscribe(subscriber)
+
+
+    def close(self):
+        """Stop following the store"""
+        self._stopped.set()
+        if self._poller is not None:
+            self._poller.join()
+            self._poller = None
+
+
+# Shared by the services wired in app.py; tests can pass their own instance
+order_event_service = OrderEventServiceImpl()
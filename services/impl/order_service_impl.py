@@ -1,74 +1,152 @@
 import re
-import json
-import os
-from typing import List, Dict
-from difflib import SequenceMatcher
-from constants.order_constants import ORDER_KEYWORDS, ORDER_ETA
-from constants.app_constants import NAME_EXTRACTION_STOPWORDS, ORDER_EXTRACTION_STOPWORDS, NAME_EXTRACTION_PATTERNS, ARABIC_NUMERALS
-import random
+from typing import List, Dict, Iterator, Optional, Tuple
+from services.impl.order_stores.base import OrderStore
+from services.impl.order_stores.factory import create_order_store
+from services.impl.order_stores.order_id_allocator import OrderIdAllocator, default_counter_file
+from services.impl.text_matching.fuzzy_index import fuzzy_index_for
+from services.impl.text_matching.arabic_normalizer import normalize_arabic, normalize_vocabulary
+from services.impl.text_matching.order_line_parser import OrderLine
+from services.impl.menu_service_impl import MenuCatalog
+from services.impl.branch_service_impl import current_branch
+from constants.order_constants import ORDER_ETA, ORDERS_FILE, ORDER_PAGE_SIZE, ORDER_STATUS_TRANSITIONS
+from constants.app_constants import ORDER_EXTRACTION_STOPWORDS
 from datetime import datetime
+from enums.order_status_enum import OrderStatusEnum
+from services.impl.order_event_service_impl import order_event_service as default_order_event_service, ORDER_CREATED, ORDER_UPDATED
 
-class OrderServiceImpl:
-    def __init__(self):
-        self.orders_file = "orders.json"
-        self._ensure_orders_file_exists()
-
-    def _ensure_orders_file_exists(self):
-        """Ensure the orders JSON file exists"""
-        if not os.path.exists(self.orders_file):
-            with open(self.orders_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
-
-    def _load_orders(self) -> List[Dict]:
-        """Load orders from JSON file"""
-        try:
-            with open(self.orders_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+ORDER_STOPWORDS = frozenset(normalize_vocabulary(ORDER_EXTRACTION_STOPWORDS))
+ORDER_REQUEST_PATTERN = re.compile(r'(?:اطلب|طلب|عايز|اريد|بدي|حابب|احب|ارغب)\s+(.+)')
+
+
+class OrderNotFoundError(LookupError):
+    def __init__(self, order_id: str):
+        super().__init__(f"Order {order_id} not found")
+        self.order_id = order_id
+
+
+class InvalidStatusTransitionError(ValueError):
+    def __init__(self, order_id: str, current: str, requested: str):
+        super().__init__(f"Order {order_id} cannot move from {current} to {requested}")
+        self.order_id = order_id
+        self.current = current
+        self.requested = requested
+        self.allowed = list(ORDER_STATUS_TRANSITIONS.get(current, ()))
 
-    def _save_orders(self, orders: List[Dict]):
-        """Save orders to JSON file"""
-        with open(self.orders_file, 'w', encoding='utf-8') as f:
-            json.dump(orders, f, ensure_ascii=False, indent=2)
+
+class UnknownOrderStatusError(ValueError):
+    pass
+
+
+class OrderServiceImpl:
+    def __init__(self, orders_file: str = ORDERS_FILE, store: OrderStore = None, event_service=None):
+        self.orders_file = orders_file
+        self.event_service = event_service or default_order_event_service
+        self.store = store or create_order_store(orders_file=orders_file)
+        self.id_allocator = OrderIdAllocator(default_counter_file(orders_file), exists=self.store.get)
 
     def list_orders(self) -> List[Dict]:
-        """List all orders from JSON file"""
-        return self._load_orders()
+        """List all orders"""
+        return self.store.list()
 
     def get_order_by_id(self, order_id: str) -> Dict:
         """Get a specific order by ID"""
-        orders = self._load_orders()
-        for order in orders:
-            if order.get("order_id") == order_id:
-                return order
-        return None
+        return self.store.get(order_id)
+
+    def update_order_status(self, order_id: str, status: str) -> Dict:
+        """
+        Move an order to `status` if the lifecycle allows it, appending to its
+        status history. One store write; the rest of the store is untouched.
+        """
+        if OrderStatusEnum.from_code(status) is None:
+            raise UnknownOrderStatusError(f"Unknown order status: {status}")
+
+        def transition(order: Dict) -> Dict:
+            current = order.get("status", OrderStatusEnum.PENDING.code)
+            if status not in ORDER_STATUS_TRANSITIONS.get(current, ()):
+                raise InvalidStatusTransitionError(order_id, current, status)
+            now = datetime.now().isoformat()
+            # Orders placed before status history existed start from their creation time
+            history = order.get("status_history") or [{"status": current, "at": order.get("timestamp")}]
+            order["status"] = status
+            order["status_history"] = history + [{"status": status, "at": now}]
+            order["updated_at"] = now
+            return order
+
+        order = self.store.update(order_id, transition)
+        if order is None:
+            raise OrderNotFoundError(order_id)
+        self.event_service.publish(ORDER_UPDATED, order)
+        return order
+
+    def cancel_order(self, order_id: str) -> Dict:
+        return self.update_order_status(order_id, OrderStatusEnum.CANCELLED.code)
+
+    def process_status_update_api_request(self, order_id: str, status: str):
+        try:
+            return self.update_order_status(order_id, status), 200
+        except OrderNotFoundError:
+            return {"error": "Order not found."}, 404
+        except InvalidStatusTransitionError as e:
+            return {
+                "error": f"Cannot move order from {e.current} to {e.requested}.",
+                "status": e.current,
+                "allowed": e.allowed
+            }, 409
+        except UnknownOrderStatusError:
+            return {
+                "error": f"Unknown status: {status}.",
+                "allowed": [s.code for s in OrderStatusEnum]
+            }, 400
+
+    def query_orders(self, status: str = None, name: str = None, since: str = None, until: str = None,
+                     cursor: str = None, limit: int = ORDER_PAGE_SIZE) -> Tuple[List[Dict], Optional[str]]:
+        """One filtered page of orders and the cursor for the next page"""
+        return self.store.query(status=status, name=name, since=since, until=until, cursor=cursor, limit=limit)
+
+    def export_orders(self, **filters) -> Iterator[Dict]:
+        """Every matching order, streamed page by page"""
+        return self.store.iter_orders(**filters)
 
     @staticmethod
-    def extract_order_items(text: str):
-        items = []
+    def extract_order_lines(text: str, catalog: MenuCatalog = None) -> List[OrderLine]:
+        """
+        Order lines (item, quantity, modifiers) in the text, matched against
+        the current branch's menu names and aliases; items only found by
+        fuzzy matching get a quantity of one
+        """
+        catalog = catalog or current_branch().catalog
+        text = normalize_arabic(text)
         
         # First, try to find exact matches in the text
-        exact_matches = []
-        for menu_item in ORDER_KEYWORDS:
-            if menu_item in text:
-                exact_matches.append(menu_item)
-        
-        if exact_matches:
-            return exact_matches
-        
-        # If no exact matches, try to extract items using regex and fuzzy matching
-        match = re.search(r'(?:اطلب|أطلب|طلب|عايز|اريد|أريد|بدي|حابب|أحب|أرغب)\s+(.+)', text)
+        lines = catalog.line_parser.parse(text)
+        if lines:
+            return lines
+        return [OrderLine(item) for item in OrderServiceImpl._fuzzy_order_items(text, catalog)]
+
+    @staticmethod
+    def extract_order_items(text: str, catalog: MenuCatalog = None) -> List[str]:
+        """Menu items mentioned in the text, once each"""
+        items = []
+        for line in OrderServiceImpl.extract_order_lines(text, catalog):
+            if line.item not in items:
+                items.append(line.item)
+        return items
+
+    @staticmethod
+    def _fuzzy_order_items(text: str, catalog: MenuCatalog) -> List[str]:
+        items = []
+        # No exact matches: try to extract items using regex and fuzzy matching
+        match = ORDER_REQUEST_PATTERN.search(text)
         if match:
             raw_items = re.split(r'[و،,]', match.group(1))
             for item in raw_items:
                 item = item.strip()
-                if item and len(item) > 2 and item not in ORDER_EXTRACTION_STOPWORDS:
-                    words = [w for w in item.split() if w not in ORDER_EXTRACTION_STOPWORDS]
+                if item and len(item) > 2 and item not in ORDER_STOPWORDS:
+                    words = [w for w in item.split() if w not in ORDER_STOPWORDS]
                     cleaned_item = " ".join(words)
-                    if cleaned_item and cleaned_item not in ORDER_EXTRACTION_STOPWORDS:
+                    if cleaned_item and cleaned_item not in ORDER_STOPWORDS:
                         # Try to find the best match using fuzzy matching
-                        best_match = OrderServiceImpl._find_best_match(cleaned_item, ORDER_KEYWORDS)
+                        best_match = catalog.fuzzy_index.best_match(cleaned_item)
                         if best_match:
                             items.append(best_match)
         
@@ -78,7 +156,7 @@ class OrderServiceImpl:
                 for j in range(i + 1, min(i + 4, len(words) + 1)): 
                     candidate = " ".join(words[i:j])
                     if len(candidate) > 2:
-                        best_match = OrderServiceImpl._find_best_match(candidate, ORDER_KEYWORDS)
+                        best_match = catalog.fuzzy_index.best_match(candidate)
                         if best_match and best_match not in items:
                             items.append(best_match)
         
@@ -90,99 +168,86 @@ class OrderServiceImpl:
         Find the best matching menu item using fuzzy string matching.
         Returns the best match if similarity is above threshold, otherwise None.
         """
-        best_match = None
-        best_score = 0
-        
-        for menu_item in menu_items:
-            # Calculate similarity using SequenceMatcher
-            similarity = SequenceMatcher(None, candidate.lower(), menu_item.lower()).ratio()
-            
-            # Also check if candidate is a substring of menu item (common for partial transcriptions)
-            if candidate.lower() in menu_item.lower():
-                similarity = max(similarity, 0.8)  # Boost score for substring matches
-            
-            # Check if menu item is a substring of candidate (for cases where transcription adds extra words)
-            if menu_item.lower() in candidate.lower():
-                similarity = max(similarity, 0.9)  # High score for this case
-            
-            if similarity > best_score and similarity >= threshold:
-                best_score = similarity
-                best_match = menu_item
-        
-        return best_match
+        return fuzzy_index_for(tuple(menu_items)).best_match(candidate, threshold)
 
     @staticmethod
     def extract_name_from_transcription(transcription: str) -> str:
         """
-        Extract name from transcription using various patterns
+        Extract name from transcription: the words after "اسمي", "أنا" or
+        "الطلب باسم", else the first word that is not a stopword or menu item
         """
-        import re
-        
-        # Try to match name patterns
-        for pattern in NAME_EXTRACTION_PATTERNS:
-            match = re.search(pattern, transcription)
-            if match:
-                return match.group(1).strip()
-        
-        # If no pattern matches, try to extract the first meaningful word
-        # Filter out common words that are not names
-        words = transcription.split()
-        for word in words:
-            if word not in NAME_EXTRACTION_STOPWORDS and len(word) > 1:
-                return word
-        
-        return None
+        return current_branch().catalog.name_extractor.extract(transcription)
 
 
-    def process_order_request(self, name: str, items: list, dialog_history: list) -> dict:
+    def process_order_request(self, name: str, items: list, dialog_history: list, lines: list = None) -> dict:
         # Extract name if not provided
         if not name:
             name = self.extract_name_from_dialog(dialog_history)
         if not name:
             return {"error": "من فضلك خبرنا باسمك."}
+        if lines:
+            lines = self._validate_lines(lines)
+            if lines is None:
+                return {"error": "صيغة أصناف الطلب غير صحيحة."}
+            items = items or list(dict.fromkeys(line["item"] for line in lines))
+        else:
+            lines = [OrderLine(item).to_dict() for item in items or [] if isinstance(item, str)]
+        # Priced now, so a later menu change doesn't reprice the order in analytics
+        prices = current_branch().catalog.prices
+        for line in lines:
+            line["unit_price"] = prices.get(line["item"], 0)
         
-        order_id = OrderServiceImpl.generate_arabic_order_id()
+        order_id = self.generate_arabic_order_id()
+        timestamp = datetime.now().isoformat()
         order = {
             "order_id": order_id,
             "name": name,
             "items": items,
+            "branch": current_branch().id,
             "eta": ORDER_ETA,
-            "timestamp": datetime.now().isoformat(),
-            "status": "pending"
+            "timestamp": timestamp,
+            "status": OrderStatusEnum.PENDING.code,
+            "status_history": [{"status": OrderStatusEnum.PENDING.code, "at": timestamp}]
         }
+        if lines:
+            order["lines"] = lines
         
-        # Load existing orders, append new order, and save
-        orders = self._load_orders()
-        orders.append(order)
-        self._save_orders(orders)
+        # One store write (a log line or a row) instead of rewriting every order
+        self.store.append(order)
+        self.event_service.publish(ORDER_CREATED, order)
         
         return order
 
-    def process_order_api_request(self, name: str, items: list, dialog_history: list):
-        result = self.process_order_request(name, items, dialog_history)
+    @staticmethod
+    def _validate_lines(lines: list) -> Optional[List[Dict]]:
+        """Order lines in their stored form, or None if any line is malformed"""
+        try:
+            if any(line.get("quantity_unclear") for line in lines):
+                return None
+            lines = [OrderLine(line["item"], int(line.get("quantity", 1)), tuple(line.get("modifiers") or ())).to_dict()
+                     for line in lines]
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+        if any(not isinstance(line["item"], str) or line["quantity"] < 1 for line in lines):
+            return None
+        return lines
+
+    def process_order_api_request(self, name: str, items: list, dialog_history: list, lines: list = None):
+        result = self.process_order_request(name, items, dialog_history, lines)
         if "error" in result:
             return {"error": result["error"]}, 400
         return {"order_id": result["order_id"], "eta": result["eta"]}, 200
 
     def extract_name_from_dialog(self, dialog_history: list) -> str:
-        # Simple heuristic: look for "اسمي" (my name is) or similar in previous messages
-        import re
+        # Most recent message that introduces a name ("اسمي ...", "أنا ...")
         for message in reversed(dialog_history):
-            match = re.search(r"اسمي\s+(\w+)", message)
-            if match:
-                return match.group(1)
+            name = current_branch().catalog.name_extractor.extract(message, fallback=False)
+            if name:
+                return name
         return None    
 
-    @staticmethod
-    def generate_arabic_order_id() -> str:
+    def generate_arabic_order_id(self) -> str:
         """
-        Generate a random 5-digit Arabic order ID
+        Allocate the next unique Arabic order ID
         """
-        # Generate 5 random digits
-        digits = [random.randint(0, 9) for _ in range(5)]
-        
-        # Convert to Arabic numerals
-        arabic_digits = [ARABIC_NUMERALS[digit] for digit in digits]
-        
-        # Join them together
-        return "".join(arabic_digits)    
\ No newline at end of file
+        return self.id_allocator.allocate()
@@ -0,0 +1,101 @@
+import base64
+import binascii
+import json
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from constants.order_constants import ORDER_PAGE_SIZE, ORDER_EXPORT_PAGE_SIZE, ORDER_CHANGE_HISTORY_SIZE
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(timestamp: str, position: int) -> str:
+    """Opaque page cursor: the (timestamp, position) sort key of the last order on the page"""
+    raw = json.dumps([timestamp, position], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, position = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+    if not isinstance(timestamp, str) or not isinstance(position, int):
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+    return timestamp, position
+
+
+class OrderStore(ABC):
+    """Persistence backend behind OrderServiceImpl"""
+
+    @abstractmethod
+    def append(self, order: Dict) -> Dict:
+        pass
+
+    @abstractmethod
+    def update(self, order_id: str, mutate: Callable[[Dict], Dict]) -> Optional[Dict]:
+        """
+        Atomically replace an order with `mutate(order)`, a copy it may edit.
+        Exceptions from `mutate` abort the update and propagate. Returns the
+        new order, or None if the order does not exist.
+        """
+
+    @abstractmethod
+    def get(self, order_id: str) -> Optional[Dict]:
+        pass
+
+    @abstractmethod
+    def list(self) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def query(self, status: str = None, name: str = None, since: str = None, until: str = None,
+              cursor: str = None, limit: int = ORDER_PAGE_SIZE) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of orders sorted by timestamp, filtered by exact status and
+        name and by `since` <= timestamp < `until` (ISO strings). Returns the
+        page and the cursor for the next one, or None on the last page.
+        """
+
+    @abstractmethod
+    def change_seq(self) -> int:
+        """Sequence number of the latest write, shared by every process using the store"""
+
+    @abstractmethod
+    def changes(self, after: int, limit: int = ORDER_CHANGE_HISTORY_SIZE) -> Optional[List[Tuple[int, Dict]]]:
+        """
+        Up to `limit` writes made after sequence number `after`, by any
+        process, oldest first: (sequence number, order as written). Returns
+        None if some of them are no longer kept, or `after` is not a number
+        this store has reached.
+        """
+
+    def iter_orders(self, page_size: int = ORDER_EXPORT_PAGE_SIZE, **filters) -> Iterator[Dict]:
+        """Yield every matching order a page at a time, never holding the full list"""
+        cursor = None
+        while True:
+            orders, cursor = self.query(cursor=cursor, limit=page_size, **filters)
+            yield from orders
+            if cursor is None:
+                return
+
+    def bulk_insert(self, orders: Iterable[Dict]) -> int:
+        """Insert many orders, e.g. during a migration; returns how many were written"""
+        count = 0
+        for order in orders:
+            self.append(order)
+            count += 1
+        return count
+
+    def sync(self):
+        """Force pending writes to disk"""
+
+    def close(self):
+        pass
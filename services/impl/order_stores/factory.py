@@ -0,0 +1,18 @@
+import os
+
+from constants.order_constants import ORDERS_FILE, ORDER_DB_FILE, ORDER_STORE_BACKEND
+from services.impl.order_stores.base import OrderStore
+from services.impl.order_stores.json_log_store import JsonLogOrderStore
+from services.impl.order_stores.sqlite_store import SqliteOrderStore
+
+
+def create_order_store(backend: str = None, orders_file: str = ORDERS_FILE, db_file: str = None) -> OrderStore:
+    """Build the order store named by `backend`, or by the ORDER_STORE env var"""
+    backend = (backend or os.getenv("ORDER_STORE", ORDER_STORE_BACKEND)).lower()
+    match backend:
+        case "json":
+            return JsonLogOrderStore(orders_file)
+        case "sqlite":
+            return SqliteOrderStore(db_file or os.getenv("ORDER_DB_FILE", ORDER_DB_FILE))
+        case _:
+            raise ValueError(f"Unknown order store backend: {backend}")
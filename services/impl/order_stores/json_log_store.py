@@ -0,0 +1,438 @@
+import copy
+import os
+import queue
+import threading
+import time
+from collections import deque
+from itertools import islice
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # No cross-process locking on Windows; run a single worker there
+    fcntl = None
+
+from constants.order_constants import (
+    ORDERS_FILE, ORDER_LOG_GROUP_COMMIT_WINDOW_SECONDS, ORDER_LOG_GROUP_COMMIT_MAX, ORDER_LOG_COMPACT_EVERY,
+    ORDER_PAGE_SIZE, ORDER_CHANGE_HISTORY_SIZE
+)
+from services.impl import json_codec
+from services.impl.order_stores.base import OrderStore, encode_cursor, decode_cursor
+
+
+def _remove_key(index: List[tuple], key: tuple):
+    i = bisect_left(index, key)
+    if i < len(index) and index[i] == key:
+        del index[i]
+
+
+def default_log_file(snapshot_file: str) -> str:
+    root, _ = os.path.splitext(snapshot_file)
+    return f"{root}.log.jsonl"
+
+
+class _PendingWrite:
+    """A queued put (`order`) or read-modify-write (`order_id` + `mutate`)"""
+    __slots__ = ("order", "order_id", "mutate", "result", "done", "error")
+
+    def __init__(self, order: Dict = None, order_id: str = None, mutate: Callable[[Dict], Dict] = None):
+        self.order = order
+        self.order_id = order_id if order is None else order.get("order_id")
+        self.mutate = mutate
+        self.result = None
+        self.done = threading.Event()
+        self.error = None
+
+
+class JsonLogOrderStore(OrderStore):
+    """
+    Orders kept as a JSON snapshot (orders.json) plus an append-only JSON
+    Lines log of every write since the last compaction. Writing an order
+    appends one line, so cost no longer grows with order history. The
+    in-memory index is rebuilt on startup by loading the snapshot and
+    replaying the log. Every `compact_every` writes the index is written out
+    as a fresh snapshot and the log is truncated.
+
+    Secondary indexes keep (timestamp, position) sort keys in sorted lists:
+    one over all orders and one per status and per customer name, so
+    filtered pages are a bisect plus a walk over matching orders only.
+
+    Reads are served from the index. Before each read the snapshot and log
+    are stat'ed: lines another writer appended to the log are tailed in, and
+    a replaced snapshot or truncated log triggers a full rebuild.
+
+    Writes go through a single writer thread per store. It takes everything
+    queued while the previous commit was running (and, under concurrent
+    load, whatever arrives within `group_commit_window`), then writes the
+    batch with one write() and one fsync while holding an exclusive flock on
+    `<snapshot>.lock`, so uvicorn workers sharing the files never interleave
+    or lose writes. append() returns once its order is on disk. update()
+    runs its read-modify-write inside the commit, against an index that has
+    just caught up with every other worker, and logs the result as a put.
+
+    Every log entry carries a sequence number, assigned under the lock, so
+    all workers number writes alike. The last `change_history` entries are
+    kept in memory as the change feed. Compaction copies them into the fresh
+    log after a "compacted" marker, for the change feed only (the snapshot
+    already has them), so a worker that had not tailed them yet still can.
+    """
+
+    def __init__(self, snapshot_file: str = ORDERS_FILE, log_file: str = None,
+                 group_commit_window: float = ORDER_LOG_GROUP_COMMIT_WINDOW_SECONDS,
+                 group_commit_max: int = ORDER_LOG_GROUP_COMMIT_MAX,
+                 compact_every: int = ORDER_LOG_COMPACT_EVERY,
+                 change_history: int = ORDER_CHANGE_HISTORY_SIZE):
+        self.snapshot_file = snapshot_file
+        self.log_file = log_file or default_log_file(snapshot_file)
+        self.lock_file = f"{snapshot_file}.lock"
+        self.group_commit_window = group_commit_window
+        self.group_commit_max = group_commit_max
+        self.compact_every = compact_every
+
+        self._orders: Dict[str, Dict] = {}
+        self._reset_indexes()
+        self._lock = threading.RLock()
+        self._commit_lock = threading.Lock()
+        self._log = None
+        self._lock_fd = None
+        self._seq = 0
+        self._compacted_seq = 0
+        self._changes: deque = deque(maxlen=change_history)
+        self._snapshot_stat = None
+        self._log_offset = 0
+        self._queue = queue.Queue()
+        self._writer = None
+        self._ensure_snapshot_exists()
+        self._rebuild_index()
+
+    def _ensure_snapshot_exists(self):
+        if not os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'wb') as f:
+                f.write(json_codec.dumps_bytes([]))
+
+    def _read_snapshot(self) -> List[Dict]:
+        try:
+            with open(self.snapshot_file, 'rb') as f:
+                orders = json_codec.loads(f.read())
+            return orders if isinstance(orders, list) else []
+        except (FileNotFoundError, json_codec.JSONDecodeError):
+            return []
+
+    @staticmethod
+    def _stat(path: str) -> Optional[tuple]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _rebuild_index(self):
+        # Stat before reading: a change made while we read shows up on the next refresh
+        self._snapshot_stat = self._stat(self.snapshot_file)
+        self._orders = {}
+        self._reset_indexes()
+        for order in self._read_snapshot():
+            self._put(order)
+        self._log_offset = 0
+        self._seq = 0
+        self._compacted_seq = 0
+        self._changes.clear()
+        self._read_log_tail()
+
+    def _read_log_tail(self):
+        """Replay log lines written since `_log_offset`"""
+        try:
+            with open(self.log_file, 'rb') as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        # Only consume complete lines; a partial last line may still be being written
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                entry = json_codec.loads(line)
+            except json_codec.JSONDecodeError:
+                # A torn line from a crash mid-write; everything around it is intact
+                continue
+            self._apply(entry)
+        self._log_offset += end
+
+    def _refresh(self):
+        """Pick up writes made behind this index's back, e.g. by another process"""
+        if self._stat(self.snapshot_file) != self._snapshot_stat:
+            self._rebuild_index()
+            return
+        log_stat = self._stat(self.log_file)
+        log_size = log_stat[2] if log_stat else 0
+        if log_size < self._log_offset:
+            self._rebuild_index()
+        elif log_size > self._log_offset:
+            self._read_log_tail()
+
+    def _reset_indexes(self):
+        self._keys: Dict[str, tuple] = {}
+        self._key_ids: Dict[tuple, str] = {}
+        self._time_index: List[tuple] = []
+        self._status_index: Dict[str, List[tuple]] = {}
+        self._name_index: Dict[str, List[tuple]] = {}
+        self._next_position = 0
+
+    def _put(self, order: Dict):
+        order_id = order.get("order_id")
+        previous = self._orders.get(order_id)
+        if previous is None:
+            position = self._next_position
+            self._next_position += 1
+        else:
+            # An update keeps its position; drop the old keys before re-indexing
+            old_key = self._keys[order_id]
+            position = old_key[1]
+            del self._key_ids[old_key]
+            _remove_key(self._time_index, old_key)
+            _remove_key(self._status_index.get(previous.get("status"), []), old_key)
+            _remove_key(self._name_index.get(previous.get("name"), []), old_key)
+        key = (order.get("timestamp") or "", position)
+        self._orders[order_id] = order
+        self._keys[order_id] = key
+        self._key_ids[key] = order_id
+        # Orders mostly arrive in time order, so insort appends at the end
+        insort(self._time_index, key)
+        insort(self._status_index.setdefault(order.get("status"), []), key)
+        insort(self._name_index.setdefault(order.get("name"), []), key)
+
+    def _apply(self, entry: Dict):
+        op = entry.get("op")
+        if op == "put":
+            # Lines written before sequence numbers existed are numbered by position
+            seq = entry.get("seq") or self._seq + 1
+            if seq > self._compacted_seq:
+                self._put(entry["order"])
+            # else a change kept across compaction, already in the snapshot
+            self._seq = max(self._seq, seq)
+            if self._changes and seq != self._changes[-1][0] + 1:
+                self._changes.clear()
+            self._changes.append((seq, entry["order"]))
+        elif op == "compacted":
+            self._seq = max(self._seq, entry["seq"])
+            self._compacted_seq = entry["seq"]
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive cross-process lock held for the duration of a commit or compaction"""
+        with self._commit_lock:
+            if fcntl is None:
+                yield
+                return
+            if self._lock_fd is None:
+                self._lock_fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _resolve(self, batch: List[_PendingWrite]) -> List[Dict]:
+        """Turn a batch into log entries, running updates against the current index"""
+        entries = []
+        updated: Dict[str, Dict] = {}
+        for pending in batch:
+            if pending.mutate is None:
+                order = pending.order
+            else:
+                current = updated.get(pending.order_id) or self._orders.get(pending.order_id)
+                if current is None:
+                    continue
+                try:
+                    order = pending.mutate(copy.deepcopy(current))
+                except Exception as e:
+                    pending.error = e
+                    continue
+            updated[pending.order_id] = order
+            pending.result = order
+            entries.append({"op": "put", "seq": self._seq + len(entries) + 1, "order": order})
+        return entries
+
+    def _commit(self, batch: List[_PendingWrite]):
+        """Make the batch durable with one write and one fsync, then index it"""
+        with self._file_lock():
+            with self._lock:
+                # Catch up with other processes so updates see their writes and
+                # the offset below is the end of complete lines
+                self._refresh()
+                log_offset = self._log_offset
+                entries = self._resolve(batch)
+            if not entries:
+                return
+            data = b"".join(json_codec.dumps_bytes(entry) + b"\n" for entry in entries)
+            if self._log is None:
+                self._log = open(self.log_file, 'ab')
+            if os.fstat(self._log.fileno()).st_size > log_offset:
+                # Seal a torn last line so this batch starts on a line of its own
+                data = b"\n" + data
+            self._log.write(data)
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            with self._lock:
+                # Index the batch by tailing the log, exactly as other processes will
+                self._refresh()
+                if self.compact_every and self._seq - self._compacted_seq >= self.compact_every:
+                    self._compact()
+
+    def _writer_loop(self):
+        while True:
+            pending = self._queue.get()
+            if pending is None:
+                return
+            batch = [pending]
+            deadline = None
+            while len(batch) < self.group_commit_max:
+                try:
+                    if deadline is None:
+                        pending = self._queue.get_nowait()
+                    else:
+                        pending = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    # More than one writer queued means concurrent load: hold the batch
+                    # open for a short window so more orders share the fsync
+                    if deadline is None and len(batch) > 1 and self.group_commit_window > 0:
+                        deadline = time.monotonic() + self.group_commit_window
+                        continue
+                    break
+                if pending is None:
+                    self._queue.put(None)
+                    break
+                batch.append(pending)
+            try:
+                self._commit(batch)
+            except Exception as e:
+                for p in batch:
+                    p.error = p.error or e
+            for p in batch:
+                p.done.set()
+
+    def _submit(self, pending: _PendingWrite) -> _PendingWrite:
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, name="order-log-writer", daemon=True)
+                self._writer.start()
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending
+
+    def append(self, order: Dict) -> Dict:
+        self._submit(_PendingWrite(order=order))
+        return order
+
+    def update(self, order_id: str, mutate: Callable[[Dict], Dict]) -> Optional[Dict]:
+        return self._submit(_PendingWrite(order_id=order_id, mutate=mutate)).result
+
+    def bulk_insert(self, orders: Iterable[Dict]) -> int:
+        batch = [_PendingWrite(order=order) for order in orders]
+        if batch:
+            self._commit(batch)
+        return len(batch)
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        with self._lock:
+            self._refresh()
+            return self._orders.get(order_id)
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            self._refresh()
+            return list(self._orders.values())
+
+    def query(self, status: str = None, name: str = None, since: str = None, until: str = None,
+              cursor: str = None, limit: int = ORDER_PAGE_SIZE) -> Tuple[List[Dict], Optional[str]]:
+        with self._lock:
+            self._refresh()
+            # Walk the smallest index that covers the filters
+            candidates = [self._time_index]
+            if status:
+                candidates.append(self._status_index.get(status, []))
+            if name:
+                candidates.append(self._name_index.get(name, []))
+            index = min(candidates, key=len)
+
+            i = bisect_left(index, (since,)) if since else 0
+            if cursor:
+                i = max(i, bisect_right(index, decode_cursor(cursor)))
+            page = []
+            while i < len(index) and len(page) < limit:
+                key = index[i]
+                i += 1
+                if until and key[0] >= until:
+                    break
+                order = self._orders[self._key_ids[key]]
+                if status and order.get("status") != status:
+                    continue
+                if name and order.get("name") != name:
+                    continue
+                page.append(order)
+
+            more = i < len(index) and not (until and index[i][0] >= until)
+            next_cursor = encode_cursor(*self._keys[page[-1].get("order_id")]) if page and more else None
+            return page, next_cursor
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._orders)
+
+    def change_seq(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._seq
+
+    def changes(self, after: int, limit: int = ORDER_CHANGE_HISTORY_SIZE) -> Optional[List[Tuple[int, Dict]]]:
+        with self._lock:
+            self._refresh()
+            # Kept changes are numbered consecutively up to the latest write
+            floor = self._changes[0][0] - 1 if self._changes else self._seq
+            if after < floor or after > self._seq:
+                return None
+            start = after - floor
+            return list(islice(self._changes, start, start + limit))
+
+    def compact(self):
+        """Write the index out as a new snapshot and start a log holding only the recent changes"""
+        with self._file_lock():
+            with self._lock:
+                self._refresh()
+                self._compact()
+
+    def _compact(self):
+        tmp_file = f"{self.snapshot_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(json_codec.dumps_bytes(list(self._orders.values())))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+        self._snapshot_stat = self._stat(self.snapshot_file)
+        # Crashing before the rewrite is harmless: replaying a put is idempotent
+        entries = [{"op": "compacted", "seq": self._seq}]
+        entries += [{"op": "put", "seq": seq, "order": order} for seq, order in self._changes]
+        data = b"".join(json_codec.dumps_bytes(entry) + b"\n" for entry in entries)
+        with open(self.log_file, 'wb') as f:
+            f.write(data)
+        self._log_offset = len(data)
+        self._compacted_seq = self._seq
+
+    def close(self):
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
@@ -0,0 +1,82 @@
+import os
+import threading
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:
+    # No cross-process locking on Windows; run a single worker there
+    fcntl = None
+
+from constants.app_constants import ARABIC_NUMERALS
+from constants.order_constants import ORDER_ID_DIGITS, ORDER_ID_BLOCK_SIZE
+
+
+def default_counter_file(orders_file: str) -> str:
+    root, _ = os.path.splitext(orders_file)
+    return f"{root}.ids"
+
+
+def to_arabic_digits(number: str) -> str:
+    return "".join(ARABIC_NUMERALS[int(digit)] for digit in number)
+
+
+class OrderIdAllocator:
+    """
+    Unique, short order IDs from a persisted counter. Each process reserves
+    a block of `block_size` numbers at a time under an exclusive flock on
+    the counter file and hands them out from memory, so the file is touched
+    once per block and no scan of existing orders is needed. Numbers left in
+    a block when a process stops are skipped, never reused.
+
+    IDs are the sequence zero-padded to `digits` (growing past it if ever
+    needed) in Arabic-Indic digits, e.g. ٠٠٠٤٢. Multi-node deployments that
+    do not share the counter file set a distinct `node` prefix per node
+    (ORDER_ID_NODE). IDs for which `exists` returns true, such as random
+    IDs from before the counter, are skipped.
+    """
+
+    def __init__(self, counter_file: str, block_size: int = ORDER_ID_BLOCK_SIZE, digits: int = ORDER_ID_DIGITS,
+                 node: str = None, exists: Callable[[str], object] = None):
+        node = node if node is not None else os.getenv("ORDER_ID_NODE", "")
+        if node and not node.isdigit():
+            raise ValueError(f"ORDER_ID_NODE must be digits, got {node!r}")
+        self.counter_file = counter_file
+        self.block_size = block_size
+        self.digits = digits
+        self.node = node
+        self.exists = exists
+        self._next = 0
+        self._block_end = 0
+        self._lock = threading.Lock()
+
+    def _reserve_block(self):
+        fd = os.open(self.counter_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.read(fd, 64).strip()
+            start = int(raw) if raw else 1
+            end = start + self.block_size
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, str(end).encode("ascii"))
+            os.fsync(fd)
+        finally:
+            # Closing the descriptor releases the flock
+            os.close(fd)
+        self._next = start
+        self._block_end = end
+
+    def format(self, number: int) -> str:
+        return to_arabic_digits(self.node + str(number).zfill(self.digits))
+
+    def allocate(self) -> str:
+        with self._lock:
+            while True:
+                if self._next >= self._block_end:
+                    self._reserve_block()
+                order_id = self.format(self._next)
+                self._next += 1
+                if self.exists is None or not self.exists(order_id):
+                    return order_id
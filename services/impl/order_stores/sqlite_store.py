@@ -0,0 +1,193 @@
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from constants.order_constants import (
+    ORDER_DB_FILE, ORDER_DB_BUSY_TIMEOUT_MS, ORDER_PAGE_SIZE, ORDER_CHANGE_HISTORY_SIZE
+)
+from services.impl import json_codec
+from services.impl.order_stores.base import OrderStore, encode_cursor, decode_cursor
+
+# Statements are constant strings so sqlite3's per-connection statement cache
+# prepares each one once and reuses it
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS orders (
+        order_id TEXT PRIMARY KEY,
+        name TEXT,
+        status TEXT,
+        timestamp TEXT,
+        data TEXT NOT NULL
+    )
+    """,
+    # Filtered pages are ordered by (timestamp, rowid); rowid is implicit in every index
+    "CREATE INDEX IF NOT EXISTS idx_orders_name_timestamp ON orders (name, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_status_timestamp ON orders (status, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_timestamp ON orders (timestamp)",
+    # Change feed: each write, numbered by AUTOINCREMENT so numbers are never reused after pruning
+    """
+    CREATE TABLE IF NOT EXISTS order_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        data TEXT NOT NULL
+    )
+    """,
+)
+UPSERT_ORDER = """
+    INSERT INTO orders (order_id, name, status, timestamp, data) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (order_id) DO UPDATE SET
+        name = excluded.name, status = excluded.status,
+        timestamp = excluded.timestamp, data = excluded.data
+"""
+INSERT_CHANGE = "INSERT INTO order_changes (data) VALUES (?)"
+PRUNE_CHANGES = "DELETE FROM order_changes WHERE seq <= last_insert_rowid() - ?"
+SELECT_CHANGE_SEQ = "SELECT seq FROM sqlite_sequence WHERE name = 'order_changes'"
+SELECT_CHANGES = "SELECT seq, data FROM order_changes WHERE seq > ? ORDER BY seq LIMIT ?"
+SELECT_ORDER = "SELECT data FROM orders WHERE order_id = ?"
+SELECT_ALL_ORDERS = "SELECT data FROM orders ORDER BY rowid"
+COUNT_ORDERS = "SELECT COUNT(*) FROM orders"
+QUERY_ORDERS = "SELECT rowid, timestamp, data FROM orders{where} ORDER BY timestamp, rowid LIMIT ?"
+QUERY_FILTERS = (
+    ("status", "status = ?"),
+    ("name", "name = ?"),
+    ("since", "timestamp >= ?"),
+    ("until", "timestamp < ?"),
+)
+
+
+def _row(order: Dict) -> tuple:
+    return (
+        order.get("order_id"),
+        order.get("name"),
+        order.get("status"),
+        order.get("timestamp") or "",
+        json_codec.dumps(order),
+    )
+
+
+class SqliteOrderStore(OrderStore):
+    """
+    Orders in a SQLite database in WAL mode, so several uvicorn workers can
+    read while one writes. Each thread of each worker process gets its own
+    connection; `order_id`, `name`, `status` and `timestamp` are indexed
+    columns and the full order is kept as JSON in `data`.
+
+    Each write also adds a row to `order_changes` in the same transaction,
+    and rows older than the last `change_history` are pruned, so the change
+    feed is numbered by SQLite for every worker.
+    """
+
+    def __init__(self, db_file: str = ORDER_DB_FILE, busy_timeout_ms: int = ORDER_DB_BUSY_TIMEOUT_MS,
+                 change_history: int = ORDER_CHANGE_HISTORY_SIZE):
+        self.db_file = db_file
+        self.busy_timeout_ms = busy_timeout_ms
+        self.change_history = change_history
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        connection = self._connection()
+        with connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        # A forked worker must not reuse the parent's connection
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.db_file, timeout=self.busy_timeout_ms / 1000,
+                                         check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def _record_changes(self, connection: sqlite3.Connection, rows: List[tuple]):
+        connection.executemany(INSERT_CHANGE, [(row[4],) for row in rows])
+        connection.execute(PRUNE_CHANGES, (self.change_history,))
+
+    def append(self, order: Dict) -> Dict:
+        row = _row(order)
+        connection = self._connection()
+        with connection:
+            connection.execute(UPSERT_ORDER, row)
+            self._record_changes(connection, [row])
+        return order
+
+    def update(self, order_id: str, mutate: Callable[[Dict], Dict]) -> Optional[Dict]:
+        connection = self._connection()
+        # IMMEDIATE takes the write lock up front, so no other worker can change the row in between
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(SELECT_ORDER, (order_id,)).fetchone()
+            if row is None:
+                connection.rollback()
+                return None
+            order = mutate(json_codec.loads(row[0]))
+            row = _row(order)
+            connection.execute(UPSERT_ORDER, row)
+            self._record_changes(connection, [row])
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        return order
+
+    def bulk_insert(self, orders: Iterable[Dict]) -> int:
+        rows = [_row(order) for order in orders]
+        connection = self._connection()
+        with connection:
+            connection.executemany(UPSERT_ORDER, rows)
+            if rows:
+                self._record_changes(connection, rows)
+        return len(rows)
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        row = self._connection().execute(SELECT_ORDER, (order_id,)).fetchone()
+        return json_codec.loads(row[0]) if row else None
+
+    def list(self) -> List[Dict]:
+        return [json_codec.loads(data) for (data,) in self._connection().execute(SELECT_ALL_ORDERS)]
+
+    def query(self, status: str = None, name: str = None, since: str = None, until: str = None,
+              cursor: str = None, limit: int = ORDER_PAGE_SIZE) -> Tuple[List[Dict], Optional[str]]:
+        values = {"status": status, "name": name, "since": since, "until": until}
+        clauses, params = [], []
+        for field, clause in QUERY_FILTERS:
+            if values[field]:
+                clauses.append(clause)
+                params.append(values[field])
+        if cursor:
+            clauses.append("(timestamp, rowid) > (?, ?)")
+            params.extend(decode_cursor(cursor))
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        # Fetch one extra row to know whether another page exists
+        rows = self._connection().execute(QUERY_ORDERS.format(where=where), params + [limit + 1]).fetchall()
+        next_cursor = encode_cursor(rows[limit - 1][1], rows[limit - 1][0]) if len(rows) > limit else None
+        return [json_codec.loads(data) for _, _, data in rows[:limit]], next_cursor
+
+    def __len__(self) -> int:
+        return self._connection().execute(COUNT_ORDERS).fetchone()[0]
+
+    def change_seq(self) -> int:
+        row = self._connection().execute(SELECT_CHANGE_SEQ).fetchone()
+        return row[0] if row else 0
+
+    def changes(self, after: int, limit: int = ORDER_CHANGE_HISTORY_SIZE) -> Optional[List[Tuple[int, Dict]]]:
+        rows = self._connection().execute(SELECT_CHANGES, (after, limit)).fetchall()
+        # Sequence numbers have no gaps, so a missing next one was pruned
+        if rows and rows[0][0] != after + 1:
+            return None
+        if not rows and after > self.change_seq():
+            return None
+        return [(seq, json_codec.loads(data)) for seq, data in rows]
+
+    def close(self):
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
@@ -0,0 +1,77 @@
+from string import Formatter
+from typing import Dict, Mapping
+
+from constants.reply_constants import REPLY_TEMPLATES, REPLY_STATIC_SLOTS
+from services.impl.branch_service_impl import Branch, current_branch
+from services.impl.menu_service_impl import MenuCatalog
+
+
+class _KeepMissingSlots(dict):
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("{", "{{").replace("}", "}}")
+
+
+class ReplyTemplates:
+    """
+    Every handler reply for one branch and menu version, rendered once.
+    Replies without per-request slots are finished strings, so the same
+    reply is always the same text (and the same TTS cache entry); the
+    others keep only their per-request slots to fill with `get`.
+    """
+
+    def __init__(self, templates: Mapping[str, str], catalog: MenuCatalog, branch: Branch):
+        self.version = catalog.version
+        slots = dict(REPLY_STATIC_SLOTS)
+        slots.update({
+            "menu_text": catalog.menu_text,
+            "menu_names": catalog.names_text,
+            "price_list": catalog.price_list_text,
+            "price_list_lines": catalog.price_list_lines,
+            "hours": branch.hours,
+            "phone": branch.phone,
+            "address": branch.address,
+            "complaints_phone": branch.complaints_phone,
+        })
+        escaped = _KeepMissingSlots({name: _escape(value) for name, value in slots.items()})
+        self.replies: Dict[str, str] = {}
+        self.request_slots: Dict[str, frozenset] = {}
+        for key, template in templates.items():
+            fields = frozenset(field for _, field, _, _ in Formatter().parse(template) if field)
+            self.request_slots[key] = fields - slots.keys()
+            if self.request_slots[key]:
+                # Leave the per-request slots for get(); values stay escaped for that second format
+                self.replies[key] = template.format_map(escaped)
+            else:
+                self.replies[key] = template.format_map(slots)
+
+    def get(self, key: str, **slots) -> str:
+        reply = self.replies[key]
+        return reply.format(**slots) if self.request_slots[key] else reply
+
+
+class ReplyServiceImpl:
+    """Rendered replies per branch, re-rendered when the branch's menu version changes"""
+
+    def __init__(self, templates: Mapping[str, str] = None):
+        self.templates = templates or REPLY_TEMPLATES
+        # Branch ID -> replies for its current menu; a stale entry is replaced whole
+        self._rendered: Dict[str, ReplyTemplates] = {}
+
+    def for_branch(self, branch: Branch) -> ReplyTemplates:
+        catalog = branch.catalog
+        rendered = self._rendered.get(branch.id)
+        if rendered is None or rendered.version != catalog.version:
+            rendered = self._rendered[branch.id] = ReplyTemplates(self.templates, catalog, branch)
+        return rendered
+
+    def render(self, key: str, **slots) -> str:
+        """The reply `key` for the current branch, with its per-request slots filled"""
+        return self.for_branch(current_branch()).get(key, **slots)
+
+
+# Shared by the intent handlers
+reply_service = ReplyServiceImpl()
@@ -0,0 +1,138 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from constants.app_constants import SESSION_MAX_COUNT, SESSION_IDLE_TTL_SECONDS
+from enums.intent_enum import IntentEnum
+
+# Intents whose extracted items are part of the customer's order
+ORDER_ITEM_INTENTS = {IntentEnum.PLACE_ORDER.code, IntentEnum.PROVIDE_NAME.code}
+
+
+class DialogSession:
+    def __init__(self, session_id: str, now: float):
+        self.session_id = session_id
+        self.name: Optional[str] = None
+        self.items: List[str] = []
+        # Order lines ({"item", "quantity", "modifiers"}), one per item and modifier set
+        self.lines: List[Dict] = []
+        self.last_intent: Optional[str] = None
+        self.last_order_id: Optional[str] = None
+        self.turn_count = 0
+        self.created_at = now
+        self.last_seen = now
+
+    def to_dict(self) -> Dict:
+        return {
+            "session_id": self.session_id,
+            "name": self.name,
+            "items": list(self.items),
+            "lines": [dict(line) for line in self.lines],
+            "last_intent": self.last_intent,
+            "last_order_id": self.last_order_id,
+            "turn_count": self.turn_count,
+        }
+
+
+class SessionServiceImpl:
+    """
+    In-memory dialog state keyed by session ID, so clients only send the new
+    turn. Sessions are kept in least-recently-used order: idle sessions are
+    evicted from the front after `idle_ttl_seconds`, and the oldest ones are
+    dropped once `max_sessions` is reached.
+    """
+
+    def __init__(self, max_sessions: int = SESSION_MAX_COUNT, idle_ttl_seconds: float = SESSION_IDLE_TTL_SECONDS,
+                 clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.clock = clock
+        self._sessions: "OrderedDict[str, DialogSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[DialogSession]:
+        if not session_id:
+            return None
+        with self._lock:
+            now = self.clock()
+            self._evict_expired(now)
+            session = self._sessions.get(session_id)
+            if session:
+                self._touch(session, now)
+            return session
+
+    def get_or_create(self, session_id: str = None) -> DialogSession:
+        with self._lock:
+            now = self.clock()
+            self._evict_expired(now)
+            session = self._sessions.get(session_id) if session_id else None
+            if session:
+                self._touch(session, now)
+                return session
+            session = DialogSession(session_id or uuid.uuid4().hex, now)
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return session
+
+    def record_turn(self, session_id: str, intent_info: dict) -> DialogSession:
+        """Fold one handled turn into the session state"""
+        session = self.get_or_create(session_id)
+        with self._lock:
+            session.turn_count += 1
+            intent = intent_info.get("intent")
+            session.last_intent = intent
+            if intent_info.get("name"):
+                session.name = intent_info["name"]
+            if intent == IntentEnum.CANCEL_ORDER.code:
+                session.items = []
+                session.lines = []
+            elif intent in ORDER_ITEM_INTENTS:
+                for item in intent_info.get("items") or []:
+                    if item not in session.items:
+                        session.items.append(item)
+                for line in intent_info.get("lines") or []:
+                    # A line whose quantity was asked about again waits for the answer
+                    if not line.get("quantity_unclear"):
+                        self._merge_line(session, line)
+        return session
+
+    def record_order(self, session_id: str, order: dict):
+        """Remember the submitted order and start a fresh basket"""
+        session = self.get(session_id)
+        if not session:
+            return
+        with self._lock:
+            session.last_order_id = order.get("order_id")
+            session.items = []
+            session.lines = []
+
+    @staticmethod
+    def _merge_line(session: DialogSession, line: Dict):
+        # Naming the same item and modifiers again restates its quantity
+        for index, existing in enumerate(session.lines):
+            if existing["item"] == line["item"] and existing["modifiers"] == line["modifiers"]:
+                session.lines[index] = dict(line)
+                return
+        session.lines.append(dict(line))
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _touch(self, session: DialogSession, now: float):
+        session.last_seen = now
+        self._sessions.move_to_end(session.session_id)
+
+    def _evict_expired(self, now: float):
+        # LRU order means only the expired prefix is visited
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_seen < self.idle_ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
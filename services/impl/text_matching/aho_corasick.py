@@ -0,0 +1,92 @@
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Union
+
+
+class KeywordMatch(NamedTuple):
+    start: int
+    end: int
+    keyword: str
+    value: Any
+
+
+class AhoCorasickMatcher:
+    """
+    Multi-pattern substring matcher. The automaton is compiled once from the
+    keywords (a list, or a mapping of keyword -> value such as alias -> menu
+    item) and then finds every occurrence of every keyword in a single pass
+    over the text, however many keywords there are.
+    """
+
+    def __init__(self, keywords: Union[Iterable[str], Mapping[str, Any]]):
+        if not isinstance(keywords, Mapping):
+            keywords = {keyword: keyword for keyword in keywords}
+        self.keywords: Dict[str, Any] = {keyword: value for keyword, value in keywords.items() if keyword}
+        # state -> {char: next state}; state 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # state -> keywords ending there, own keyword first, then via fail links
+        self._output: List[tuple] = [()]
+        for keyword in self.keywords:
+            self._add(keyword)
+        self._link()
+
+    def _add(self, keyword: str):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] = (keyword,)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """Every keyword occurrence, overlaps included, ordered by end position"""
+        goto, fail, output, keywords = self._goto, self._fail, self._output, self.keywords
+        matches = []
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                end = index + 1
+                for keyword in output[state]:
+                    matches.append(KeywordMatch(end - len(keyword), end, keyword, keywords[keyword]))
+        return matches
+
+    def find(self, text: str, accept: Optional[Callable[[KeywordMatch], bool]] = None) -> List[KeywordMatch]:
+        """
+        Non-overlapping matches, leftmost first and longest at each position,
+        so "دجاج مشوي" wins over a shorter "دجاج" inside it. Matches rejected
+        by `accept` are dropped before they can hide an overlapping one.
+        """
+        matches = self.find_all(text)
+        if accept is not None:
+            matches = [match for match in matches if accept(match)]
+        matches.sort(key=lambda match: (match.start, -match.end))
+        selected = []
+        position = 0
+        for match in matches:
+            if match.start >= position:
+                selected.append(match)
+                position = match.end
+        return selected
@@ -0,0 +1,40 @@
+import re
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+# Spelling variants Whisper produces for the same word, folded to one form
+_LETTER_FOLDS = {
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ؤ": "و", "ئ": "ي",
+    "ى": "ي", "ة": "ه",
+    # Persian letters Whisper sometimes emits for Arabic audio
+    "ی": "ي", "ک": "ك",
+}
+# Tatweel and tashkeel (fathatan through sukun, superscript alef) are dropped
+_DROPPED = "ـًٌٍَُِّْٰ"
+
+_TRANSLATION = str.maketrans({
+    **_LETTER_FOLDS,
+    **{char: None for char in _DROPPED},
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},  # Arabic-Indic digits
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},  # Extended (Persian) digits
+})
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_arabic(text: str) -> str:
+    """
+    Canonical matching form of a transcription or keyword: hamza/alef forms,
+    ta marbuta and alef maqsura folded, tatweel and diacritics removed,
+    digits made ASCII, whitespace collapsed. Cached, so every matcher that
+    sees the same utterance pays for normalizing it once.
+    """
+    if not text:
+        return ""
+    return _WHITESPACE.sub(" ", text.translate(_TRANSLATION)).strip().lower()
+
+
+def normalize_vocabulary(words: Iterable[str]) -> Tuple[str, ...]:
+    """Normalized forms of a keyword list, in order, with variants collapsed"""
+    return tuple(dict.fromkeys(normalize_arabic(word) for word in words if word))
@@ -0,0 +1,100 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+from services.impl.text_matching.arabic_normalizer import normalize_arabic
+
+# Character n-gram length for the shortlist; bigrams suit short Arabic dish names
+NGRAM_SIZE = 2
+
+
+def ngrams(text: str, n: int = NGRAM_SIZE) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def lcs_length(match_masks: Dict[str, int], length: int, text: str) -> int:
+    """
+    Longest common subsequence of a pre-masked pattern and `text`, computed
+    bit-parallel (one big-int update per character of `text`).
+    """
+    full = (1 << length) - 1
+    row = full
+    for char in text:
+        matched = row & match_masks.get(char, 0)
+        row = ((row + matched) | (row - matched)) & full
+    return length - bin(row).count("1")
+
+
+class _IndexedItem:
+    __slots__ = ("value", "key", "masks")
+
+    def __init__(self, value: str, key: str):
+        self.value = value
+        self.key = key
+        self.masks: Dict[str, int] = {}
+        for position, char in enumerate(key):
+            self.masks[char] = self.masks.get(char, 0) | (1 << position)
+
+
+class FuzzyMenuIndex:
+    """
+    Fuzzy lookup of a spoken phrase against menu names. Names are normalized
+    and indexed by character n-gram once; a lookup only scores the items that
+    share an n-gram with the phrase, using an LCS similarity
+    (2 * LCS / total length) with the substring boosts the menu matcher has
+    always applied. `items` may map aliases to the menu item they stand for.
+    LCS scores are never below difflib's ratio, and on the dataset vocabulary
+    the 0.6 threshold picks the same item SequenceMatcher did
+    (tests/test_fuzzy_index.py).
+    """
+
+    def __init__(self, items: Union[Iterable[str], Mapping[str, str]]):
+        if not isinstance(items, Mapping):
+            items = {item: item for item in items}
+        self.items: List[_IndexedItem] = [_IndexedItem(value, self.normalize(name)) for name, value in items.items()]
+        self._postings: Dict[str, List[int]] = {}
+        for position, item in enumerate(self.items):
+            for gram in ngrams(item.key):
+                self._postings.setdefault(gram, []).append(position)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return normalize_arabic(text)
+
+    def _shortlist(self, key: str) -> List[int]:
+        grams = ngrams(key)
+        if not grams:
+            return list(range(len(self.items)))
+        positions = set()
+        for gram in grams:
+            positions.update(self._postings.get(gram, ()))
+        return sorted(positions)
+
+    @staticmethod
+    def similarity(key: str, item: _IndexedItem) -> float:
+        total = len(key) + len(item.key)
+        score = 2 * lcs_length(item.masks, len(item.key), key) / total if total else 1.0
+        # Partial transcriptions ("دجاج") and extra words around a dish name
+        if key in item.key:
+            score = max(score, 0.8)
+        if item.key in key:
+            score = max(score, 0.9)
+        return score
+
+    def best_match(self, candidate: str, threshold: float = 0.6) -> Optional[str]:
+        """The closest menu item scoring at least `threshold`, first item on ties"""
+        key = self.normalize(candidate)
+        best_value = None
+        best_score = 0
+        for position in self._shortlist(key):
+            item = self.items[position]
+            score = self.similarity(key, item)
+            if score > best_score and score >= threshold:
+                best_score = score
+                best_value = item.value
+        return best_value
+
+
+@lru_cache(maxsize=32)
+def fuzzy_index_for(items: Tuple[str, ...]) -> FuzzyMenuIndex:
+    """Build an index once per distinct menu"""
+    return FuzzyMenuIndex(items)
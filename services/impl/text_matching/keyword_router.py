@@ -0,0 +1,38 @@
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Mapping
+
+from constants.intent_constants import INTENT_KEYWORDS
+from services.impl.text_matching.aho_corasick import AhoCorasickMatcher
+from services.impl.text_matching.arabic_normalizer import normalize_arabic
+
+ROUTE_CACHE_SIZE = 1024
+
+
+class KeywordRouter:
+    """
+    Every handler vocabulary compiled into one automaton. `route` scans an
+    utterance once and returns all keyword categories it mentions; the
+    handlers then branch on category names instead of re-scanning the text
+    per word list. Results are cached per utterance, since the same
+    transcription is routed by more than one handler step.
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]], cache_size: int = ROUTE_CACHE_SIZE):
+        keywords: Dict[str, tuple] = {}
+        for category, words in categories.items():
+            for word in words:
+                key = normalize_arabic(word)
+                if key and category not in keywords.get(key, ()):
+                    keywords[key] = keywords.get(key, ()) + (category,)
+        self.categories = tuple(categories)
+        self._matcher = AhoCorasickMatcher(keywords)
+        self.route = lru_cache(maxsize=cache_size)(self._route)
+
+    def _route(self, text: str) -> FrozenSet[str]:
+        return frozenset(category
+                         for match in self._matcher.find_all(normalize_arabic(text))
+                         for category in match.value)
+
+
+# Shared by the intent handlers
+intent_keyword_router = KeywordRouter(INTENT_KEYWORDS)
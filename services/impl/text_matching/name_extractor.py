@@ -0,0 +1,81 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from constants.app_constants import NAME_EXTRACTION_STOPWORDS, NAME_MAX_WORDS, NAME_TERMINATORS, NAME_TRIGGER_PHRASES
+from constants.order_constants import ORDER_KEYWORDS
+from services.impl.text_matching.arabic_normalizer import normalize_arabic
+
+# Words, keeping diacritics and tatweel attached; punctuation splits
+_TOKEN = re.compile(r"[\wًٌٍَُِّْٰـ]+")
+
+
+class NameExtractor:
+    """
+    Single left-to-right pass over the tokens of an utterance. A trigger
+    phrase ("اسمي", "ضيف الطلب باسم") switches to collecting up to
+    `max_words` name tokens, stopping at a terminator, stopword, menu word
+    (also with "و" attached) or another trigger ("أنا اسمي محمود" restarts at "اسمي"). Tokens are
+    compared in normalized form; the name is returned as spoken.
+    """
+
+    def __init__(self, triggers: Iterable[str] = NAME_TRIGGER_PHRASES, stopwords: Iterable[str] = NAME_EXTRACTION_STOPWORDS,
+                 terminators: Iterable[str] = NAME_TERMINATORS, menu_items: Iterable[str] = ORDER_KEYWORDS,
+                 max_words: int = NAME_MAX_WORDS):
+        # first token -> trigger phrases starting with it, longest first
+        self._triggers: Dict[str, List[Tuple[str, ...]]] = {}
+        for phrase in triggers:
+            tokens = tuple(normalize_arabic(phrase).split())
+            if tokens:
+                self._triggers.setdefault(tokens[0], []).append(tokens)
+        for phrases in self._triggers.values():
+            phrases.sort(key=len, reverse=True)
+        self._stopwords = frozenset(normalize_arabic(word) for word in stopwords)
+        self._menu_words = frozenset(token for item in menu_items for token in normalize_arabic(item).split())
+        self._terminators = self._stopwords | self._menu_words | {normalize_arabic(word) for word in terminators}
+        self.max_words = max_words
+
+    def _trigger_length(self, keys: List[str], position: int) -> int:
+        for phrase in self._triggers.get(keys[position], ()):
+            if tuple(keys[position:position + len(phrase)]) == phrase:
+                return len(phrase)
+        return 0
+
+    def _ends_name(self, key: str) -> bool:
+        """A terminator, also with the conjunction attached ("وبدي", "وشاورما") as Whisper writes it"""
+        if key in self._terminators:
+            return True
+        return len(key) > 1 and key[0] == "و" and key[1:] in self._terminators
+
+    def extract(self, text: str, fallback: bool = True) -> Optional[str]:
+        """
+        The name after a trigger phrase. Without one, and with `fallback`,
+        the first word that is not a stopword, terminator or menu word (a
+        bare "أحمد" in reply to "what's your name?").
+        """
+        tokens = _TOKEN.findall(text or "")
+        keys = _TOKEN.findall(normalize_arabic(text))
+        if len(keys) != len(tokens):
+            # A token made only of tatweel/diacritics vanished when normalized
+            keys = [normalize_arabic(token) for token in tokens]
+        position = 0
+        while position < len(tokens):
+            trigger = self._trigger_length(keys, position)
+            if not trigger:
+                position += 1
+                continue
+            start = end = position + trigger
+            while (end < len(tokens) and end - start < self.max_words
+                   and not self._ends_name(keys[end]) and not self._trigger_length(keys, end)):
+                end += 1
+            if end > start:
+                return " ".join(tokens[start:end])
+            position = start
+        if fallback:
+            for token, key in zip(tokens, keys):
+                if len(key) > 1 and key not in self._terminators:
+                    return token
+        return None
+
+
+# Shared by OrderServiceImpl and the intent handlers
+name_extractor = NameExtractor()
@@ -0,0 +1,191 @@
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Tuple
+
+from constants.order_constants import (
+    ORDER_QUANTITY_WORDS, ORDER_QUANTITY_UNIT_WORDS, ORDER_LINE_MAX_QUANTITY, ORDER_LINE_IGNORED_NUMBER,
+    ORDER_MODIFIER_PREFIXES, ORDER_MODIFIER_WORDS,
+)
+from services.impl.text_matching.aho_corasick import AhoCorasickMatcher, KeywordMatch
+from services.impl.text_matching.arabic_normalizer import normalize_arabic
+
+# Token kinds carried as automaton values: (kind, value)
+ITEM = "item"
+QUANTITY = "quantity"
+DIGIT = "digit"
+MODIFIER = "modifier"
+MODIFIER_PREFIX = "modifier_prefix"
+
+
+class OrderLine(NamedTuple):
+    item: str
+    quantity: int = 1
+    modifiers: Tuple[str, ...] = ()
+    # A quantity was said but is above the line maximum; ask for it again
+    quantity_unclear: bool = False
+
+    def describe(self) -> str:
+        """The line as read back to the customer; a single plain item is just its name"""
+        text = self.item if self.quantity == 1 else f"{self.quantity} {self.item}"
+        return " ".join((text,) + self.modifiers)
+
+    def to_dict(self) -> Dict:
+        line = {"item": self.item, "quantity": self.quantity, "modifiers": list(self.modifiers)}
+        if self.quantity_unclear:
+            line["quantity_unclear"] = True
+        return line
+
+
+def _is_word(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] is a whole word, allowing a leading conjunction ("وتنين")"""
+    if end < len(text) and text[end].isalnum():
+        return False
+    if start == 0 or not text[start - 1].isalnum():
+        return True
+    return text[start - 1] == "و" and (start == 1 or not text[start - 2].isalnum())
+
+
+class OrderLineParser:
+    """
+    Turns a normalized utterance into order lines in one pass. Menu names
+    and aliases, number words, digits and modifier words are compiled into
+    a single automaton; the matches are then walked left to right, with a
+    quantity applying to the next item ("تنين شاورما"), or to the item just
+    before it when "و" or the end of the utterance follows ("شاورما تنين
+    وعصير"), and modifiers to the item before them ("شاورما بدون ثوم"). A
+    trailing number only belongs to the item it directly follows, past its
+    modifiers and counting words ("حبات"), so "شاورما الساعة 7" orders one.
+    Compound numbers ("خمسة وعشرين", "تلاتة عشر") are joined first; a
+    quantity above `max_quantity` marks its line for clarification. Menu
+    names match anywhere, as before; numbers and modifiers only as whole
+    words, so "ست" inside "استلام" is ignored.
+    """
+
+    def __init__(self, aliases: Mapping[str, str], quantity_words: Mapping[str, int] = ORDER_QUANTITY_WORDS,
+                 modifier_prefixes: Mapping[str, str] = ORDER_MODIFIER_PREFIXES,
+                 modifier_words: Mapping[str, str] = ORDER_MODIFIER_WORDS, max_quantity: int = ORDER_LINE_MAX_QUANTITY,
+                 ignored_number: int = ORDER_LINE_IGNORED_NUMBER, unit_words: Iterable[str] = ORDER_QUANTITY_UNIT_WORDS):
+        keywords = {str(digit): (DIGIT, digit) for digit in range(10)}
+        keywords.update({normalize_arabic(word): (QUANTITY, number) for word, number in quantity_words.items()})
+        keywords.update({normalize_arabic(word): (MODIFIER_PREFIX, canonical)
+                         for word, canonical in modifier_prefixes.items()})
+        keywords.update({normalize_arabic(word): (MODIFIER, canonical) for word, canonical in modifier_words.items()})
+        # Menu spellings (already normalized) win over a number or modifier spelled the same
+        keywords.update({alias: (ITEM, name) for alias, name in aliases.items()})
+        self.matcher = AhoCorasickMatcher(keywords)
+        self.max_quantity = max_quantity
+        self.ignored_number = ignored_number
+        self.unit_words = frozenset(normalize_arabic(word) for word in unit_words)
+
+    def _accept(self, text: str):
+        def accept(match: KeywordMatch) -> bool:
+            kind = match.value[0]
+            # Digit runs are checked once they are joined into a number
+            return kind in (ITEM, DIGIT) or _is_word(text, match.start, match.end)
+        return accept
+
+    def _tokens(self, text: str) -> List[Tuple]:
+        """(kind, value, start, end) for each match, with digit runs and compound numbers joined"""
+        matches = self.matcher.find(text, self._accept(text))
+        tokens: List[Tuple] = []
+        index = 0
+        while index < len(matches):
+            match = matches[index]
+            kind, value = match.value
+            start, end = match.start, match.end
+            index += 1
+            if kind == DIGIT:
+                while index < len(matches) and matches[index].value[0] == DIGIT and matches[index].start == end:
+                    value = value * 10 + matches[index].value[1]
+                    end = matches[index].end
+                    index += 1
+                if not _is_word(text, start, end):
+                    continue
+                kind = QUANTITY
+            if kind == QUANTITY and tokens and tokens[-1][0] == QUANTITY:
+                _, units, units_start, units_end = tokens[-1]
+                between = text[units_end:start].strip()
+                # "خمسة وعشرين" is 25, "تلاتة عشر" is 13
+                if (between == "و" and 0 < units < 10 and value in range(20, 100, 10)) or \
+                        (not between and 2 < units < 10 and value == 10):
+                    tokens[-1] = (QUANTITY, units + value, units_start, end)
+                    continue
+            tokens.append((kind, value, start, end))
+        return tokens
+
+    def _adjoins(self, text: str, end: int, start: int) -> bool:
+        """Whether only whitespace and counting words lie between text[:end] and text[start:]"""
+        return all(word in self.unit_words for word in text[end:start].split())
+
+    def _set_quantity(self, line: list, quantity: int):
+        line[2] = True
+        if quantity > self.max_quantity:
+            line[4] = True
+        else:
+            line[1] = quantity
+
+    def parse(self, text: str) -> List[OrderLine]:
+        """Order lines in the (normalized) text, one per item and modifier set"""
+        tokens = self._tokens(text)
+        lines: List[list] = []  # [item, quantity, quantity given, modifiers, quantity unclear]
+        pending_quantity = None
+        pending_follows_item = False
+        pending_modifiers: List[str] = []
+        item_end = None  # end of the item just walked and its modifiers, if nothing else came after
+        skip_until = 0
+        for index, (kind, value, start, end) in enumerate(tokens):
+            if start < skip_until:
+                continue
+            follows_item = item_end is not None and self._adjoins(text, item_end, start)
+            item_end = None
+            if kind == QUANTITY:
+                if not 0 < value < self.ignored_number:
+                    continue
+                if index + 1 < len(tokens):
+                    ends_phrase = text[end:tokens[index + 1][2]].strip() == "و"
+                else:
+                    ends_phrase = not any(char.isalnum() for char in text[end:])
+                if follows_item and ends_phrase and not lines[-1][2]:
+                    self._set_quantity(lines[-1], value)
+                else:
+                    pending_quantity = value
+                    pending_follows_item = follows_item
+            elif kind == ITEM:
+                line = [value, 1, False, pending_modifiers, False]
+                if pending_quantity is not None:
+                    self._set_quantity(line, pending_quantity)
+                lines.append(line)
+                pending_quantity = None
+                pending_modifiers = []
+                item_end = end
+            else:
+                if kind == MODIFIER_PREFIX:
+                    # The object is the next word, or the whole menu item that starts there
+                    start = end
+                    while start < len(text) and text[start] == " ":
+                        start += 1
+                    if index + 1 < len(tokens) and tokens[index + 1][2] == start and tokens[index + 1][0] == ITEM:
+                        obj, skip_until = tokens[index + 1][1], tokens[index + 1][3]
+                    else:
+                        skip_until = start
+                        while skip_until < len(text) and text[skip_until].isalnum():
+                            skip_until += 1
+                        obj = text[start:skip_until]
+                    if not obj:
+                        continue
+                    value = f"{value} {obj}"
+                modifiers = lines[-1][3] if lines else pending_modifiers
+                if value not in modifiers:
+                    modifiers.append(value)
+                if follows_item:
+                    item_end = max(end, skip_until)
+        # A number left over at the end belongs to the last item only if it follows it ("شاورما حار تنين لو سمحت")
+        if pending_quantity is not None and pending_follows_item and lines and not lines[-1][2]:
+            self._set_quantity(lines[-1], pending_quantity)
+
+        # Naming an item again ("شاورما وكمان شاورما") adds to it
+        merged: Dict[Tuple, list] = {}
+        for item, quantity, _, modifiers, unclear in lines:
+            total = merged.setdefault((item, tuple(modifiers)), [0, False])
+            total[0] += quantity
+            total[1] = total[1] or unclear or total[0] > self.max_quantity
+        return [OrderLine(item, quantity, modifiers, unclear)
+                for (item, modifiers), (quantity, unclear) in merged.items()]
@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+from constants.app_constants import (
+    SLOW_TRACE_THRESHOLD_MS, SLOW_TRACE_LOG_PATH, SLOW_TRACE_LOG_MAX_BYTES, SLOW_TRACE_LOG_BACKUP_COUNT
+)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "start", "end", "children", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str):
+        self.name = name
+        self.trace_id = trace_id
+        self.start = time.perf_counter()
+        self.end = None
+        self.children: List["Span"] = []
+        self.attributes: Dict = {}
+        self.error = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def to_dict(self, origin: float = None) -> Dict:
+        origin = self.start if origin is None else origin
+        span = {
+            "name": self.name,
+            "offset_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3),
+        }
+        if self.attributes:
+            span["attributes"] = self.attributes
+        if self.error:
+            span["error"] = self.error
+        if self.children:
+            span["children"] = [child.to_dict(origin) for child in self.children]
+        return span
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+class TracingServiceImpl:
+    """
+    Per-request span trees. A trace is opened per HTTP request; nested
+    `span()` blocks attach to whatever span is current in the context, and are
+    no-ops outside a trace. Traces slower than the threshold are written with
+    their full span tree to a rotating JSON Lines log.
+    """
+
+    def __init__(self, slow_threshold_ms: float = None, log_path: str = None,
+                 max_bytes: int = SLOW_TRACE_LOG_MAX_BYTES, backup_count: int = SLOW_TRACE_LOG_BACKUP_COUNT):
+        if slow_threshold_ms is None:
+            slow_threshold_ms = float(os.getenv("SLOW_TRACE_THRESHOLD_MS", SLOW_TRACE_THRESHOLD_MS))
+        self.slow_threshold_ms = slow_threshold_ms
+        self.log_path = log_path or os.getenv("SLOW_TRACE_LOG_PATH", SLOW_TRACE_LOG_PATH)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._logger = None
+
+    def _get_logger(self) -> logging.Logger:
+        # Opened lazily so importing the module never creates the log file
+        if self._logger is None:
+            logger = logging.getLogger(f"slow_traces.{id(self)}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            handler = RotatingFileHandler(self.log_path, maxBytes=self.max_bytes,
+                                          backupCount=self.backup_count, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    @contextmanager
+    def trace(self, name: str, trace_id: str = None, **attributes):
+        root = Span(name, trace_id or uuid.uuid4().hex)
+        root.attributes.update(attributes)
+        token = _current_span.set(root)
+        try:
+            yield root
+        except Exception as e:
+            root.error = repr(e)
+            raise
+        finally:
+            root.end = time.perf_counter()
+            _current_span.reset(token)
+            if root.duration_ms >= self.slow_threshold_ms:
+                self._write_slow_trace(root)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        span = Span(name, parent.trace_id)
+        if attributes:
+            span.attributes.update(attributes)
+        parent.children.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.error = repr(e)
+            raise
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+
+    def _write_slow_trace(self, root: Span):
+        record = {
+            "trace_id": root.trace_id,
+            "name": root.name,
+            "timestamp": datetime.now().isoformat(),
+            "duration_ms": round(root.duration_ms, 3),
+            "spans": root.to_dict(),
+        }
+        try:
+            self._get_logger().info(json.dumps(record, ensure_ascii=False))
+        except Exception as e:
+            print(f"Warning: could not write slow trace: {e}")
+
+
+# Shared by the services wired in app.py; tests can pass their own instance
+tracing_service = TracingServiceImpl()
@@ -11,7 +11,7 @@ ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY", "sk_1dd1f02fe206b1602ee7df9
 VOICE_ID = os.getenv("VOICE_ID", "mRdG9GYEjJmIzqbYTidv")
 
 class TTSServiceImpl:
-    def synthesize_speech(self, text: str) -> bytes:
+    def synthesize_speech(self, text: str, output_format: str = None) -> bytes:
         # Check if environment variables are set
         if not ELEVENLABS_API_KEY:
             raise ValueError("ELEVENLABS_API_KEY environment variable is not set")
@@ -30,10 +30,12 @@ class TTSServiceImpl:
                 "similarity_boost": 0.75
             }
         }
-        
+        # e.g. "ulaw_8000" for telephony playback; ElevenLabs defaults to mp3
+        params = {"output_format": output_format} if output_format else None
+
         try:
             # Add timeout to prevent hanging
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = requests.post(url, headers=headers, json=payload, params=params, timeout=30)
             response.raise_for_status()
             return response.content
         except requests.exceptions.Timeout:
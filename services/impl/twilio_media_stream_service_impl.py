@@ -0,0 +1,310 @@
+import asyncio
+import base64
+import io
+import json
+import time
+import wave
+from array import array
+from collections import deque
+from contextlib import nullcontext
+from typing import Awaitable, Callable, Iterable, List
+
+from constants.telephony_constants import (
+    TWILIO_SAMPLE_RATE, WHISPER_SAMPLE_RATE, TWILIO_FRAME_BYTES,
+    SPEECH_RMS_THRESHOLD, SPEECH_PREROLL_MS, END_OF_UTTERANCE_SILENCE_MS,
+    MIN_UTTERANCE_MS, MAX_UTTERANCE_MS, TTS_TELEPHONY_OUTPUT_FORMAT, TELEPHONY_ADMISSION_ROUTE
+)
+from services.impl.admission_service_impl import AdmissionRejectedError
+from services.impl.metrics_service_impl import metrics_service
+
+reply_latency = metrics_service.histogram(
+    "telephony_reply_latency_seconds", "Caller end of speech to first reply byte on phone calls")
+
+
+def _ulaw_to_linear(u_val: int) -> int:
+    u_val = ~u_val & 0xFF
+    sign = u_val & 0x80
+    exponent = (u_val >> 4) & 0x07
+    mantissa = u_val & 0x0F
+    sample = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return -sample if sign else sample
+
+
+# G.711 mu-law decodes through a 256-entry table, so a 20 ms frame costs 160 lookups
+_ULAW_DECODE_TABLE = [_ulaw_to_linear(i) for i in range(256)]
+
+
+def ulaw_decode(data: bytes) -> array:
+    """Decode mu-law bytes to signed 16-bit PCM samples"""
+    table = _ULAW_DECODE_TABLE
+    return array('h', [table[b] for b in data])
+
+
+def linear_to_ulaw(sample: int) -> int:
+    """Encode one signed 16-bit PCM sample as a mu-law byte"""
+    sign = 0
+    if sample < 0:
+        sample = -sample
+        sign = 0x80
+    sample = min(sample, 32635) + 0x84
+    exponent = 7
+    mask = 0x4000
+    while exponent > 0 and not sample & mask:
+        exponent -= 1
+        mask >>= 1
+    mantissa = (sample >> (exponent + 3)) & 0x0F
+    return ~(sign | (exponent << 4) | mantissa) & 0xFF
+
+
+def ulaw_encode(samples: Iterable[int]) -> bytes:
+    return bytes(linear_to_ulaw(s) for s in samples)
+
+
+def pcm16_to_wav(samples: array, sample_rate: int = WHISPER_SAMPLE_RATE) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+class IncrementalResampler:
+    """
+    Linear-interpolation resampler that keeps its phase and the last input
+    sample between chunks, so 20 ms frames can be fed one at a time without
+    clicks at the frame boundaries.
+    """
+
+    def __init__(self, in_rate: int = TWILIO_SAMPLE_RATE, out_rate: int = WHISPER_SAMPLE_RATE):
+        self.step = in_rate / out_rate
+        self._prev = None
+        self._pos = 0.0
+
+    def process(self, samples: array) -> array:
+        if self._prev is None:
+            buffer = list(samples)
+        else:
+            buffer = [self._prev]
+            buffer.extend(samples)
+        out = array('h')
+        if not buffer:
+            return out
+        last = len(buffer) - 1
+        pos = self._pos
+        step = self.step
+        while pos < last:
+            i = int(pos)
+            frac = pos - i
+            out.append(int(buffer[i] + (buffer[i + 1] - buffer[i]) * frac))
+            pos += step
+        self._pos = pos - last
+        self._prev = buffer[-1]
+        return out
+
+
+class MediaStreamSession:
+    """
+    State for one Twilio Media Streams call: buffers caller audio, cuts it into
+    utterances with an energy VAD and answers each utterance through the
+    existing Whisper -> intent -> TTS pipeline. The model and TTS calls run
+    off the event loop inside an admission slot, and replies come from the
+    voice agent's TTS cache.
+    """
+
+    def __init__(self, whisper_service, voice_agent_service, tts_service,
+                 send: Callable[[dict], Awaitable[None]], clock: Callable[[], float] = time.perf_counter,
+                 admission_service=None):
+        self.whisper_service = whisper_service
+        self.voice_agent_service = voice_agent_service
+        self.tts_service = tts_service
+        self.send = send
+        self.clock = clock
+        self.admission_service = admission_service
+
+        self.stream_sid = None
+        self.call_sid = None
+        self.transcriptions: List[str] = []
+        self.reply_latencies: List[float] = []
+
+        self._resampler = IncrementalResampler()
+        self._utterance = array('h')
+        self._preroll = deque(maxlen=max(1, SPEECH_PREROLL_MS // 20))
+        self._in_speech = False
+        self._speech_ms = 0
+        self._silence_ms = 0
+        self._end_of_speech_at = None
+
+    async def handle_message(self, message: dict) -> bool:
+        """Handle one media-stream event. Returns False once the stream stopped."""
+        event = message.get("event")
+        if event == "start":
+            start = message.get("start", {})
+            self.stream_sid = start.get("streamSid", message.get("streamSid"))
+            self.call_sid = start.get("callSid")
+        elif event == "media":
+            payload = base64.b64decode(message["media"]["payload"])
+            await self._handle_audio(payload)
+        elif event == "stop":
+            if self._in_speech:
+                await self._finish_utterance()
+            return False
+        return True
+
+    async def _handle_audio(self, payload: bytes):
+        pcm = ulaw_decode(payload)
+        if not pcm:
+            return
+        frame_ms = len(pcm) * 1000 // TWILIO_SAMPLE_RATE
+        resampled = self._resampler.process(pcm)
+        voiced = _rms(pcm) >= SPEECH_RMS_THRESHOLD
+
+        if not self._in_speech:
+            if not voiced:
+                self._preroll.append(resampled)
+                return
+            self._in_speech = True
+            self._speech_ms = 0
+            self._silence_ms = 0
+            for chunk in self._preroll:
+                self._utterance.extend(chunk)
+            self._preroll.clear()
+
+        self._utterance.extend(resampled)
+        self._speech_ms += frame_ms
+        if voiced:
+            self._silence_ms = 0
+            self._end_of_speech_at = self.clock()
+        else:
+            self._silence_ms += frame_ms
+
+        if self._silence_ms >= END_OF_UTTERANCE_SILENCE_MS or self._speech_ms >= MAX_UTTERANCE_MS:
+            await self._finish_utterance()
+
+    async def _finish_utterance(self):
+        samples = self._utterance
+        speech_ms = self._speech_ms - self._silence_ms
+        end_of_speech_at = self._end_of_speech_at or self.clock()
+        self._utterance = array('h')
+        self._in_speech = False
+        self._speech_ms = 0
+        self._silence_ms = 0
+        if speech_ms < MIN_UTTERANCE_MS:
+            return
+
+        try:
+            async with self._admission_slot():
+                reply_audio = await self._reply_to(samples)
+        except AdmissionRejectedError as e:
+            print(f"Telephony reply dropped for call {self.call_sid}: {e}")
+            return
+        except Exception as e:
+            # One failed utterance (Whisper, intent or TTS) skips its reply, not the rest of the call
+            print(f"Error answering utterance on call {self.call_sid}: {e}")
+            metrics_service.errors.inc(stage="telephony")
+            return
+        if reply_audio:
+            await self._send_audio(reply_audio, end_of_speech_at)
+
+    def _admission_slot(self):
+        if self.admission_service is None:
+            return nullcontext()
+        return self.admission_service.slot(TELEPHONY_ADMISSION_ROUTE)
+
+    async def _reply_to(self, samples: array) -> bytes:
+        """mu-law audio answering the utterance, or b"" if there is nothing to say"""
+        transcription = await self.whisper_service.transcribe_audio(pcm16_to_wav(samples))
+        if not transcription or not transcription.strip():
+            return b""
+        self.transcriptions.append(transcription)
+        # The call SID doubles as the dialog session ID for the whole phone call
+        intent_info = await asyncio.to_thread(self.voice_agent_service.extract_intent, transcription, self.call_sid)
+        reply_text = intent_info.get("reply_text", "")
+        if not reply_text:
+            return b""
+        reply_audio = await asyncio.to_thread(
+            self.voice_agent_service.generate_audio, reply_text, TTS_TELEPHONY_OUTPUT_FORMAT)
+        return base64.b64decode(reply_audio)
+
+    async def _send_audio(self, ulaw_audio: bytes, end_of_speech_at: float):
+        for offset in range(0, len(ulaw_audio), TWILIO_FRAME_BYTES):
+            chunk = ulaw_audio[offset:offset + TWILIO_FRAME_BYTES]
+            await self.send({
+                "event": "media",
+                "streamSid": self.stream_sid,
+                "media": {"payload": base64.b64encode(chunk).decode("ascii")}
+            })
+            if offset == 0:
+                latency = self.clock() - end_of_speech_at
+                self.reply_latencies.append(latency)
+                reply_latency.observe(latency)
+                print(f"Telephony reply latency (end of speech -> first byte): {latency * 1000:.0f} ms")
+        await self.send({
+            "event": "mark",
+            "streamSid": self.stream_sid,
+            "mark": {"name": f"reply-{len(self.reply_latencies)}"}
+        })
+
+
+def _rms(samples: array) -> float:
+    return (sum(s * s for s in samples) / len(samples)) ** 0.5
+
+
+def load_recorded_frames(path: str) -> List[dict]:
+    """Load a recorded media stream: one Twilio websocket message (JSON) per line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TwilioMediaStreamServiceImpl:
+    def __init__(self, whisper_service, voice_agent_service, tts_service, admission_service=None):
+        self.whisper_service = whisper_service
+        self.voice_agent_service = voice_agent_service
+        self.tts_service = tts_service
+        self.admission_service = admission_service
+
+    def create_session(self, send: Callable[[dict], Awaitable[None]], clock=time.perf_counter) -> MediaStreamSession:
+        return MediaStreamSession(self.whisper_service, self.voice_agent_service, self.tts_service, send, clock,
+                                  self.admission_service)
+
+    async def handle_websocket(self, websocket):
+        """Drive a session from a FastAPI/Starlette websocket until Twilio stops the stream"""
+        async def send(message: dict):
+            await websocket.send_text(json.dumps(message))
+
+        session = self.create_session(send)
+        while True:
+            try:
+                raw = await websocket.receive_text()
+            except Exception:
+                break
+            if not await session.handle_message(json.loads(raw)):
+                break
+        return session
+
+    async def replay(self, messages: Iterable, clock=time.perf_counter) -> tuple:
+        """
+        Run recorded media-stream messages (dicts or JSON strings) through a
+        session offline. Returns the session and the outbound messages.
+        """
+        outbound = []
+
+        async def send(message: dict):
+            outbound.append(message)
+
+        session = self.create_session(send, clock)
+        for message in messages:
+            if isinstance(message, (str, bytes)):
+                message = json.loads(message)
+            if not await session.handle_message(message):
+                break
+        return session, outbound
+
+    @staticmethod
+    def build_twiml(stream_url: str) -> str:
+        """TwiML that connects an incoming call to our media-stream websocket"""
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<Response><Connect><Stream url="{stream_url}" /></Connect></Response>'
+        )
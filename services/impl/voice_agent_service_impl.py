@@ -1,48 +1,68 @@
+import asyncio
 import base64
 import requests
+import threading
+from collections import OrderedDict
 from services.impl.order_service_impl import OrderServiceImpl
 from services.impl.intent_handlers.factory import IntentHandlerFactory
+from services.impl.intent_handlers.registry import intent_handler_registry
+from services.impl.metrics_service_impl import metrics_service as default_metrics_service
+from services.impl.branch_service_impl import current_branch
+from constants.app_constants import TTS_CACHE_SIZE
 
 class VoiceAgentServiceImpl:
-    def __init__(self, tts_service, whisper_service, intent_service):
+    def __init__(self, tts_service, whisper_service, intent_service, session_service=None, metrics_service=None,
+                 order_service=None):
         self.tts_service = tts_service
         self.whisper_service = whisper_service
         self.intent_service = intent_service
-        self.order_service = OrderServiceImpl()
+        self.session_service = session_service
+        self.metrics_service = metrics_service or default_metrics_service
+        # Share the app's order service so every writer goes through one order log
+        self.order_service = order_service or OrderServiceImpl()
+        # (branch ID, audio format) -> reply text -> audio; branches word their replies differently
+        self._tts_caches = {}
+        self._tts_cache_lock = threading.Lock()
     
-    async def handle_audio_request(self, audio_bytes: bytes) -> dict:
+    async def handle_audio_request(self, audio_bytes: bytes, session_id: str = None) -> dict:
         """Handle audio request: transcribe, detect intent, generate response"""
+        self.metrics_service.requests.inc(route="voice-agent")
         try:
             # Transcribe audio
-            transcription = await self.whisper_service.transcribe_audio(audio_bytes)
+            with self.metrics_service.time_stage("transcribe"):
+                transcription = await self.whisper_service.transcribe_audio(audio_bytes)
             
-            # Extract intent and generate response
-            intent_info = self.extract_intent(transcription)
+            # Extract intent and generate response (model and HTTP calls run off the event loop)
+            intent_info = await asyncio.to_thread(self.extract_intent, transcription, session_id)
             
             # Generate audio for the response
             reply_text = intent_info.get("reply_text", "")
-            audio_base64 = self.generate_audio(reply_text)
+            audio_base64 = await asyncio.to_thread(self.generate_audio, reply_text)
             
             return {
                 "transcription": transcription,
                 "intent": intent_info,
                 "reply_text": reply_text,
-                "audio_base64": audio_base64
+                "audio_base64": audio_base64,
+                "session_id": session_id
             }
         except Exception as e:
             print(f"Error handling audio request: {e}")
+            self.metrics_service.errors.inc(stage="voice_agent")
             return {
                 "transcription": "",
                 "intent": {"error": str(e)},
                 "reply_text": "عذراً، حدث خطأ في معالجة الطلب.",
-                "audio_base64": ""
+                "audio_base64": "",
+                "session_id": session_id
             }
     
-    def extract_intent(self, transcription: str) -> dict:
+    def extract_intent(self, transcription: str, session_id: str = None) -> dict:
         """Extract intent from transcription using appropriate handler"""
         try:
             order_is_valid = False  # Always initialize
-            intent_info = self.intent_service.detect_intent(transcription)
+            with self.metrics_service.time_stage("detect_intent"):
+                intent_info = self.intent_service.detect_intent(transcription)
             # Ensure intent_info is a dict
             if isinstance(intent_info, str):
                 import json
@@ -50,9 +70,20 @@ class VoiceAgentServiceImpl:
                     intent_info = json.loads(intent_info)
                 except Exception:
                     intent_info = {}
+            session = self.session_service.get(session_id) if self.session_service else None
+            if session and session.name and not intent_info.get("name"):
+                # The customer already told us their name in an earlier turn
+                intent_info["name"] = session.name
+            if session and session.last_order_id:
+                # Lets "cancel my order" find the order placed earlier in this session
+                intent_info.setdefault("last_order_id", session.last_order_id)
             intent_type = intent_info.get("intent", "")
             handler = IntentHandlerFactory.get_handler(intent_type)
-            return handler.handle(transcription, intent_info, self)
+            with self.metrics_service.time_stage("handler"):
+                result = intent_handler_registry.invoke(handler, transcription, intent_info, self)
+            if self.session_service and session_id:
+                self.session_service.record_turn(session_id, result)
+            return result
         except Exception as e:
             print(f"Error extracting intent: {e}")
             return {
@@ -61,24 +92,44 @@ class VoiceAgentServiceImpl:
                 "order_is_valid": False
             }
     
-    def generate_audio(self, text: str) -> str:
-        """Generate audio from text using ElevenLabs"""
+    def generate_audio(self, text: str, output_format: str = None) -> str:
+        """Generate audio from text using ElevenLabs (in `output_format` if given, e.g. for phone calls)"""
         try:
             if not text or text.strip() == "":
                 print("Warning: Empty text provided for audio generation")
                 return ""
             
-            print(f"Generating audio for text: {text[:50]}...")
-            audio_bytes = self.tts_service.synthesize_speech(text)
+            cache_key = (current_branch().id, output_format)
+            with self._tts_cache_lock:
+                cache = self._tts_caches.get(cache_key)
+                if cache is None:
+                    cache = self._tts_caches[cache_key] = OrderedDict()
+                cached = cache.get(text)
+                if cached is not None:
+                    cache.move_to_end(text)
+            if cached is not None:
+                self.metrics_service.cache_hits.inc(cache="tts")
+                return cached
+            self.metrics_service.cache_misses.inc(cache="tts")
+            
+            with self.metrics_service.time_stage("tts"):
+                if output_format:
+                    audio_bytes = self.tts_service.synthesize_speech(text, output_format=output_format)
+                else:
+                    audio_bytes = self.tts_service.synthesize_speech(text)
             
             if not audio_bytes:
                 print("Warning: TTS service returned empty audio bytes")
                 return ""
             
-            print(f"Generated audio bytes: {len(audio_bytes)} bytes")
-            audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
-            print(f"Encoded audio base64 length: {len(audio_base64)}")
+            self.metrics_service.tts_bytes.inc(len(audio_bytes))
+            with self.metrics_service.time_stage("encode_audio"):
+                audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
             
+            with self._tts_cache_lock:
+                cache[text] = audio_base64
+                if len(cache) > TTS_CACHE_SIZE:
+                    cache.popitem(last=False)
             return audio_base64
         except Exception as e:
             print(f"Error generating audio: {e}")
@@ -1,17 +1,22 @@
+import asyncio
 import os
 import tempfile
 import whisper
+from services.impl.tracing_service_impl import tracing_service
 
 model = whisper.load_model("large")
 
 class WhisperServiceImpl:
     async def transcribe_audio(self, audio_data: bytes) -> str:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            tmp.write(audio_data)
-            tmp_path = tmp.name
+        # Whisper decodes the container itself (ffmpeg) inside transcribe()
+        with tracing_service.span("stage_audio", bytes=len(audio_data)):
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
+                tmp.write(audio_data)
+                tmp_path = tmp.name
 
         try:
-            result = model.transcribe(tmp_path, language='ar')
+            # Run off the event loop; admission control bounds how many run at once
+            result = await asyncio.to_thread(model.transcribe, tmp_path, language='ar')
             return result['text']
         finally:
             os.remove(tmp_path) 
\ No newline at end of file
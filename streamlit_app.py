@@ -5,7 +5,7 @@ from enums.intent_enum import IntentEnum
 from services.impl.order_service_impl import OrderServiceImpl
 from constants.app_constants import API_URL
 
-def handle_order_placement(intent_info, name, dialog_history, user_input):
+def handle_order_placement(intent_info, name, session_id):
     """
     Handle order placement logic for both text and audio inputs.
     Returns updated reply_text, audio_base64, and success status.
@@ -13,22 +13,27 @@ def handle_order_placement(intent_info, name, dialog_history, user_input):
     order_is_valid = intent_info.get("order_is_valid", False)
     detected_intent = intent_info.get("intent")
     order_items = intent_info.get("items", [])
+    order_lines = intent_info.get("lines", [])
     
     print(f"DEBUG: handle_order_placement - order_is_valid: {order_is_valid}, detected_intent: {detected_intent}")
     print(f"DEBUG: intent_info: {intent_info}")
     print(f"DEBUG: name: {name}, order_items: {order_items}")
     
     # Check if we have a valid order (items and name)
-    if detected_intent == "place_order" and order_items and name:
+    # A quantity the agent asked about again is not submitted until it is answered
+    quantity_unclear = any(line.get("quantity_unclear") for line in order_lines)
+    if detected_intent == "place_order" and order_items and name and not quantity_unclear:
         # Override order_is_valid if we have items and name
         order_is_valid = True
         print(f"DEBUG: Valid order detected - items: {order_items}, name: {name}")
     
     if detected_intent == "place_order" and order_is_valid:
+        # The server keeps the dialog state; only the session ID travels with the order
         payload = {
             "name": name,
             "order": order_items,
-            "dialog_history": dialog_history + [user_input],
+            "lines": order_lines,
+            "session_id": session_id,
         }
         print(f"DEBUG: Submitting order with payload: {payload}")
         order_resp = requests.post(f"{API_URL}/submit-order", json=payload)
@@ -62,9 +67,10 @@ def extract_name_from_audio(audio_bytes):
     """
     try:
         files = {"file": ("name_audio.wav", audio_bytes, "audio/wav")}
-        response = requests.post(f"{API_URL}/voice-agent", files=files)
+        response = requests.post(f"{API_URL}/voice-agent", files=files, data={"session_id": st.session_state.get("session_id")})
         if response.ok:
             data = response.json()
+            remember_session(data)
             transcription = data.get("transcription", "")
             intent_info = data.get("intent", {})
             
@@ -81,6 +87,11 @@ def extract_name_from_audio(audio_bytes):
     
     return None, "", {}
 
+def remember_session(data):
+    """Keep the server-issued dialog session ID for the next turn"""
+    if data.get("session_id"):
+        st.session_state["session_id"] = data["session_id"]
+
 st.set_page_config(page_title="Syrian Arabic Voice Agent", layout="wide")
 st.title("Syrian Arabic Voice Agent for Charco Chicken")
 
@@ -88,6 +99,10 @@ st.title("Syrian Arabic Voice Agent for Charco Chicken")
 if "history" not in st.session_state:
     st.session_state["history"] = []
 
+# Server-side dialog session ID (issued by the API on the first turn)
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = None
+
 # Store pending name request
 if "pending_name_request" not in st.session_state:
     st.session_state["pending_name_request"] = False
@@ -116,7 +131,7 @@ with tabs[0]:
                             last_entry = st.session_state["history"][-1]
                             last_entry["intent"]["name"] = name
                             updated_reply_text, updated_audio_base64, order_success = handle_order_placement(
-                                last_entry["intent"], name, [entry["input"] for entry in st.session_state["history"]], last_entry.get("transcription", "")
+                                last_entry["intent"], name, st.session_state["session_id"]
                             )
                             if order_success:
                                 st.session_state["history"].append({
@@ -148,7 +163,7 @@ with tabs[0]:
                     last_entry = st.session_state["history"][-1]
                     last_entry["intent"]["name"] = name
                     updated_reply_text, updated_audio_base64, order_success = handle_order_placement(
-                        last_entry["intent"], name, [entry["input"] for entry in st.session_state["history"]], last_entry.get("transcription", "")
+                        last_entry["intent"], name, st.session_state["session_id"]
                     )
                     if order_success:
                         st.session_state["history"].append({
@@ -170,7 +185,6 @@ with tabs[0]:
     else:
         input_mode = st.radio("Input mode", ["Audio", "Text"])
         name = st.text_input("Your Name (optional)")
-        dialog_history = [entry["input"] for entry in st.session_state["history"]]
         # Main input section
         if input_mode == "Audio":
             st.write("#### Record or Upload Audio")
@@ -191,9 +205,10 @@ with tabs[0]:
                 user_audio_base64 = base64.b64encode(audio_file.read()).decode("utf-8") if audio_file else None
             if audio_to_send and st.button("Send Audio"):
                 files = {"file": audio_to_send}
-                response = requests.post(f"{API_URL}/voice-agent", files=files)
+                response = requests.post(f"{API_URL}/voice-agent", files=files, data={"session_id": st.session_state["session_id"]})
                 if response.ok:
                     data = response.json()
+                    remember_session(data)
                     intent_info = data.get("intent", {})
                     reply_text = data.get("reply_text", "")
                     audio_base64 = data.get("audio_base64", "")
@@ -202,7 +217,7 @@ with tabs[0]:
                         st.session_state["pending_name_request"] = True
                     # Handle order placement using the unified function
                     updated_reply_text, updated_audio_base64, order_success = handle_order_placement(
-                        intent_info, name, dialog_history, data.get("transcription", "[Audio]")
+                        intent_info, name, st.session_state["session_id"]
                     )
                     if order_success:
                         reply_text = updated_reply_text
@@ -223,10 +238,11 @@ with tabs[0]:
         else:
             text_input = st.text_input("Type your message in Arabic")
             if st.button("Send Text") and text_input:
-                payload = {"text": text_input}
+                payload = {"text": text_input, "session_id": st.session_state["session_id"]}
                 response = requests.post(f"{API_URL}/detect-intent", json=payload)
                 if response.ok:
                     data = response.json()
+                    remember_session(data)
                     intent_info = data.get("intent", {})
                     reply_text = data.get("reply_text", "")
                     audio_base64 = data.get("audio_base64", "")
@@ -235,7 +251,7 @@ with tabs[0]:
                         st.session_state["pending_name_request"] = True
                     # Handle order placement using the unified function
                     updated_reply_text, updated_audio_base64, order_success = handle_order_placement(
-                        intent_info, name, dialog_history, text_input
+                        intent_info, name, st.session_state["session_id"]
                     )
                     if order_success:
                         reply_text = updated_reply_text
@@ -0,0 +1,94 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import pytest
+from services.impl.admission_service_impl import AdmissionServiceImpl, AdmissionLimiter, AdmissionRejectedError
+from services.impl.metrics_service_impl import MetricsServiceImpl
+
+@pytest.fixture
+def metrics():
+    return MetricsServiceImpl()
+
+@pytest.mark.asyncio
+async def test_slot_should_admit_up_to_concurrency(metrics):
+    # Arrange
+    limiter = AdmissionLimiter("voice-agent", concurrency=2, queue=0, timeout=1, metrics_service=metrics)
+    # Act
+    async with limiter.slot():
+        async with limiter.slot():
+            in_flight = limiter.in_flight
+    # Assert
+    assert in_flight == 2
+    assert limiter.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_slot_should_reject_when_queue_full(metrics):
+    # Arrange
+    limiter = AdmissionLimiter("voice-agent", concurrency=1, queue=1, timeout=5, metrics_service=metrics)
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    # Act & Assert
+    with pytest.raises(AdmissionRejectedError) as error:
+        async with limiter.slot():
+            pass
+    assert error.value.retry_after > 0
+    assert metrics.counter("admission_rejections_total", "").value(route="voice-agent", reason="queue_full") == 1
+    assert metrics.gauge("admission_queue_depth", "").value(route="voice-agent") == 1
+    release.set()
+    await asyncio.gather(holder, waiter)
+
+@pytest.mark.asyncio
+async def test_queued_request_should_run_after_slot_frees(metrics):
+    # Arrange
+    limiter = AdmissionLimiter("tts", concurrency=1, queue=4, timeout=5, metrics_service=metrics)
+    order = []
+
+    async def work(tag):
+        async with limiter.slot():
+            order.append(tag)
+            await asyncio.sleep(0.01)
+
+    # Act
+    await asyncio.gather(work("first"), work("second"), work("third"))
+    # Assert
+    assert order == ["first", "second", "third"]
+    assert limiter.waiting == 0
+
+@pytest.mark.asyncio
+async def test_slot_should_reject_after_queue_timeout(metrics):
+    # Arrange
+    limiter = AdmissionLimiter("detect-intent", concurrency=1, queue=4, timeout=0.01, metrics_service=metrics)
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    # Act & Assert
+    with pytest.raises(AdmissionRejectedError) as error:
+        async with limiter.slot():
+            pass
+    assert error.value.reason == "timeout"
+    assert limiter.waiting == 0
+    release.set()
+    await holder
+
+def test_service_should_apply_env_overrides(monkeypatch, metrics):
+    # Arrange
+    monkeypatch.setenv("ADMISSION_VOICE_AGENT_CONCURRENCY", "3")
+    # Act
+    service = AdmissionServiceImpl({"voice-agent": {"concurrency": 1, "queue": 2, "timeout": 1}}, metrics)
+    # Assert
+    assert service.limiters["voice-agent"].concurrency == 3
+    assert service.limiters["voice-agent"].queue == 2
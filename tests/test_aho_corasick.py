@@ -0,0 +1,74 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import pytest
+from services.impl.text_matching.aho_corasick import AhoCorasickMatcher, KeywordMatch
+from constants.order_constants import ORDER_KEYWORDS
+
+
+def test_find_all_should_return_overlapping_matches_with_positions():
+    # Arrange
+    matcher = AhoCorasickMatcher(["he", "she", "his", "hers"])
+    # Act
+    matches = matcher.find_all("ushers")
+    # Assert
+    assert matches == [
+        KeywordMatch(1, 4, "she", "she"),
+        KeywordMatch(2, 4, "he", "he"),
+        KeywordMatch(2, 6, "hers", "hers"),
+    ]
+
+
+def test_find_should_prefer_leftmost_longest_match():
+    # Arrange
+    matcher = AhoCorasickMatcher({"دجاج": "دجاج", "دجاج مشوي": "دجاج مشوي", "عصير": "عصير"})
+    text = "بدي دجاج مشوي وعصير"
+    # Act
+    matches = matcher.find(text)
+    # Assert
+    assert [match.keyword for match in matches] == ["دجاج مشوي", "عصير"]
+    assert [text[match.start:match.end] for match in matches] == ["دجاج مشوي", "عصير"]
+
+
+def test_find_should_map_aliases_to_their_value():
+    # Arrange
+    matcher = AhoCorasickMatcher({"شاورما": "شاورما", "شورما": "شاورما"})
+    # Act
+    matches = matcher.find("بدي شورما")
+    # Assert
+    assert matches[0].value == "شاورما"
+
+
+def test_find_should_return_empty_list_when_nothing_matches():
+    # Arrange
+    matcher = AhoCorasickMatcher(ORDER_KEYWORDS)
+    # Act / Assert
+    assert matcher.find("مرحبا كيف حالك") == []
+    assert matcher.find("") == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_find_all_should_agree_with_naive_substring_search(seed):
+    # Arrange
+    rng = random.Random(seed)
+    alphabet = "ابجدهو "
+    keywords = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(30)}
+    text = "".join(rng.choice(alphabet) for _ in range(300))
+    matcher = AhoCorasickMatcher(keywords)
+    # Act
+    found = {(match.start, match.keyword) for match in matcher.find_all(text)}
+    # Assert
+    expected = {(i, keyword) for keyword in keywords for i in range(len(text)) if text.startswith(keyword, i)}
+    assert found == expected
+
+
+def test_find_should_drop_rejected_matches_before_resolving_overlaps():
+    # Arrange
+    matcher = AhoCorasickMatcher(["ست", "استلام"])
+    text = "استلام"
+    # Act
+    matches = matcher.find(text, accept=lambda match: match.keyword != "استلام")
+    # Assert
+    assert [match.keyword for match in matches] == ["ست"]
@@ -0,0 +1,170 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from services.impl.analytics_service_impl import AnalyticsServiceImpl, parse_price
+from services.impl.metrics_service_impl import MetricsServiceImpl
+from services.impl.order_event_service_impl import OrderEventServiceImpl, ORDER_CREATED, ORDER_UPDATED, ORDER_EVENTS_RESET
+from services.impl.order_stores.json_log_store import JsonLogOrderStore
+
+
+def make_order(order_id, name="أحمد", items=("دجاج مشوي",), timestamp="2025-07-27T11:24:50", status="pending"):
+    return {"order_id": order_id, "name": name, "items": list(items), "timestamp": timestamp, "status": status}
+
+
+@pytest.fixture
+def event_service():
+    return OrderEventServiceImpl(metrics_service=MetricsServiceImpl())
+
+
+@pytest.fixture
+def analytics(event_service):
+    analytics = AnalyticsServiceImpl()
+    event_service.add_listener(analytics.record)
+    return analytics
+
+
+def test_parse_price_should_read_syrian_pound_prices():
+    # Act / Assert
+    assert parse_price("25,000 ليرة") == 25000
+    assert parse_price("") == 0
+
+
+def test_record_should_roll_up_items_revenue_and_hours(analytics, event_service):
+    # Act
+    event_service.publish(ORDER_CREATED, make_order("١", items=["دجاج مشوي", "عصير"]))
+    event_service.publish(ORDER_CREATED, make_order("٢", name="سارة", timestamp="2025-07-27T12:05:00"))
+    summary = analytics.summary()
+    # Assert
+    assert summary["orders"] == 2
+    assert summary["revenue"] == 25000 * 2 + 5000
+    assert summary["items"]["دجاج مشوي"] == {"count": 2, "revenue": 50000}
+    assert [bucket["hour"] for bucket in summary["hourly"]] == ["2025-07-27T11", "2025-07-27T12"]
+    assert summary["peak_hours"][11] == 1 and summary["peak_hours"][12] == 1
+    assert summary["peak_weekday_hours"][6][11] == 1
+
+
+def test_record_should_track_orders_per_customer(analytics, event_service):
+    # Act
+    for i in range(3):
+        event_service.publish(ORDER_CREATED, make_order(str(i)))
+    event_service.publish(ORDER_CREATED, make_order("٩", name="سارة"))
+    summary = analytics.summary(name="أحمد")
+    # Assert
+    assert summary["customers"] == {"total": 2, "orders_per_customer": {"1": 1, "3": 1}}
+    assert summary["customer"] == {"name": "أحمد", "orders": 3}
+
+
+def test_record_should_take_back_cancelled_orders(analytics, event_service):
+    # Arrange
+    order = make_order("١")
+    event_service.publish(ORDER_CREATED, order)
+    # Act
+    event_service.publish(ORDER_UPDATED, dict(order, status="preparing"))
+    event_service.publish(ORDER_UPDATED, dict(order, status="cancelled"))
+    summary = analytics.summary()
+    # Assert
+    assert summary["orders"] == 1
+    assert summary["cancelled"] == 1
+    assert summary["revenue"] == 0
+    assert summary["items"] == {}
+
+
+def test_rebuild_should_match_live_rollups(analytics, event_service):
+    # Arrange
+    orders = [make_order("١"), make_order("٢", name="سارة", items=["شاورما"], timestamp="2025-07-27T13:00:00")]
+    for order in orders:
+        event_service.publish(ORDER_CREATED, order)
+    cancelled = dict(orders[1], status="cancelled")
+    event_service.publish(ORDER_UPDATED, cancelled)
+    rebuilt = AnalyticsServiceImpl()
+    # Act
+    rebuilt.rebuild([orders[0], cancelled])
+    # Assert
+    assert rebuilt.summary() == analytics.summary()
+
+
+def test_hourly_buckets_should_be_bounded(event_service):
+    # Arrange
+    analytics = AnalyticsServiceImpl(hourly_retention=2)
+    event_service.add_listener(analytics.record)
+    # Act
+    for hour in (10, 11, 12):
+        event_service.publish(ORDER_CREATED, make_order(str(hour), timestamp=f"2025-07-27T{hour}:00:00"))
+    # Assert
+    assert [bucket["hour"] for bucket in analytics.summary(hours=10)["hourly"]] == ["2025-07-27T11", "2025-07-27T12"]
+
+
+def test_record_should_count_line_quantities(analytics, event_service):
+    # Arrange
+    order = make_order("١", items=["شاورما"])
+    order["lines"] = [{"item": "شاورما", "quantity": 3, "modifiers": []}]
+    # Act
+    event_service.publish(ORDER_CREATED, order)
+    summary = analytics.summary()
+    # Assert
+    assert summary["items"]["شاورما"] == {"count": 3, "revenue": 45000}
+    assert summary["revenue"] == 45000
+
+
+def test_record_should_use_the_unit_price_stored_on_each_line(analytics, event_service):
+    # Arrange
+    order = make_order("١", items=["شاورما"])
+    order["lines"] = [{"item": "شاورما", "quantity": 2, "modifiers": [], "unit_price": 12000}]
+    event_service.publish(ORDER_CREATED, order)
+    # Act: the menu price differs from the one the order was placed at
+    analytics.prices["شاورما"] = 20000
+    event_service.publish(ORDER_UPDATED, dict(order, status="cancelled"))
+    rebuilt = AnalyticsServiceImpl()
+    rebuilt.rebuild([order])
+    # Assert
+    assert analytics.summary()["revenue"] == 0
+    assert rebuilt.summary()["revenue"] == 24000
+
+
+def test_record_should_price_older_orders_from_their_branch_menu(event_service):
+    # Arrange
+    branch_menus = {"main": {"شاورما": 15000}, "mezzeh": {"شاورما": 18000}}
+    analytics = AnalyticsServiceImpl(branch_prices=lambda branch_id: branch_menus[branch_id or "main"])
+    event_service.add_listener(analytics.record)
+    # Act
+    event_service.publish(ORDER_CREATED, dict(make_order("١", items=["شاورما"]), branch="mezzeh"))
+    event_service.publish(ORDER_CREATED, make_order("٢", items=["شاورما"]))
+    event_service.publish(ORDER_CREATED, dict(make_order("٣", items=["شاورما"]), branch="closed"))
+    # Assert
+    assert analytics.summary()["revenue"] == 18000 + 15000 + 15000
+
+
+def test_rollups_should_count_orders_written_by_other_workers(tmp_path):
+    # Arrange: each worker follows its own instance of the shared store
+    snapshot_file = str(tmp_path / "orders.json")
+    writer_store = JsonLogOrderStore(snapshot_file)
+    event_service = OrderEventServiceImpl(metrics_service=MetricsServiceImpl())
+    event_service.follow(JsonLogOrderStore(snapshot_file))
+    analytics = AnalyticsServiceImpl()
+    event_service.add_listener(analytics.record)
+    # Act
+    writer_store.append({**make_order("١"), "status_history": [{"status": "pending"}]})
+    writer_store.append({**make_order("٢"), "status_history": [{"status": "pending"}]})
+    writer_store.update("٢", lambda order: {**order, "status": "cancelled",
+                                            "status_history": order["status_history"] + [{"status": "cancelled"}]})
+    event_service.poll()
+    summary = analytics.summary()
+    event_service.close()
+    # Assert
+    assert summary["orders"] == 2
+    assert summary["cancelled"] == 1
+    assert summary["revenue"] == 25000
+
+
+def test_reset_event_should_rebuild_from_source(event_service):
+    # Arrange
+    orders = [make_order("١"), make_order("٢", status="cancelled")]
+    analytics = AnalyticsServiceImpl(source=lambda: orders)
+    event_service.add_listener(analytics.record)
+    # Act
+    event_service.publish(ORDER_EVENTS_RESET, {})
+    summary = analytics.summary()
+    # Assert
+    assert (summary["orders"], summary["cancelled"], summary["revenue"]) == (2, 1, 25000)
@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from services.impl.text_matching.arabic_normalizer import normalize_arabic, normalize_vocabulary
+
+
+@pytest.mark.parametrize("variant, expected", [
+    ("أريد", "اريد"),
+    ("إلغاء", "الغاء"),
+    ("آسف", "اسف"),
+    ("مسؤول", "مسوول"),
+    ("شاطئ", "شاطي"),
+    ("سلطة", "سلطه"),
+    ("مشوى", "مشوي"),
+    ("شـاورمـا", "شاورما"),
+    ("دَجَاجٌ مَشْوِيّ", "دجاج مشوي"),
+    ("رقم ١٢٣٤٥", "رقم 12345"),
+    ("رقم ۱۲۳", "رقم 123"),
+    ("پیتزا کبیرة", "پيتزا كبيره"),
+])
+def test_normalize_arabic_should_fold_orthographic_variants(variant, expected):
+    # Act / Assert
+    assert normalize_arabic(variant) == expected
+
+
+def test_normalize_arabic_should_collapse_whitespace_and_lowercase():
+    # Act / Assert
+    assert normalize_arabic("  بدي   Pepsi\n وعصير ") == "بدي pepsi وعصير"
+    assert normalize_arabic("") == ""
+
+
+def test_normalize_vocabulary_should_collapse_variants_in_order():
+    # Act
+    vocabulary = normalize_vocabulary(["إلغاء", "الغاء", "ألغى", "", "أريد", "اريد"])
+    # Assert
+    assert vocabulary == ("الغاء", "الغي", "اريد")
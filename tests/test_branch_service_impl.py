@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import pytest
+from unittest.mock import MagicMock
+from services.impl.branch_service_impl import BranchServiceImpl, UnknownBranchError, current_branch
+from services.impl.menu_service_impl import MenuServiceImpl
+from services.impl.voice_agent_service_impl import VoiceAgentServiceImpl
+from services.impl.intent_handlers.place_order import PlaceOrderHandler
+from services.impl.intent_handlers.question import QuestionHandler
+from services.impl.intent_handlers.complaint import ComplaintHandler
+
+
+@pytest.fixture
+def branch_service(tmp_path):
+    main_menu = tmp_path / "main_menu.json"
+    main_menu.write_text(json.dumps({"items": [{"name": "دجاج مشوي", "price": 25000}]}, ensure_ascii=False),
+                         encoding="utf-8")
+    north_menu = tmp_path / "north_menu.json"
+    north_menu.write_text(json.dumps({"items": [{"name": "شاورما", "price": 15000}]}, ensure_ascii=False),
+                          encoding="utf-8")
+    branches = tmp_path / "branches.json"
+    branches.write_text(json.dumps({
+        "default": "main",
+        "branches": {
+            "main": {"menu_file": str(main_menu)},
+            "north": {"menu_file": str(north_menu), "phone": "222", "complaints_phone": "333",
+                      "address": "حلب"},
+            "east": {"menu_file": str(north_menu)},
+        },
+    }, ensure_ascii=False), encoding="utf-8")
+    return BranchServiceImpl(str(branches), menu_service=MenuServiceImpl(str(main_menu)))
+
+
+def test_branches_should_have_their_own_menus_and_share_menu_files(branch_service):
+    # Act
+    main = branch_service.get("main")
+    north = branch_service.get("north")
+    # Assert
+    assert main.catalog.names == ("دجاج مشوي",)
+    assert north.catalog.names == ("شاورما",)
+    assert branch_service.get("east").menu_service is north.menu_service
+    assert branch_service.get(None) is main
+
+
+def test_get_should_raise_for_unknown_branch(branch_service):
+    with pytest.raises(UnknownBranchError):
+        branch_service.get("south")
+
+
+def test_use_should_set_the_current_branch_for_the_block(branch_service):
+    # Act
+    with branch_service.use("north"):
+        inside = current_branch().id
+    # Assert
+    assert inside == "north"
+    assert branch_service.current().id == "main"
+
+
+def test_service_should_serve_one_default_branch_when_file_missing(tmp_path):
+    # Arrange
+    menu_service = MenuServiceImpl(str(tmp_path / "missing_menu.json"))
+    # Act
+    service = BranchServiceImpl(str(tmp_path / "missing.json"), menu_service=menu_service)
+    # Assert
+    assert list(service.branches) == ["main"]
+    assert service.default.menu_service is menu_service
+
+
+def test_handlers_should_use_the_current_branch(branch_service):
+    # Act
+    with branch_service.use("north"):
+        order = PlaceOrderHandler().handle("بدي شاورما", {"name": "أحمد"}, None)
+        address = QuestionHandler().handle("وين عنوانكم", {}, None)
+        complaint = ComplaintHandler().handle("الطلب تأخر كتير", {}, None)
+    # Assert
+    assert order["items"] == ["شاورما"] and order["order_is_valid"]
+    assert "حلب" in address["reply_text"]
+    assert "333" in complaint["reply_text"]
+
+
+def test_tts_cache_should_be_kept_per_branch(branch_service):
+    # Arrange
+    tts = MagicMock()
+    tts.synthesize_speech.return_value = b"audio-bytes"
+    service = VoiceAgentServiceImpl(tts, MagicMock(), MagicMock())
+    # Act
+    with branch_service.use("main"):
+        service.generate_audio("أهلاً")
+        service.generate_audio("أهلاً")
+    with branch_service.use("north"):
+        service.generate_audio("أهلاً")
+    # Assert
+    assert tts.synthesize_speech.call_count == 2
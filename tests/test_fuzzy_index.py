@@ -0,0 +1,109 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import random
+import pytest
+from difflib import SequenceMatcher
+from services.impl.text_matching.fuzzy_index import FuzzyMenuIndex, fuzzy_index_for, lcs_length, _IndexedItem
+from constants.order_constants import ORDER_KEYWORDS
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', 'resource', 'syrian_arabic_intent_dataset.json')
+
+
+def reference_lcs(a: str, b: str) -> int:
+    previous = [0] * (len(b) + 1)
+    for char_a in a:
+        current = [0]
+        for j, char_b in enumerate(b):
+            current.append(previous[j] + 1 if char_a == char_b else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lcs_length_should_match_dynamic_programming(seed):
+    # Arrange
+    rng = random.Random(seed)
+    for _ in range(50):
+        a = "".join(rng.choice("ابجد") for _ in range(rng.randint(0, 12)))
+        b = "".join(rng.choice("ابجد") for _ in range(rng.randint(0, 12)))
+        item = _IndexedItem(a, a)
+        # Act / Assert
+        assert lcs_length(item.masks, len(a), b) == reference_lcs(a, b)
+
+
+def test_best_match_should_correct_misheard_item():
+    # Arrange
+    index = FuzzyMenuIndex(ORDER_KEYWORDS)
+    # Act / Assert
+    assert index.best_match("شاورمة") == "شاورما"
+    assert index.best_match("دجاج مشوى") == "دجاج مشوي"
+
+
+def test_best_match_should_boost_partial_and_wrapped_names():
+    # Arrange
+    index = FuzzyMenuIndex(["دجاج مشوي", "برجر", "عصير"])
+    # Act / Assert
+    assert index.best_match("دجاج") == "دجاج مشوي"
+    assert index.best_match("عصير برتقال") == "عصير"
+
+
+def test_best_match_should_return_none_below_threshold():
+    # Arrange
+    index = FuzzyMenuIndex(ORDER_KEYWORDS)
+    # Act / Assert
+    assert index.best_match("كلمة غير موجودة") is None
+
+
+def test_fuzzy_index_for_should_reuse_index_per_menu():
+    # Act / Assert
+    assert fuzzy_index_for(tuple(ORDER_KEYWORDS)) is fuzzy_index_for(tuple(ORDER_KEYWORDS))
+
+
+def difflib_best_match(candidate: str, menu_items, threshold: float = 0.6):
+    """The matcher the bigram index replaced: SequenceMatcher over every menu item"""
+    best_match, best_score = None, 0
+    for menu_item in menu_items:
+        similarity = SequenceMatcher(None, candidate.lower(), menu_item.lower()).ratio()
+        if candidate.lower() in menu_item.lower():
+            similarity = max(similarity, 0.8)
+        if menu_item.lower() in candidate.lower():
+            similarity = max(similarity, 0.9)
+        if similarity > best_score and similarity >= threshold:
+            best_score, best_match = similarity, menu_item
+    return best_match
+
+
+def parity_candidates():
+    """The 1-3 word windows the order fallback tries on every dataset utterance, plus misspelled menu names"""
+    with open(DATASET_PATH, encoding="utf-8") as f:
+        dataset = json.load(f)
+    candidates = set()
+    for row in dataset:
+        words = row["utterance"].split()
+        for i in range(len(words)):
+            for j in range(i + 1, min(i + 4, len(words) + 1)):
+                candidates.add(" ".join(words[i:j]))
+    rng = random.Random(0)
+    letters = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+    for item in ORDER_KEYWORDS:
+        for i in range(len(item)):
+            candidates.add(item[:i] + item[i + 1:])
+            candidates.add(item[:i] + rng.choice(letters) + item[i + 1:])
+            candidates.add(item[:i] + rng.choice(letters) + item[i:])
+        for word in item.split():
+            candidates.update((word, f"بدي {word}", f"{word} لو سمحت"))
+    return sorted(candidate for candidate in candidates if len(candidate) > 2)
+
+
+def test_best_match_should_agree_with_difflib_matcher_on_dataset_vocabulary():
+    # Arrange
+    index = FuzzyMenuIndex(ORDER_KEYWORDS)
+    # Act
+    differences = [(candidate, difflib_best_match(candidate, ORDER_KEYWORDS), index.best_match(candidate))
+                   for candidate in parity_candidates()]
+    # Assert: same item (or none) at the same 0.6 threshold for every candidate
+    assert [difference for difference in differences if difference[1] != difference[2]] == []
+
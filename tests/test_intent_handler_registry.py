@@ -0,0 +1,95 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from unittest.mock import MagicMock
+from services.impl.intent_handlers import registry as registry_module
+from services.impl.intent_handlers.base import IntentHandler
+from services.impl.intent_handlers.factory import IntentHandlerFactory, DefaultHandler
+from services.impl.intent_handlers.registry import IntentHandlerRegistry
+from services.impl.metrics_service_impl import MetricsServiceImpl
+
+
+class EchoHandler(IntentHandler):
+    def handle(self, transcription, intent_info, service) -> dict:
+        return {"intent": "echo", "reply_text": transcription}
+
+
+class FailingHandler(IntentHandler):
+    def handle(self, transcription, intent_info, service) -> dict:
+        raise RuntimeError("handler failed")
+
+
+@pytest.fixture
+def metrics():
+    return MetricsServiceImpl()
+
+
+@pytest.fixture
+def registry(metrics):
+    registry = IntentHandlerRegistry(metrics_service=metrics)
+    registry.register_default(DefaultHandler)
+    return registry
+
+
+def test_factory_should_return_the_same_handler_instance_every_time():
+    # Act / Assert
+    assert IntentHandlerFactory.get_handler("place_order") is IntentHandlerFactory.get_handler("place_order")
+    assert IntentHandlerFactory.get_handler("ask_eta") is IntentHandlerFactory.get_handler("goodbye")
+
+
+def test_register_should_serve_the_intent_with_one_instance(registry):
+    # Act
+    registry.register("echo")(EchoHandler)
+    # Assert
+    assert isinstance(registry.get_handler("echo"), EchoHandler)
+    assert isinstance(registry.get_handler("unknown"), DefaultHandler)
+    assert registry.intents() == ("echo",)
+
+
+def test_register_should_refuse_a_second_handler_unless_replacing(registry):
+    # Arrange
+    registry.register("echo")(EchoHandler)
+    # Act / Assert
+    with pytest.raises(ValueError):
+        registry.register("echo")(FailingHandler)
+    registry.register("echo", replace=True)(FailingHandler)
+    assert isinstance(registry.get_handler("echo"), FailingHandler)
+
+
+def test_dispatch_should_count_and_time_each_handler(registry, metrics):
+    # Arrange
+    registry.register("echo")(EchoHandler)
+    registry.register("broken")(FailingHandler)
+    # Act
+    result = registry.dispatch("echo", "مرحبا", {}, None)
+    registry.dispatch("echo", "مرحبا", {}, None)
+    registry.dispatch("something_else", "مرحبا", {"intent": "something_else"}, None)
+    with pytest.raises(RuntimeError):
+        registry.dispatch("broken", "مرحبا", {}, None)
+    # Assert
+    assert result["reply_text"] == "مرحبا"
+    invocations = metrics.counter("intent_handler_invocations_total", "")
+    errors = metrics.counter("intent_handler_errors_total", "")
+    latency = metrics.histogram("intent_handler_duration_seconds", "")
+    assert invocations.value(handler="echo") == 2
+    assert invocations.value(handler="default") == 1
+    assert errors.value(handler="broken") == 1
+    assert latency.count(handler="echo") == 2
+
+
+def test_load_entry_points_should_register_plugin_handlers(registry, monkeypatch):
+    # Arrange
+    plugin = MagicMock()
+    plugin.name = "echo"
+    plugin.load.return_value = EchoHandler
+    broken = MagicMock()
+    broken.name = "missing"
+    broken.load.side_effect = ImportError("no module named missing_plugin")
+    monkeypatch.setattr(registry_module, "entry_points", lambda group: [plugin, broken])
+    # Act
+    registry.load_entry_points()
+    # Assert
+    assert isinstance(registry.get_handler("echo"), EchoHandler)
+    assert isinstance(registry.get_handler("missing"), DefaultHandler)
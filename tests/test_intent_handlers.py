@@ -10,6 +10,7 @@ from services.impl.intent_handlers.gratitude import GratitudeHandler
 from services.impl.intent_handlers.complaint import ComplaintHandler
 from services.impl.intent_handlers.cancel_order import CancelOrderHandler
 from services.impl.intent_handlers.provide_name import ProvideNameHandler
+from services.impl.intent_handlers.greeting_and_menu import GreetingAndMenuRequestHandler
 from unittest.mock import MagicMock
 
 @pytest.fixture
@@ -159,6 +160,81 @@ def test_cancel_order_handler_should_return_cancellation_response(mock_voice_age
     # Check for cancellation response in Arabic
     assert "إلغاء" in result["reply_text"] or "تم" in result["reply_text"] or "الطلب" in result["reply_text"]
 
+def test_cancel_order_handler_should_cancel_order_number_in_transcription(mock_voice_agent):
+    # Arrange
+    handler = CancelOrderHandler()
+    
+    mock_voice_agent.order_service.get_order_by_id.return_value = {"order_id": "٠٠٠٤٢", "name": "أحمد"}
+    
+    # Act
+    result = handler.handle("ألغي الطلب رقم 00042", {"intent": "cancel_order", "name": "أحمد", "last_order_id": "٠٠٠٠١"},
+                            mock_voice_agent)
+    
+    # Assert
+    mock_voice_agent.order_service.cancel_order.assert_called_once_with("٠٠٠٤٢")
+    assert result["order_id"] == "٠٠٠٤٢"
+    assert "تم إلغاء" in result["reply_text"]
+
+def test_cancel_order_handler_should_not_cancel_another_customers_order(mock_voice_agent):
+    # Arrange
+    handler = CancelOrderHandler()
+    mock_voice_agent.order_service.get_order_by_id.return_value = {"order_id": "٠٠٠٤٢", "name": "سامر"}
+    
+    # Act
+    named = handler.handle("ألغي الطلب رقم 00042", {"intent": "cancel_order", "name": "أحمد"}, mock_voice_agent)
+    anonymous = handler.handle("ألغي الطلب رقم 00042", {"intent": "cancel_order"}, mock_voice_agent)
+    
+    # Assert
+    mock_voice_agent.order_service.cancel_order.assert_not_called()
+    assert named["reply_text"] == anonymous["reply_text"]
+    assert "لم أجد طلباً" in named["reply_text"]
+
+def test_cancel_order_handler_should_not_cancel_on_a_change_request(mock_voice_agent):
+    # Arrange
+    handler = CancelOrderHandler()
+    
+    # Act
+    result = handler.handle("بدي غير الطلب", {"intent": "cancel_order", "last_order_id": "٠٠٠٠١"}, mock_voice_agent)
+    
+    # Assert
+    mock_voice_agent.order_service.cancel_order.assert_not_called()
+    assert result["reply_text"].startswith("إذا كنت تريد تغيير طلبك")
+
+def test_cancel_order_handler_should_fall_back_to_session_order(mock_voice_agent):
+    # Arrange
+    handler = CancelOrderHandler()
+    
+    # Act
+    result = handler.handle("بدي إلغاء", {"intent": "cancel_order", "last_order_id": "٠٠٠٠١"}, mock_voice_agent)
+    
+    # Assert
+    mock_voice_agent.order_service.cancel_order.assert_called_once_with("٠٠٠٠١")
+    assert result["order_id"] == "٠٠٠٠١"
+
+def test_cancel_order_handler_should_ask_for_order_number_when_unknown(mock_voice_agent):
+    # Arrange
+    handler = CancelOrderHandler()
+    
+    # Act
+    result = handler.handle("أريد إلغاء الطلب", {"intent": "cancel_order"}, mock_voice_agent)
+    
+    # Assert
+    mock_voice_agent.order_service.cancel_order.assert_not_called()
+    assert "رقم الطلب" in result["reply_text"]
+
+def test_cancel_order_handler_should_explain_when_order_cannot_be_cancelled(mock_voice_agent):
+    # Arrange
+    from services.impl.order_service_impl import InvalidStatusTransitionError
+    handler = CancelOrderHandler()
+    mock_voice_agent.order_service.cancel_order.side_effect = InvalidStatusTransitionError("٠٠٠٠١", "delivered", "cancelled")
+    
+    # Act
+    result = handler.handle("ألغي طلبي", {"intent": "cancel_order", "last_order_id": "٠٠٠٠١"}, mock_voice_agent)
+    
+    # Assert
+    assert "لا يمكن إلغاء" in result["reply_text"]
+    assert "تم التسليم" in result["reply_text"]
+
 def test_provide_name_handler_should_extract_name(mock_voice_agent):
     # Arrange
     handler = ProvideNameHandler()
@@ -185,7 +261,7 @@ def test_provide_name_handler_should_handle_name_with_title(mock_voice_agent):
     # Assert
     assert result["intent"] == "provide_name"
     assert "name" in result
-    assert result["name"] == "سارة"
+    assert result["name"] == "سارة محمد"
 
 def test_place_order_handler_should_handle_order_processing_error(mock_voice_agent):
     # Arrange
@@ -277,4 +353,43 @@ def test_cancel_order_handler_should_handle_various_cancellation_phrases(mock_vo
         result = handler.handle(phrase, {"intent": "cancel_order"}, mock_voice_agent)
         # Assert
         assert result["intent"] == "cancel_order"
-        assert len(result["reply_text"]) > 0 
\ No newline at end of file
+        assert len(result["reply_text"]) > 0 
+
+def test_greeting_and_menu_handler_should_match_spelling_variants(mock_voice_agent):
+    # Arrange
+    handler = GreetingAndMenuRequestHandler()
+    transcription = "اهلاً، شو الاطباق المتوفرة عندكن؟"
+    # Act
+    result = handler.handle(transcription, {}, mock_voice_agent)
+    # Assert
+    assert result["reply_text"].startswith("أهلاً وسهلاً بك! عندنا قائمة")
+    assert "🍽️ شاورما" in result["reply_text"]
+
+def test_question_handler_should_match_prices_question_with_hamza(mock_voice_agent):
+    # Arrange
+    handler = QuestionHandler()
+    # Act
+    result = handler.handle("شو أسعار الأطعمة؟", {}, mock_voice_agent)
+    # Assert
+    assert result["reply_text"].startswith("أسعارنا كالتالي:")
+
+def test_place_order_handler_should_confirm_quantities_in_one_turn(mock_voice_agent):
+    # Arrange
+    handler = PlaceOrderHandler()
+    # Act
+    result = handler.handle("بدي تنين شاورما وثلاث عصير", {"name": "أحمد"}, mock_voice_agent)
+    # Assert
+    assert result["order_is_valid"]
+    assert result["items"] == ["شاورما", "عصير"]
+    assert [line["quantity"] for line in result["lines"]] == [2, 3]
+    assert result["reply_text"].startswith("تم استلام طلبك 2 شاورما و 3 عصير!")
+
+def test_place_order_handler_should_ask_again_for_a_quantity_above_the_maximum(mock_voice_agent):
+    # Arrange
+    handler = PlaceOrderHandler()
+    # Act
+    result = handler.handle("بدي مية شاورما", {"name": "أحمد"}, mock_voice_agent)
+    # Assert
+    assert not result["order_is_valid"]
+    assert result["lines"] == [{"item": "شاورما", "quantity": 1, "modifiers": [], "quantity_unclear": True}]
+    assert result["reply_text"].startswith("كم شاورما بدك بالضبط؟")
@@ -0,0 +1,61 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import pytest
+from services.impl import json_codec
+from services.impl.json_codec import FastJSONResponse
+
+ORDER = {
+    "order_id": "٠٠٠٤٢",
+    "name": "أحمد",
+    "items": ["دجاج مشوي", "عصير"],
+    "eta": "15 دقيقة",
+    "timestamp": "2025-07-27T11:24:50.426451",
+    "status": "pending",
+    "status_history": [{"status": "pending", "at": "2025-07-27T11:24:50.426451"}],
+    "note": "line\nbreak \"quoted\"   tab\t",
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(json_codec, "_USE_ORJSON", request.param == "orjson")
+    return json_codec
+
+
+def test_dumps_should_match_compact_stdlib_output(codec):
+    # Act
+    encoded = codec.dumps_bytes([ORDER, {"count": 3, "next_cursor": None, "ok": True}])
+    # Assert
+    assert encoded == json.dumps([ORDER, {"count": 3, "next_cursor": None, "ok": True}],
+                                 ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert "أحمد".encode("utf-8") in encoded
+
+
+def test_loads_should_round_trip_str_and_bytes(codec):
+    # Act / Assert
+    assert codec.loads(codec.dumps(ORDER)) == ORDER
+    assert codec.loads(codec.dumps_bytes(ORDER)) == ORDER
+
+
+def test_loads_should_raise_json_decode_error(codec):
+    # Act / Assert
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b'{"op": "put", "ord')
+
+
+def test_dumps_should_fall_back_for_values_orjson_rejects(codec):
+    # Act / Assert
+    assert codec.dumps({"big": 2 ** 70}) == '{"big":%d}' % 2 ** 70
+
+
+def test_fast_json_response_should_render_through_codec(codec):
+    # Act
+    response = FastJSONResponse({"name": "أحمد"})
+    # Assert
+    assert response.body == '{"name":"أحمد"}'.encode("utf-8")
+    assert response.media_type == "application/json"
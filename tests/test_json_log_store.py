@@ -0,0 +1,193 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import threading
+import time
+import pytest
+from services.impl.order_stores.json_log_store import JsonLogOrderStore, default_log_file
+
+
+def make_order(order_id, name="أحمد"):
+    return {"order_id": order_id, "name": name, "items": ["دجاج مشوي"]}
+
+
+@pytest.fixture
+def snapshot_file(tmp_path):
+    return str(tmp_path / "orders.json")
+
+
+def test_default_log_file_should_sit_next_to_snapshot():
+    # Act
+    log_file = default_log_file("data/orders.json")
+    # Assert
+    assert log_file == "data/orders.log.jsonl"
+
+
+def test_append_should_write_one_line_without_touching_snapshot(snapshot_file):
+    # Arrange
+    store = JsonLogOrderStore(snapshot_file)
+    # Act
+    store.append(make_order("١"))
+    store.append(make_order("٢"))
+    # Assert
+    with open(store.log_file, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+    with open(snapshot_file, encoding="utf-8") as f:
+        assert json.load(f) == []
+
+
+def test_store_should_replay_snapshot_and_log_on_startup(snapshot_file):
+    # Arrange
+    with open(snapshot_file, "w", encoding="utf-8") as f:
+        json.dump([make_order("١")], f, ensure_ascii=False)
+    store = JsonLogOrderStore(snapshot_file)
+    store.append(make_order("٢"))
+    store.close()
+    # Act
+    reloaded = JsonLogOrderStore(snapshot_file)
+    # Assert
+    assert [order["order_id"] for order in reloaded.list()] == ["١", "٢"]
+    assert reloaded.get("٢")["name"] == "أحمد"
+
+
+def test_store_should_skip_torn_last_line(snapshot_file):
+    # Arrange
+    store = JsonLogOrderStore(snapshot_file)
+    store.append(make_order("١"))
+    store.close()
+    with open(store.log_file, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "order": {"order_')
+    # Act
+    reloaded = JsonLogOrderStore(snapshot_file)
+    # Assert
+    assert len(reloaded) == 1
+
+
+def test_compact_should_fold_log_into_snapshot(snapshot_file):
+    # Arrange
+    store = JsonLogOrderStore(snapshot_file, compact_every=3)
+    # Act
+    for order_id in ("١", "٢", "٣"):
+        store.append(make_order(order_id))
+    # Assert
+    with open(snapshot_file, encoding="utf-8") as f:
+        assert len(json.load(f)) == 3
+    with open(store.log_file, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    # Only the marker and the recent changes kept for the change feed remain
+    assert [entry["op"] for entry in entries] == ["compacted", "put", "put", "put"]
+    assert len(JsonLogOrderStore(snapshot_file)) == 3
+
+
+def test_concurrent_appends_should_share_fsyncs_without_losing_writes(snapshot_file, monkeypatch):
+    # Arrange
+    fsyncs = []
+    real_fsync = os.fsync
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        time.sleep(0.01)
+        real_fsync(fd)
+    monkeypatch.setattr(os, "fsync", slow_fsync)
+    store = JsonLogOrderStore(snapshot_file)
+    threads = [threading.Thread(target=store.append, args=(make_order(str(i)),)) for i in range(40)]
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+    # Assert
+    assert len(JsonLogOrderStore(snapshot_file)) == 40
+    assert len(fsyncs) < 40
+
+
+def test_stores_sharing_files_should_not_lose_writes(snapshot_file):
+    # Arrange: two instances stand in for two uvicorn workers
+    workers = [JsonLogOrderStore(snapshot_file, compact_every=7) for _ in range(2)]
+    def place_orders(store, worker):
+        for i in range(25):
+            store.append(make_order(f"{worker}-{i}"))
+    threads = [threading.Thread(target=place_orders, args=(store, n)) for n, store in enumerate(workers)]
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for store in workers:
+        store.close()
+    # Assert
+    assert len(JsonLogOrderStore(snapshot_file)) == 50
+    assert len(workers[0]) == len(workers[1]) == 50
+
+
+def test_get_should_see_orders_appended_by_another_writer(snapshot_file):
+    # Arrange
+    reader = JsonLogOrderStore(snapshot_file)
+    writer = JsonLogOrderStore(snapshot_file)
+    # Act
+    writer.append(make_order("١"))
+    # Assert
+    assert reader.get("١")["order_id"] == "١"
+    assert len(reader) == 1
+
+
+def test_get_should_rebuild_when_snapshot_is_replaced(snapshot_file):
+    # Arrange
+    store = JsonLogOrderStore(snapshot_file)
+    store.append(make_order("١"))
+    other = JsonLogOrderStore(snapshot_file)
+    other.append(make_order("٢"))
+    # Act
+    other.compact()
+    with open(snapshot_file, "w", encoding="utf-8") as f:
+        json.dump([make_order("٣")], f, ensure_ascii=False)
+    # Assert
+    assert store.get("١") is None
+    assert store.get("٣")["order_id"] == "٣"
+
+
+def test_append_after_torn_line_should_start_a_new_line(snapshot_file):
+    # Arrange
+    store = JsonLogOrderStore(snapshot_file)
+    store.append(make_order("١"))
+    store.close()
+    with open(store.log_file, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "ord')
+    # Act
+    reopened = JsonLogOrderStore(snapshot_file)
+    reopened.append(make_order("٢"))
+    reopened.close()
+    # Assert
+    assert sorted(order["order_id"] for order in JsonLogOrderStore(snapshot_file).list()) == ["١", "٢"]
+
+
+def test_changes_should_number_writes_from_every_worker(snapshot_file):
+    # Arrange
+    reader = JsonLogOrderStore(snapshot_file)
+    writer = JsonLogOrderStore(snapshot_file)
+    reader.append(make_order("١"))
+    # Act
+    writer.append(make_order("٢"))
+    writer.update("١", lambda order: {**order, "name": "سارة"})
+    # Assert
+    assert [(seq, order["order_id"]) for seq, order in reader.changes(0)] == [(1, "١"), (2, "٢"), (3, "١")]
+    assert reader.changes(1, limit=1)[0][1]["order_id"] == "٢"
+    assert reader.changes(3) == []
+    assert reader.changes(4) is None
+    assert reader.change_seq() == writer.change_seq() == 3
+
+
+def test_changes_should_survive_compaction_by_another_worker(snapshot_file):
+    # Arrange
+    reader = JsonLogOrderStore(snapshot_file)
+    writer = JsonLogOrderStore(snapshot_file, compact_every=3, change_history=2)
+    # Act
+    for order_id in ("١", "٢", "٣", "٤"):
+        writer.append(make_order(order_id))
+    # Assert: compaction after the third write kept the last two changes
+    assert [seq for seq, _ in reader.changes(1)] == [2, 3, 4]
+    assert reader.changes(0) is None
+    assert len(reader) == 4
+    assert [order["order_id"] for _, order in JsonLogOrderStore(snapshot_file).changes(1)] == ["٢", "٣", "٤"]
@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from services.impl.text_matching.keyword_router import KeywordRouter, intent_keyword_router
+from constants.intent_constants import INTENT_KEYWORDS
+
+
+@pytest.fixture
+def router():
+    return KeywordRouter({
+        "thanks": ["شكراً", "مشكور"],
+        "prices": ["سعر", "أسعار"],
+        "complaint_price": ["سعر", "غالي"],
+    })
+
+
+def test_route_should_return_every_matched_category_in_one_pass(router):
+    # Act
+    keywords = router.route("مشكور بس السعر غالي")
+    # Assert
+    assert keywords == {"thanks", "prices", "complaint_price"}
+
+
+def test_route_should_match_spelling_variants(router):
+    # Act / Assert
+    assert router.route("شو الاسعار؟") == {"prices"}
+    assert router.route("شكرا كتير") == {"thanks"}
+
+
+def test_route_should_return_empty_set_when_nothing_matches(router):
+    # Act / Assert
+    assert router.route("مرحبا") == frozenset()
+
+
+def test_route_should_cache_results_per_utterance(router):
+    # Act
+    router.route("شكراً")
+    router.route("شكراً")
+    # Assert
+    assert router.route.cache_info().hits == 1
+
+
+def test_intent_keyword_router_should_cover_every_handler_category():
+    # Act / Assert
+    assert set(intent_keyword_router.categories) == set(INTENT_KEYWORDS)
+    assert "cancel_explicit" in intent_keyword_router.route("بدي ألغي الطلب")
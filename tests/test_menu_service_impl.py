@@ -0,0 +1,158 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import threading
+import pytest
+from services.impl.menu_service_impl import MenuCatalog, MenuItem, MenuLoadError, MenuServiceImpl
+from services.impl.order_service_impl import OrderServiceImpl
+from constants.order_constants import ORDER_KEYWORDS, PRICING_MAPPING
+
+MENU = {
+    "currency": "ليرة",
+    "items": [
+        {"name": "دجاج مشوي", "price": 25000, "aliases": ["فروج مشوي"]},
+        {"name": "شاورما", "price": 15000, "aliases": ["شاورمة"], "available": False},
+        {"name": "عصير", "price": 5000},
+    ],
+}
+
+
+@pytest.fixture
+def menu_file(tmp_path):
+    path = tmp_path / "menu.json"
+    path.write_text(json.dumps(MENU, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def write_menu(path, menu):
+    path.write_text(json.dumps(menu, ensure_ascii=False), encoding="utf-8")
+    # Make sure the reload check sees a new file even within one mtime tick
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+
+
+def test_catalog_should_precompute_prices_and_reply_strings():
+    # Act
+    catalog = MenuCatalog.from_dict(MENU, "v1")
+    # Assert
+    assert catalog.names == ("دجاج مشوي", "عصير")
+    assert catalog.price_texts["دجاج مشوي"] == "25,000 ليرة"
+    assert catalog.names_text == "دجاج مشوي، عصير"
+    assert catalog.price_list_text == "🍽️ دجاج مشوي: 25,000 ليرة، 🍽️ عصير: 5,000 ليرة"
+    assert not catalog.is_available("شاورما")
+
+
+def test_catalog_should_match_aliases_and_unavailable_items():
+    # Arrange
+    catalog = MenuCatalog.from_dict(MENU, "v1")
+    # Act
+    items = OrderServiceImpl.extract_order_items("بدي فروج مشوي وشاورمة", catalog)
+    # Assert
+    assert items == ["دجاج مشوي", "شاورما"]
+
+
+@pytest.mark.parametrize("menu", [
+    {"items": []},
+    {"items": [{"name": "عصير"}]},
+    {"items": [{"name": "عصير", "price": "غالي"}]},
+    {"items": [{"name": "عصير", "price": 1}, {"name": "عصير", "price": 2}]},
+    {"items": [{"name": "عصير", "price": 1}, {"name": "كوكتيل", "price": 2, "aliases": ["عصير"]}]},
+])
+def test_catalog_should_reject_invalid_menus(menu):
+    # Act / Assert
+    with pytest.raises(MenuLoadError):
+        MenuCatalog.from_dict(menu, "bad")
+
+
+def test_shipped_menu_file_should_match_built_in_menu():
+    # Arrange
+    menu_path = os.path.join(os.path.dirname(__file__), '..', 'resource', 'menu.json')
+    # Act
+    catalog = MenuCatalog.from_file(menu_path)
+    # Assert
+    assert list(catalog.names) == ORDER_KEYWORDS
+    assert catalog.price_texts == PRICING_MAPPING
+
+
+def test_service_should_fall_back_to_built_in_menu_when_file_missing(tmp_path):
+    # Act
+    service = MenuServiceImpl(str(tmp_path / "missing.json"))
+    # Assert
+    assert service.catalog.version == "builtin"
+    assert list(service.catalog.names) == ORDER_KEYWORDS
+
+
+def test_service_should_reload_changed_file_and_notify_listeners(menu_file):
+    # Arrange
+    service = MenuServiceImpl(str(menu_file), check_interval=0)
+    published = []
+    service.add_listener(published.append)
+    old_version = service.catalog.version
+    menu = json.loads(json.dumps(MENU))
+    menu["items"].append({"name": "فلافل", "price": 3000})
+    # Act
+    write_menu(menu_file, menu)
+    catalog = service.catalog
+    # Assert
+    assert catalog.version != old_version
+    assert "فلافل" in catalog.names
+    assert published == [catalog]
+    assert service.reload() is False
+
+
+def test_service_should_keep_current_menu_when_file_is_invalid(menu_file):
+    # Arrange
+    service = MenuServiceImpl(str(menu_file), check_interval=None)
+    version = service.catalog.version
+    menu_file.write_text("{not json", encoding="utf-8")
+    # Act / Assert
+    with pytest.raises(MenuLoadError):
+        service.reload(force=True)
+    assert service.catalog.version == version
+
+
+def test_service_should_keep_current_menu_when_file_vanishes_mid_read(menu_file, monkeypatch):
+    # Arrange
+    service = MenuServiceImpl(str(menu_file), check_interval=0)
+    version = service.catalog.version
+    menu = json.loads(json.dumps(MENU))
+    menu["items"].append({"name": "فلافل", "price": 3000})
+    write_menu(menu_file, menu)
+
+    def vanished(path):
+        raise FileNotFoundError(path)
+
+    # Act
+    with monkeypatch.context() as patch:
+        patch.setattr(MenuCatalog, "from_file", vanished)
+        catalog = service.catalog
+    # Assert
+    assert catalog.version == version
+    assert "فلافل" in service.catalog.names
+
+
+def test_readers_should_never_see_a_partial_menu_during_reloads(menu_file):
+    # Arrange
+    service = MenuServiceImpl(str(menu_file), check_interval=None)
+    menus = [MENU, {"items": [{"name": "فلافل", "price": 3000}, {"name": "كبة", "price": 6000}]}]
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            catalog = service.catalog
+            found = OrderServiceImpl.extract_order_items(" و ".join(catalog.items), catalog)
+            if found != list(catalog.items):
+                errors.append(catalog.version)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    # Act
+    for i in range(20):
+        write_menu(menu_file, menus[i % 2])
+        service.reload(force=True)
+    done.set()
+    reader.join()
+    # Assert
+    assert errors == []
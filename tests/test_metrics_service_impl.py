@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from services.impl.metrics_service_impl import MetricsServiceImpl
+
+@pytest.fixture
+def metrics_service():
+    return MetricsServiceImpl()
+
+def test_time_stage_should_record_latency(metrics_service):
+    # Act
+    with metrics_service.time_stage("transcribe"):
+        pass
+    # Assert
+    assert metrics_service.stage_latency.count(stage="transcribe") == 1
+
+def test_time_stage_should_count_errors_and_reraise(metrics_service):
+    # Act & Assert
+    with pytest.raises(ValueError):
+        with metrics_service.time_stage("tts"):
+            raise ValueError("boom")
+    assert metrics_service.errors.value(stage="tts") == 1
+    assert metrics_service.stage_latency.count(stage="tts") == 1
+
+def test_render_should_emit_prometheus_histogram(metrics_service):
+    # Arrange
+    metrics_service.stage_latency.observe(0.003, stage="handler")
+    metrics_service.stage_latency.observe(0.2, stage="handler")
+    # Act
+    text = metrics_service.render()
+    # Assert
+    assert "# TYPE voice_agent_stage_duration_seconds histogram" in text
+    assert 'voice_agent_stage_duration_seconds_bucket{stage="handler",le="0.005"} 1' in text
+    assert 'voice_agent_stage_duration_seconds_bucket{stage="handler",le="+Inf"} 2' in text
+    assert 'voice_agent_stage_duration_seconds_count{stage="handler"} 2' in text
+
+def test_render_should_emit_counters(metrics_service):
+    # Arrange
+    metrics_service.cache_hits.inc(cache="tts")
+    metrics_service.tts_bytes.inc(1024)
+    # Act
+    text = metrics_service.render()
+    # Assert
+    assert "# TYPE voice_agent_cache_hits_total counter" in text
+    assert 'voice_agent_cache_hits_total{cache="tts"} 1' in text
+    assert "voice_agent_tts_bytes_total 1024" in text
+
+def test_register_should_return_same_metric_for_same_name(metrics_service):
+    # Act
+    first = metrics_service.counter("orders_total", "Orders")
+    second = metrics_service.counter("orders_total", "Orders")
+    # Assert
+    assert first is second
+
+def test_label_values_should_be_escaped(metrics_service):
+    # Arrange
+    metrics_service.errors.inc(stage='bad"stage')
+    # Act
+    text = metrics_service.render()
+    # Assert
+    assert 'stage="bad\\"stage"' in text
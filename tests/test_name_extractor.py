@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import pytest
+from services.impl.text_matching.name_extractor import NameExtractor, name_extractor
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', 'resource', 'syrian_arabic_intent_dataset.json')
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    with open(DATASET_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("transcription, expected", [
+    ("اسمي أحمد", "أحمد"),
+    ("اسمي أحمد محمد", "أحمد محمد"),
+    ("أنا اسمي محمود", "محمود"),
+    ("ضيف الطلب باسم دانا", "دانا"),
+    ("الطلب باسم نور الهدى", "نور الهدى"),
+    ("أنا سارة و بدي شاورما", "سارة"),
+    ("أنا سارة وبدي شاورما", "سارة"),
+    ("اسمي رامي وشاورما لو سمحت", "رامي"),
+    ("اسمي وليد", "وليد"),
+    ("اسمي يوسف بدي أطلب عصير", "يوسف"),
+    ("انا اسمي ليلى، ممكن أطلب", "ليلى"),
+    ("مرحبا، اسمي أحمد", "أحمد"),
+])
+def test_extract_should_return_full_name_after_trigger(transcription, expected):
+    # Act / Assert
+    assert name_extractor.extract(transcription) == expected
+
+
+def test_extract_should_not_take_menu_items_as_names():
+    # Act / Assert
+    assert name_extractor.extract("بدي أطلب دجاج مشوي") is None
+    assert name_extractor.extract("أنا شاورما") is None
+
+
+def test_extract_should_fall_back_to_first_meaningful_word():
+    # Act / Assert
+    assert name_extractor.extract("أحمد") == "أحمد"
+    assert name_extractor.extract("اسمي", fallback=False) is None
+    assert name_extractor.extract("", fallback=True) is None
+
+
+def test_extract_should_respect_max_words():
+    # Arrange
+    extractor = NameExtractor(max_words=1)
+    # Act / Assert
+    assert extractor.extract("اسمي أحمد محمد") == "أحمد"
+
+
+def test_extract_should_match_every_dataset_name(dataset):
+    # Arrange
+    samples = [row for row in dataset if row["target"]["intent"] == "provide_name"]
+    # Act
+    names = [name_extractor.extract(row["utterance"]) for row in samples]
+    # Assert
+    assert samples
+    assert names == [row["target"]["name"] for row in samples]
+
+
+def test_extract_should_find_no_introduced_name_in_order_utterances(dataset):
+    # Arrange
+    samples = [row["utterance"] for row in dataset if row["target"]["intent"] == "place_order"]
+    # Act / Assert
+    assert [name_extractor.extract(text) for text in samples] == [None] * len(samples)
@@ -0,0 +1,160 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import pytest
+from services.impl.metrics_service_impl import MetricsServiceImpl
+from services.impl.order_event_service_impl import OrderEventServiceImpl, ORDER_CREATED, ORDER_UPDATED
+from services.impl.order_stores.json_log_store import JsonLogOrderStore
+
+
+@pytest.fixture
+def event_service():
+    return OrderEventServiceImpl(history_size=5, buffer=3, keepalive_seconds=0.05, metrics_service=MetricsServiceImpl())
+
+
+def make_order(order_id, status="pending"):
+    return {"order_id": order_id, "name": "أحمد", "status": status}
+
+
+async def next_event(stream):
+    return await asyncio.wait_for(stream.__anext__(), timeout=1)
+
+
+async def until_subscribed(event_service):
+    while not event_service._subscribers:
+        await asyncio.sleep(0)
+
+
+async def next_order_event(stream):
+    while True:
+        chunk = await next_event(stream)
+        if not chunk.startswith(": keepalive"):
+            return chunk
+
+
+def follow_worker(snapshot_file):
+    """An event service following its own store instance, standing in for one uvicorn worker"""
+    store = JsonLogOrderStore(snapshot_file)
+    event_service = OrderEventServiceImpl(keepalive_seconds=0.05, metrics_service=MetricsServiceImpl())
+    event_service.follow(store, poll_interval=0.01)
+    return event_service, store
+
+
+@pytest.mark.asyncio
+async def test_stream_should_push_new_events(event_service):
+    # Arrange
+    stream = event_service.stream()
+    first = asyncio.ensure_future(next_event(stream))
+    await until_subscribed(event_service)
+    # Act
+    event = event_service.publish(ORDER_CREATED, make_order("١"))
+    chunk = await first
+    # Assert
+    assert chunk.startswith(f"id: {event.id}\nevent: order_created\n")
+    assert '"name":"أحمد"' in chunk
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_should_resume_after_last_event_id(event_service):
+    # Arrange
+    seen = event_service.publish(ORDER_CREATED, make_order("١"))
+    event_service.publish(ORDER_UPDATED, make_order("١", "preparing"))
+    event_service.publish(ORDER_CREATED, make_order("٢"))
+    # Act
+    stream = event_service.stream(seen.id)
+    chunks = [await next_event(stream), await next_event(stream)]
+    # Assert
+    assert "event: order_updated" in chunks[0]
+    assert '"order_id":"٢"' in chunks[1]
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_should_reset_when_resume_point_is_gone(event_service):
+    # Arrange
+    old = event_service.publish(ORDER_CREATED, make_order("٠"))
+    for i in range(6):
+        event_service.publish(ORDER_CREATED, make_order(str(i)))
+    # Act
+    stale = event_service.stream(old.id)
+    foreign = event_service.stream("deadbeef-3")
+    # Assert
+    assert (await next_event(stale)).startswith("event: reset")
+    assert (await next_event(foreign)).startswith("event: reset")
+    await stale.aclose()
+    await foreign.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_should_send_keepalive_when_idle(event_service):
+    # Arrange
+    stream = event_service.stream()
+    # Act
+    chunk = await next_event(stream)
+    # Assert
+    assert chunk == ": keepalive\n\n"
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_should_be_dropped_after_buffer_fills(event_service):
+    # Arrange
+    stream = event_service.stream()
+    first = asyncio.ensure_future(next_event(stream))
+    await until_subscribed(event_service)
+    event_service.publish(ORDER_CREATED, make_order("٠"))
+    await first
+    # Act: five more events against a buffer of three, without reading
+    for i in range(5):
+        event_service.publish(ORDER_CREATED, make_order(str(i)))
+    await asyncio.sleep(0)
+    chunks = [chunk async for chunk in stream]
+    # Assert: the buffered events drain, then the stream ends
+    assert len(chunks) == 3
+    assert event_service.metrics_service.counter("order_stream_lagged_total", "").value() == 1
+    assert event_service._subscribers == []
+
+
+@pytest.mark.asyncio
+async def test_following_a_store_should_stream_writes_from_other_workers(tmp_path):
+    # Arrange
+    snapshot_file = str(tmp_path / "orders.json")
+    writer, writer_store = follow_worker(snapshot_file)
+    reader, _ = follow_worker(snapshot_file)
+    stream = reader.stream()
+    first = asyncio.ensure_future(next_order_event(stream))
+    await until_subscribed(reader)
+    # Act
+    order = writer_store.append({**make_order("١"), "status_history": [{"status": "pending"}]})
+    writer.publish(ORDER_CREATED, order)
+    writer_store.update("١", lambda order: {**order, "status": "preparing",
+                                            "status_history": order["status_history"] + [{"status": "preparing"}]})
+    # Assert
+    created = await first
+    updated = await next_order_event(stream)
+    assert created.startswith("id: store-1\nevent: order_created")
+    assert updated.startswith("id: store-2\nevent: order_updated")
+    await stream.aclose()
+    writer.close()
+    reader.close()
+
+
+@pytest.mark.asyncio
+async def test_following_a_store_should_resume_from_another_workers_event_id(tmp_path):
+    # Arrange
+    snapshot_file = str(tmp_path / "orders.json")
+    writer_store = JsonLogOrderStore(snapshot_file)
+    writer_store.append(make_order("١"))
+    writer_store.append(make_order("٢"))
+    # Act: a worker started after both writes has none of them in memory
+    reader, _ = follow_worker(snapshot_file)
+    stream = reader.stream("store-1")
+    chunk = await next_order_event(stream)
+    # Assert
+    assert chunk.startswith("id: store-2\n")
+    assert '"order_id":"٢"' in chunk
+    await stream.aclose()
+    reader.close()
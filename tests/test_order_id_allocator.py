@@ -0,0 +1,78 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+import pytest
+from services.impl.order_stores.order_id_allocator import OrderIdAllocator, default_counter_file, to_arabic_digits
+
+
+@pytest.fixture
+def counter_file(tmp_path):
+    return str(tmp_path / "orders.ids")
+
+
+def test_default_counter_file_should_sit_next_to_orders_file():
+    # Act / Assert
+    assert default_counter_file("data/orders.json") == "data/orders.ids"
+
+
+def test_allocate_should_return_sequential_arabic_ids(counter_file):
+    # Arrange
+    allocator = OrderIdAllocator(counter_file, node="")
+    # Act
+    ids = [allocator.allocate() for _ in range(3)]
+    # Assert
+    assert ids == ["٠٠٠٠١", "٠٠٠٠٢", "٠٠٠٠٣"]
+
+
+def test_allocate_should_not_reuse_ids_after_restart(counter_file):
+    # Arrange
+    first = OrderIdAllocator(counter_file, block_size=10, node="")
+    first.allocate()
+    # Act
+    restarted = OrderIdAllocator(counter_file, block_size=10, node="")
+    # Assert
+    assert restarted.allocate() == to_arabic_digits("00011")
+
+
+def test_allocators_sharing_counter_should_never_collide(counter_file):
+    # Arrange: one allocator per worker, all on the same counter file
+    allocators = [OrderIdAllocator(counter_file, block_size=5, node="") for _ in range(4)]
+    allocated = []
+    def allocate_many(allocator):
+        for _ in range(50):
+            allocated.append(allocator.allocate())
+    threads = [threading.Thread(target=allocate_many, args=(a,)) for a in allocators]
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Assert
+    assert len(set(allocated)) == 200
+
+
+def test_allocate_should_skip_existing_ids(counter_file):
+    # Arrange
+    taken = {"٠٠٠٠١", "٠٠٠٠٢"}
+    allocator = OrderIdAllocator(counter_file, node="", exists=lambda order_id: order_id in taken)
+    # Act
+    order_id = allocator.allocate()
+    # Assert
+    assert order_id == "٠٠٠٠٣"
+
+
+def test_allocate_should_prefix_node(counter_file):
+    # Arrange
+    allocator = OrderIdAllocator(counter_file, node="2")
+    # Act
+    order_id = allocator.allocate()
+    # Assert
+    assert order_id == "٢٠٠٠٠١"
+
+
+def test_allocator_should_reject_non_digit_node(counter_file):
+    # Act / Assert
+    with pytest.raises(ValueError):
+        OrderIdAllocator(counter_file, node="a")
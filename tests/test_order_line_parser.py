@@ -0,0 +1,112 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from services.impl.text_matching.arabic_normalizer import normalize_arabic
+from services.impl.text_matching.order_line_parser import OrderLine, OrderLineParser
+from constants.order_constants import ORDER_KEYWORDS
+
+
+@pytest.fixture
+def parser():
+    aliases = {normalize_arabic(item): item for item in ORDER_KEYWORDS}
+    aliases[normalize_arabic("بيبسي")] = "مشروب غازي"
+    return OrderLineParser(aliases)
+
+
+def parse(parser, text):
+    return parser.parse(normalize_arabic(text))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("بدي تنين شاورما وثلاث عصير", [OrderLine("شاورما", 2), OrderLine("عصير", 3)]),
+    ("بدي ٢ شاورما و 12 بيبسي", [OrderLine("شاورما", 2), OrderLine("مشروب غازي", 12)]),
+    ("بدي أربعة دجاج مشوي", [OrderLine("دجاج مشوي", 4)]),
+    ("بدي شاورما تنين", [OrderLine("شاورما", 2)]),
+    ("بدي شاورما وعصير", [OrderLine("شاورما"), OrderLine("عصير")]),
+])
+def test_parse_should_read_quantity_words_and_digits(parser, text, expected):
+    assert parse(parser, text) == expected
+
+
+def test_parse_should_attach_modifiers_to_the_item_before_them(parser):
+    # Act
+    lines = parse(parser, "بدي دجاج مشوي حار بدون ثوم وتنين بطاطا مقلية زيادة كاتشب")
+    # Assert
+    assert lines == [
+        OrderLine("دجاج مشوي", 1, ("حار", "بدون ثوم")),
+        OrderLine("بطاطا مقلية", 2, ("زيادة كاتشب",)),
+    ]
+
+
+def test_parse_should_take_a_menu_item_as_a_modifier_object(parser):
+    # Act
+    lines = parse(parser, "بدي شاورما بدون بطاطا مقلية")
+    # Assert
+    assert lines == [OrderLine("شاورما", 1, ("بدون بطاطا مقلية",))]
+
+
+def test_parse_should_only_read_whole_word_numbers(parser):
+    # "ست" (six) inside "استلام", "عشر" inside "عشرين" and a price-sized number
+    assert parse(parser, "استلام شاورما") == [OrderLine("شاورما")]
+    assert parse(parser, "بدي 15000 شاورما") == [OrderLine("شاورما")]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("بدي شاورما تنين وعصير", [OrderLine("شاورما", 2), OrderLine("عصير")]),
+    ("دجاج مشوي ٢ و سلطة", [OrderLine("دجاج مشوي", 2), OrderLine("سلطة")]),
+    ("بدي شاورما تنين و تلاتة عصير", [OrderLine("شاورما", 2), OrderLine("عصير", 3)]),
+    ("بدي شاورما و تنين عصير", [OrderLine("شاورما"), OrderLine("عصير", 2)]),
+])
+def test_parse_should_bind_a_quantity_after_an_item_to_that_item(parser, text, expected):
+    assert parse(parser, text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("بدي شاورما حار تنين", [OrderLine("شاورما", 2, ("حار",))]),
+    ("بدي شاورما حبات تلاتة لو سمحت", [OrderLine("شاورما", 3)]),
+])
+def test_parse_should_bind_a_trailing_number_past_modifiers_and_counting_words(parser, text, expected):
+    assert parse(parser, text) == expected
+
+
+@pytest.mark.parametrize("text", ["بدي شاورما الساعة 7", "بدي شاورما على العنوان 5"])
+def test_parse_should_not_take_an_unrelated_trailing_number_as_quantity(parser, text):
+    assert parse(parser, text) == [OrderLine("شاورما")]
+
+
+@pytest.mark.parametrize("text, quantity", [
+    ("بدي خمسة وعشرين شاورما", 25),
+    ("بدي خمسة و عشرين شاورما", 25),
+    ("بدي عشرين شاورما", 20),
+    ("بدي تلاتة عشر شاورما", 13),
+    ("بدي اطنعش شاورما", 12),
+    ("بدي 50 شاورما", 50),
+])
+def test_parse_should_read_numbers_up_to_the_line_maximum(parser, text, quantity):
+    assert parse(parser, text) == [OrderLine("شاورما", quantity)]
+
+
+@pytest.mark.parametrize("text", ["بدي ١٠٠ شاورما", "بدي مية شاورما", "بدي ستين شاورما", "بدي شاورما 51"])
+def test_parse_should_mark_quantities_above_the_maximum_as_unclear(parser, text):
+    # Act
+    lines = parse(parser, text)
+    # Assert
+    assert lines == [OrderLine("شاورما", 1, (), True)]
+    assert lines[0].to_dict()["quantity_unclear"] is True
+
+
+def test_parse_should_add_up_repeated_items(parser):
+    assert parse(parser, "بدي تنين شاورما، إي شاورما") == [OrderLine("شاورما", 3)]
+    assert parse(parser, "بدي تنين شاورما وكمان تلاتة شاورما حار") == [
+        OrderLine("شاورما", 2), OrderLine("شاورما", 3, ("حار",)),
+    ]
+    assert parse(parser, "بدي تلاتين شاورما و تلاتين شاورما") == [OrderLine("شاورما", 60, (), True)]
+
+
+def test_order_line_should_describe_quantity_and_modifiers():
+    # Act / Assert
+    assert OrderLine("شاورما").describe() == "شاورما"
+    assert OrderLine("شاورما", 2, ("بدون ثوم",)).describe() == "2 شاورما بدون ثوم"
+    assert OrderLine("عصير", 3).to_dict() == {"item": "عصير", "quantity": 3, "modifiers": []}
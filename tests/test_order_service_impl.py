@@ -4,32 +4,13 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 import pytest
 import json
-import tempfile
-from services.impl.order_service_impl import OrderServiceImpl
+from services.impl.order_service_impl import OrderServiceImpl, InvalidStatusTransitionError
 from constants.app_constants import ARABIC_NUMERALS
-from unittest.mock import patch, mock_open
 from constants.order_constants import ORDER_KEYWORDS
 
 @pytest.fixture
-def order_service():
-    return OrderServiceImpl()
-
-@pytest.fixture
-def temp_orders_file():
-    """Create a temporary orders file for testing"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        json.dump([], f)
-        temp_file = f.name
-    
-    # Temporarily replace the orders file path
-    original_file = OrderServiceImpl().orders_file
-    OrderServiceImpl().orders_file = temp_file
-    
-    yield temp_file
-    
-    # Cleanup
-    os.unlink(temp_file)
-    OrderServiceImpl().orders_file = original_file
+def order_service(tmp_path):
+    return OrderServiceImpl(str(tmp_path / "orders.json"))
 
 def test_extract_order_items_should_return_items_when_keywords_present(order_service):
     # Arrange
@@ -129,7 +110,7 @@ def test_extract_name_from_transcription_should_extract_name_with_patterns():
     # Act
     name = OrderServiceImpl.extract_name_from_transcription(transcription)
     # Assert
-    assert name == "أحمد"
+    assert name == "أحمد محمد"
 
 def test_extract_name_from_transcription_should_extract_name_with_ana_pattern():
     # Arrange
@@ -164,17 +145,17 @@ def test_extract_name_from_dialog_should_return_none_when_no_name_in_history(ord
     # Assert
     assert name is None
 
-def test_generate_arabic_order_id_should_return_five_digits():
+def test_generate_arabic_order_id_should_return_five_digits(order_service):
     # Act
-    order_id = OrderServiceImpl.generate_arabic_order_id()
+    order_id = order_service.generate_arabic_order_id()
     # Assert
     assert len(order_id) == 5
     assert all(digit in ARABIC_NUMERALS.values() for digit in order_id)
 
-def test_generate_arabic_order_id_should_return_unique_ids():
+def test_generate_arabic_order_id_should_return_unique_ids(order_service):
     # Act
-    order_id1 = OrderServiceImpl.generate_arabic_order_id()
-    order_id2 = OrderServiceImpl.generate_arabic_order_id()
+    order_id1 = order_service.generate_arabic_order_id()
+    order_id2 = order_service.generate_arabic_order_id()
     # Assert
     assert order_id1 != order_id2
 
@@ -205,54 +186,171 @@ def test_find_best_match_should_handle_substring_matches():
     # Assert
     assert result in ["دجاج مشوي", "دجاج مقلي"]
 
-@patch('builtins.open', new_callable=mock_open, read_data='[]')
-def test_ensure_orders_file_exists_should_create_file_if_not_exists(mock_file):
-    # Arrange
-    with patch('os.path.exists', return_value=False):
-        # Act
-        service = OrderServiceImpl()
-        # Assert
-        mock_file.assert_called()
-
-def test_load_orders_should_return_empty_list_when_file_not_found(order_service):
+def test_init_should_create_orders_file_if_not_exists(tmp_path):
     # Arrange
-    with patch('builtins.open', side_effect=FileNotFoundError):
-        # Act
-        orders = order_service._load_orders()
-        # Assert
-        assert orders == []
+    orders_file = tmp_path / "orders.json"
+    # Act
+    OrderServiceImpl(str(orders_file))
+    # Assert
+    assert json.loads(orders_file.read_text(encoding="utf-8")) == []
 
-def test_load_orders_should_return_empty_list_when_invalid_json(order_service):
+def test_init_should_start_empty_when_invalid_json(tmp_path):
     # Arrange
-    with patch('builtins.open', mock_open(read_data='invalid json')):
-        # Act
-        orders = order_service._load_orders()
-        # Assert
-        assert orders == []
+    orders_file = tmp_path / "orders.json"
+    orders_file.write_text("invalid json", encoding="utf-8")
+    # Act
+    service = OrderServiceImpl(str(orders_file))
+    # Assert
+    assert service.list_orders() == []
 
 def test_list_orders_should_return_orders(order_service):
     # Arrange
     test_orders = [{"order_id": "١٢٣٤٥", "name": "أحمد", "items": ["دجاج مشوي"]}]
-    with patch.object(order_service, '_load_orders', return_value=test_orders):
-        # Act
-        orders = order_service.list_orders()
-        # Assert
-        assert orders == test_orders
+    order_service.store.append(test_orders[0])
+    # Act
+    orders = order_service.list_orders()
+    # Assert
+    assert orders == test_orders
 
 def test_get_order_by_id_should_return_order(order_service):
     # Arrange
     test_orders = [{"order_id": "١٢٣٤٥", "name": "أحمد", "items": ["دجاج مشوي"]}]
-    with patch.object(order_service, '_load_orders', return_value=test_orders):
-        # Act
-        order = order_service.get_order_by_id("١٢٣٤٥")
-        # Assert
-        assert order == test_orders[0]
+    order_service.store.append(test_orders[0])
+    # Act
+    order = order_service.get_order_by_id("١٢٣٤٥")
+    # Assert
+    assert order == test_orders[0]
 
 def test_get_order_by_id_should_return_none_when_not_found(order_service):
     # Arrange
-    test_orders = [{"order_id": "١٢٣٤٥", "name": "أحمد", "items": ["دجاج مشوي"]}]
-    with patch.object(order_service, '_load_orders', return_value=test_orders):
-        # Act
-        order = order_service.get_order_by_id("٩٩٩٩٩")
-        # Assert
-        assert order is None 
\ No newline at end of file
+    order_service.store.append({"order_id": "١٢٣٤٥", "name": "أحمد", "items": ["دجاج مشوي"]})
+    # Act
+    order = order_service.get_order_by_id("٩٩٩٩٩")
+    # Assert
+    assert order is None
+
+def test_process_order_request_should_persist_order_across_restarts(tmp_path):
+    # Arrange
+    orders_file = str(tmp_path / "orders.json")
+    service = OrderServiceImpl(orders_file)
+    # Act
+    result = service.process_order_request("أحمد", ["دجاج مشوي"], [])
+    service.store.close()
+    reloaded = OrderServiceImpl(orders_file)
+    # Assert
+    assert reloaded.get_order_by_id(result["order_id"])["name"] == "أحمد"
+
+def test_update_order_status_should_move_order_and_keep_history(order_service):
+    # Arrange
+    order = order_service.process_order_request("أحمد", ["دجاج مشوي"], [])
+    # Act
+    order_service.update_order_status(order["order_id"], "preparing")
+    updated = order_service.update_order_status(order["order_id"], "ready")
+    # Assert
+    assert updated["status"] == "ready"
+    assert [entry["status"] for entry in updated["status_history"]] == ["pending", "preparing", "ready"]
+    assert order_service.get_order_by_id(order["order_id"])["status"] == "ready"
+
+def test_update_order_status_should_not_rewrite_snapshot(order_service):
+    # Arrange
+    order = order_service.process_order_request("أحمد", ["دجاج مشوي"], [])
+    with open(order_service.orders_file, encoding="utf-8") as f:
+        snapshot = f.read()
+    # Act
+    order_service.update_order_status(order["order_id"], "preparing")
+    # Assert
+    with open(order_service.orders_file, encoding="utf-8") as f:
+        assert f.read() == snapshot
+
+def test_process_status_update_api_request_should_reject_disallowed_move(order_service):
+    # Arrange
+    order = order_service.process_order_request("أحمد", ["دجاج مشوي"], [])
+    # Act
+    response, status_code = order_service.process_status_update_api_request(order["order_id"], "delivered")
+    # Assert
+    assert status_code == 409
+    assert response["allowed"] == ["preparing", "cancelled"]
+
+def test_process_status_update_api_request_should_reject_unknown_status(order_service):
+    # Act
+    response, status_code = order_service.process_status_update_api_request("٠٠٠٠١", "eaten")
+    # Assert
+    assert status_code == 400
+
+def test_process_status_update_api_request_should_return_404_for_missing_order(order_service):
+    # Act
+    response, status_code = order_service.process_status_update_api_request("٩٩٩٩٩", "preparing")
+    # Assert
+    assert status_code == 404
+
+def test_cancel_order_should_refuse_delivered_order(order_service):
+    # Arrange
+    order = order_service.process_order_request("أحمد", ["دجاج مشوي"], [])
+    for status in ("preparing", "ready", "delivered"):
+        order_service.update_order_status(order["order_id"], status)
+    # Act / Assert
+    with pytest.raises(InvalidStatusTransitionError):
+        order_service.cancel_order(order["order_id"])
+
+def test_order_writes_should_publish_events(tmp_path):
+    # Arrange
+    from unittest.mock import MagicMock
+    event_service = MagicMock()
+    service = OrderServiceImpl(str(tmp_path / "orders.json"), event_service=event_service)
+    # Act
+    order = service.process_order_request("أحمد", ["دجاج مشوي"], [])
+    service.update_order_status(order["order_id"], "preparing")
+    # Assert
+    assert [call.args[0] for call in event_service.publish.call_args_list] == ["order_created", "order_updated"]
+
+def test_extract_order_items_should_return_items_in_spoken_order_once(order_service):
+    # Arrange
+    text = "بدي عصير وشاورما وكمان عصير"
+    # Act
+    items = order_service.extract_order_items(text)
+    # Assert
+    assert items == ["عصير", "شاورما"]
+
+def test_extract_order_items_should_match_spelling_variants(order_service):
+    # Arrange
+    text = "بدي دجاج مشوى وسلطه وصحن ارز"
+    # Act
+    items = order_service.extract_order_items(text)
+    # Assert
+    assert items == ["دجاج مشوي", "سلطة", "صحن أرز"]
+
+def test_extract_order_lines_should_return_quantities_and_modifiers(order_service):
+    # Arrange
+    text = "بدي تنين شاورما بدون ثوم وثلاث عصير"
+    # Act
+    lines = order_service.extract_order_lines(text)
+    items = order_service.extract_order_items(text)
+    # Assert
+    assert [line.to_dict() for line in lines] == [
+        {"item": "شاورما", "quantity": 2, "modifiers": ["بدون ثوم"]},
+        {"item": "عصير", "quantity": 3, "modifiers": []},
+    ]
+    assert items == ["شاورما", "عصير"]
+
+def test_process_order_request_should_store_order_lines(order_service):
+    # Arrange
+    lines = [{"item": "شاورما", "quantity": 2, "modifiers": ["حار"]}]
+    # Act
+    order = order_service.process_order_request("أحمد", [], [], lines)
+    rejected = order_service.process_order_request("أحمد", [], [], [{"item": "شاورما", "quantity": 0}])
+    unclear = order_service.process_order_request("أحمد", [], [], [{"item": "شاورما", "quantity_unclear": True}])
+    # Assert
+    assert order["items"] == ["شاورما"]
+    assert order["lines"] == [dict(lines[0], unit_price=15000)]
+    assert "error" in rejected
+    assert "error" in unclear
+
+
+def test_process_order_request_should_price_lines_when_placed(order_service):
+    # Act
+    order = order_service.process_order_request("أحمد", ["دجاج مشوي", "عصير"], [])
+    # Assert
+    assert order["lines"] == [
+        {"item": "دجاج مشوي", "quantity": 1, "modifiers": [], "unit_price": 25000},
+        {"item": "عصير", "quantity": 1, "modifiers": [], "unit_price": 5000},
+    ]
@@ -0,0 +1,119 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from services.impl.order_stores.base import InvalidCursorError, decode_cursor, encode_cursor
+from services.impl.order_stores.json_log_store import JsonLogOrderStore
+from services.impl.order_stores.sqlite_store import SqliteOrderStore
+
+
+def make_order(i, name="أحمد", status="pending"):
+    return {"order_id": str(i), "name": name, "items": ["دجاج مشوي"],
+            "timestamp": f"2025-07-{10 + i:02d}T12:00:00", "status": status}
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        store = JsonLogOrderStore(str(tmp_path / "orders.json"))
+    else:
+        store = SqliteOrderStore(str(tmp_path / "orders.db"))
+    for i in range(10):
+        store.append(make_order(i, name="سارة" if i % 2 else "أحمد", status="ready" if i % 3 == 0 else "pending"))
+    yield store
+    store.close()
+
+
+def ids(orders):
+    return [order["order_id"] for order in orders]
+
+
+def test_encode_cursor_should_round_trip():
+    # Act
+    cursor = encode_cursor("2025-07-27T11:24:50", 42)
+    # Assert
+    assert decode_cursor(cursor) == ("2025-07-27T11:24:50", 42)
+
+
+def test_decode_cursor_should_reject_garbage():
+    # Act / Assert
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+def test_query_should_page_through_all_orders_with_cursor(store):
+    # Arrange
+    pages = []
+    cursor = None
+    # Act
+    while True:
+        orders, cursor = store.query(cursor=cursor, limit=4)
+        pages.append(ids(orders))
+        if cursor is None:
+            break
+    # Assert
+    assert pages == [["0", "1", "2", "3"], ["4", "5", "6", "7"], ["8", "9"]]
+
+
+def test_query_should_filter_by_status_and_name(store):
+    # Act
+    orders, cursor = store.query(status="ready", name="أحمد")
+    # Assert
+    assert ids(orders) == ["0", "6"]
+    assert cursor is None
+
+
+def test_query_should_filter_by_time_range(store):
+    # Act
+    orders, _ = store.query(since="2025-07-12T00:00:00", until="2025-07-15T12:00:00")
+    # Assert
+    assert ids(orders) == ["2", "3", "4"]
+
+
+def test_query_should_reflect_status_updates(store):
+    # Arrange
+    updated = make_order(1, name="سارة", status="ready")
+    # Act
+    store.append(updated)
+    ready, _ = store.query(status="ready")
+    pending, _ = store.query(status="pending")
+    # Assert
+    assert ids(ready) == ["0", "1", "3", "6", "9"]
+    assert "1" not in ids(pending)
+
+
+def test_iter_orders_should_stream_every_match_in_pages(store):
+    # Act
+    orders = list(store.iter_orders(page_size=3, name="سارة"))
+    # Assert
+    assert ids(orders) == ["1", "3", "5", "7", "9"]
+
+
+def test_update_should_apply_mutation_and_persist(store):
+    # Arrange
+    def mark_ready(order):
+        order["status"] = "ready"
+        return order
+    # Act
+    updated = store.update("2", mark_ready)
+    # Assert
+    assert updated["status"] == "ready"
+    assert store.get("2")["status"] == "ready"
+
+
+def test_update_should_return_none_for_missing_order(store):
+    # Act / Assert
+    assert store.update("missing", lambda order: order) is None
+
+
+def test_update_should_leave_order_untouched_when_mutation_fails(store):
+    # Arrange
+    def fail(order):
+        order["status"] = "broken"
+        raise ValueError("no")
+    # Act
+    with pytest.raises(ValueError):
+        store.update("2", fail)
+    # Assert
+    assert store.get("2")["status"] == "pending"
@@ -0,0 +1,81 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+from string import Formatter
+import pytest
+from constants.reply_constants import REPLY_TEMPLATES
+from services.impl.branch_service_impl import Branch
+from services.impl.menu_service_impl import MenuServiceImpl
+from services.impl.reply_service_impl import ReplyServiceImpl
+
+MENU = {"items": [{"name": "دجاج مشوي", "price": 25000}, {"name": "عصير", "price": 5000}]}
+
+# Slots the handlers fill per reply; everything else must come from the menu or branch
+REQUEST_SLOTS = {"items", "missing_items", "name", "order_id", "status"}
+
+
+def write_menu(path, menu):
+    path.write_text(json.dumps(menu, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def menu_file(tmp_path):
+    path = tmp_path / "menu.json"
+    write_menu(path, MENU)
+    return path
+
+
+@pytest.fixture
+def branch(menu_file):
+    return Branch("north", MenuServiceImpl(str(menu_file), check_interval=None), phone="222")
+
+
+def test_replies_should_be_rendered_once_per_menu_version(branch):
+    # Arrange
+    service = ReplyServiceImpl()
+    # Act
+    first = service.for_branch(branch)
+    second = service.for_branch(branch)
+    # Assert
+    assert first is second
+    assert first.get("phone") == "رقم خدمة العملاء هو 222."
+    assert first.get("prices") == "أسعارنا كالتالي: 🍽️ دجاج مشوي: 25,000 ليرة، 🍽️ عصير: 5,000 ليرة. الأسعار تشمل الضريبة!"
+    assert first.get("menu") is second.get("menu")
+
+
+def test_replies_should_be_rerendered_after_menu_reload(branch, menu_file):
+    # Arrange
+    service = ReplyServiceImpl()
+    before = service.for_branch(branch).get("no_items")
+    write_menu(menu_file, {"items": [{"name": "شاورما", "price": 15000}]})
+    branch.menu_service.reload()
+    # Act
+    after = service.for_branch(branch).get("no_items")
+    # Assert
+    assert "دجاج مشوي" in before
+    assert after == "أهلاً! الأطباق المتوفرة لدينا: شاورما. من فضلك أخبرني ماذا تريد أن تطلب."
+
+
+def test_request_slots_should_be_filled_per_reply(branch, menu_file):
+    # Arrange
+    write_menu(menu_file, {"items": [{"name": "عصير {طازج}", "price": 5000}]})
+    branch.menu_service.reload()
+    replies = ReplyServiceImpl().for_branch(branch)
+    # Act
+    reply = replies.get("welcome_name", name="سارة")
+    # Assert
+    assert reply == "أهلاً سارة! الأطباق المتوفرة لدينا: عصير {طازج}. ما الذي ترغب بطلبه اليوم؟"
+
+
+@pytest.mark.parametrize("key", sorted(REPLY_TEMPLATES))
+def test_templates_should_only_use_known_request_slots(branch, key):
+    # Arrange
+    replies = ReplyServiceImpl().for_branch(branch)
+    # Act
+    slots = {field for _, field, _, _ in Formatter().parse(REPLY_TEMPLATES[key]) if field}
+    # Assert
+    assert replies.request_slots[key] <= REQUEST_SLOTS
+    assert replies.request_slots[key] == slots & REQUEST_SLOTS
@@ -0,0 +1,149 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from services.impl.session_service_impl import SessionServiceImpl
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def session_service(clock):
+    return SessionServiceImpl(max_sessions=3, idle_ttl_seconds=60, clock=clock)
+
+
+def test_get_or_create_should_issue_new_session_id(session_service):
+    # Act
+    session = session_service.get_or_create()
+    # Assert
+    assert session.session_id
+    assert session_service.get(session.session_id) is session
+
+
+def test_get_or_create_should_return_existing_session(session_service):
+    # Arrange
+    session = session_service.get_or_create("abc")
+    # Act
+    again = session_service.get_or_create("abc")
+    # Assert
+    assert again is session
+
+
+def test_record_turn_should_accumulate_state(session_service):
+    # Arrange
+    session_id = session_service.get_or_create().session_id
+    # Act
+    session_service.record_turn(session_id, {"intent": "place_order", "items": ["شاورما"], "name": None})
+    session_service.record_turn(session_id, {"intent": "place_order", "items": ["شاورما", "عصير"]})
+    session = session_service.record_turn(session_id, {"intent": "provide_name", "items": [], "name": "أحمد"})
+    # Assert
+    assert session.items == ["شاورما", "عصير"]
+    assert session.name == "أحمد"
+    assert session.last_intent == "provide_name"
+    assert session.turn_count == 3
+
+
+def test_record_turn_should_ignore_items_from_menu_requests(session_service):
+    # Arrange
+    session_id = session_service.get_or_create().session_id
+    # Act
+    session = session_service.record_turn(session_id, {"intent": "greeting_and_menu_request", "items": ["عصير"]})
+    # Assert
+    assert session.items == []
+
+
+def test_record_turn_should_clear_items_on_cancel(session_service):
+    # Arrange
+    session_id = session_service.get_or_create().session_id
+    session_service.record_turn(session_id, {"intent": "place_order", "items": ["شاورما"]})
+    # Act
+    session = session_service.record_turn(session_id, {"intent": "cancel_order", "items": []})
+    # Assert
+    assert session.items == []
+
+
+def test_record_order_should_reset_basket(session_service):
+    # Arrange
+    session_id = session_service.get_or_create().session_id
+    session_service.record_turn(session_id, {"intent": "place_order", "items": ["شاورما"], "name": "سامر"})
+    # Act
+    session_service.record_order(session_id, {"order_id": "١٢٣٤٥"})
+    # Assert
+    session = session_service.get(session_id)
+    assert session.items == []
+    assert session.last_order_id == "١٢٣٤٥"
+    assert session.name == "سامر"
+
+
+def test_idle_sessions_should_expire(session_service, clock):
+    # Arrange
+    session_id = session_service.get_or_create().session_id
+    # Act
+    clock.now = 61
+    # Assert
+    assert session_service.get(session_id) is None
+    assert len(session_service) == 0
+
+
+def test_access_should_refresh_idle_timer(session_service, clock):
+    # Arrange
+    session_id = session_service.get_or_create().session_id
+    clock.now = 50
+    session_service.get(session_id)
+    # Act
+    clock.now = 100
+    # Assert
+    assert session_service.get(session_id) is not None
+
+
+def test_store_should_drop_least_recently_used_when_full(session_service):
+    # Arrange
+    ids = [session_service.get_or_create().session_id for _ in range(3)]
+    session_service.get(ids[0])
+    # Act
+    session_service.get_or_create()
+    # Assert
+    assert len(session_service) == 3
+    assert session_service.get(ids[1]) is None
+    assert session_service.get(ids[0]) is not None
+
+
+def test_record_turn_should_keep_latest_quantity_per_line(session_service):
+    # Arrange
+    session_id = session_service.get_or_create().session_id
+    # Act
+    session_service.record_turn(session_id, {"intent": "place_order", "items": ["شاورما"],
+                                             "lines": [{"item": "شاورما", "quantity": 1, "modifiers": []}]})
+    session = session_service.record_turn(session_id, {"intent": "place_order", "items": ["شاورما", "عصير"], "lines": [
+        {"item": "شاورما", "quantity": 3, "modifiers": []},
+        {"item": "عصير", "quantity": 1, "modifiers": []},
+    ]})
+    # Assert
+    assert session.to_dict()["lines"] == [
+        {"item": "شاورما", "quantity": 3, "modifiers": []},
+        {"item": "عصير", "quantity": 1, "modifiers": []},
+    ]
+
+
+def test_record_turn_should_leave_out_lines_with_an_unclear_quantity(session_service):
+    # Arrange
+    session_id = session_service.get_or_create().session_id
+    # Act
+    session = session_service.record_turn(session_id, {"intent": "place_order", "items": ["شاورما", "عصير"], "lines": [
+        {"item": "شاورما", "quantity": 1, "modifiers": [], "quantity_unclear": True},
+        {"item": "عصير", "quantity": 2, "modifiers": []},
+    ]})
+    # Assert
+    assert session.to_dict()["lines"] == [{"item": "عصير", "quantity": 2, "modifiers": []}]
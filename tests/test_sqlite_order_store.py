@@ -0,0 +1,127 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import threading
+import pytest
+from services.impl.order_stores.sqlite_store import SqliteOrderStore
+from services.impl.order_stores.json_log_store import JsonLogOrderStore
+from services.impl.order_stores.factory import create_order_store
+from migrate_orders import migrate
+
+
+def make_order(order_id, name="أحمد", status="pending"):
+    return {"order_id": order_id, "name": name, "items": ["دجاج مشوي"],
+            "timestamp": "2025-07-27T11:24:50", "status": status}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SqliteOrderStore(str(tmp_path / "orders.db"))
+    yield store
+    store.close()
+
+
+def test_store_should_use_wal_and_indexes(store):
+    # Act
+    connection = store._connection()
+    journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+    indexes = {row[1] for row in connection.execute("PRAGMA index_list(orders)")}
+    # Assert
+    assert journal_mode == "wal"
+    assert {"idx_orders_name_timestamp", "idx_orders_status_timestamp", "idx_orders_timestamp"} <= indexes
+
+
+def test_append_should_round_trip_order(store):
+    # Arrange
+    order = make_order("١٢٣٤٥")
+    # Act
+    store.append(order)
+    # Assert
+    assert store.get("١٢٣٤٥") == order
+    assert store.get("٩٩٩٩٩") is None
+    assert store.list() == [order]
+
+
+def test_append_should_update_existing_order_in_place(store):
+    # Arrange
+    store.append(make_order("١"))
+    store.append(make_order("٢"))
+    # Act
+    store.append(make_order("١", status="ready"))
+    # Assert
+    assert len(store) == 2
+    assert [order["status"] for order in store.list()] == ["ready", "pending"]
+
+
+def test_store_should_give_each_thread_its_own_connection(store):
+    # Arrange
+    connections = []
+    def write(i):
+        store.append(make_order(str(i)))
+        connections.append(store._connection())
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Assert
+    assert len(store) == 4
+    assert len({id(connection) for connection in connections}) == 4
+
+
+def test_create_order_store_should_pick_backend_from_env(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("ORDER_STORE", "sqlite")
+    monkeypatch.setenv("ORDER_DB_FILE", str(tmp_path / "env.db"))
+    # Act
+    store = create_order_store(orders_file=str(tmp_path / "orders.json"))
+    # Assert
+    assert isinstance(store, SqliteOrderStore)
+    assert store.db_file == str(tmp_path / "env.db")
+    store.close()
+
+
+def test_create_order_store_should_reject_unknown_backend():
+    # Act / Assert
+    with pytest.raises(ValueError):
+        create_order_store("redis")
+
+
+def test_migrate_should_copy_snapshot_and_log(tmp_path):
+    # Arrange
+    source = str(tmp_path / "orders.json")
+    with open(source, "w", encoding="utf-8") as f:
+        json.dump([make_order("١")], f, ensure_ascii=False)
+    json_store = JsonLogOrderStore(source)
+    json_store.append(make_order("٢"))
+    json_store.close()
+    db_file = str(tmp_path / "orders.db")
+    # Act
+    count = migrate(source, db_file)
+    count_again = migrate(source, db_file)
+    # Assert
+    migrated = SqliteOrderStore(db_file)
+    assert count == count_again == 2
+    assert [order["order_id"] for order in migrated.list()] == ["١", "٢"]
+    migrated.close()
+
+
+def test_changes_should_number_writes_from_every_worker(tmp_path):
+    # Arrange
+    reader = SqliteOrderStore(str(tmp_path / "orders.db"), change_history=2)
+    writer = SqliteOrderStore(str(tmp_path / "orders.db"), change_history=2)
+    reader.append(make_order("١"))
+    # Act
+    writer.append(make_order("٢"))
+    writer.update("١", lambda order: {**order, "status": "preparing"})
+    # Assert: only the last two changes are kept
+    assert [(seq, order["status"]) for seq, order in reader.changes(1)] == [(2, "pending"), (3, "preparing")]
+    assert reader.changes(0) is None
+    assert reader.changes(3) == []
+    assert reader.changes(4) is None
+    assert reader.change_seq() == 3
+    reader.close()
+    writer.close()
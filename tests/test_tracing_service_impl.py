@@ -0,0 +1,78 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import pytest
+from services.impl.tracing_service_impl import TracingServiceImpl, current_trace_id
+from services.impl.metrics_service_impl import MetricsServiceImpl
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "slow_traces.jsonl")
+
+def _read(log_path):
+    with open(log_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_span_should_be_noop_outside_trace(log_path):
+    # Arrange
+    tracing = TracingServiceImpl(slow_threshold_ms=0, log_path=log_path)
+    # Act
+    with tracing.span("transcribe") as span:
+        pass
+    # Assert
+    assert span is None
+    assert not os.path.exists(log_path)
+
+def test_trace_should_write_span_tree_when_slow(log_path):
+    # Arrange
+    tracing = TracingServiceImpl(slow_threshold_ms=0, log_path=log_path)
+    # Act
+    with tracing.trace("POST /voice-agent", "trace-1"):
+        assert current_trace_id() == "trace-1"
+        with tracing.span("upload_read"):
+            pass
+        with tracing.span("handler"):
+            with tracing.span("extract_items"):
+                pass
+    # Assert
+    records = _read(log_path)
+    assert len(records) == 1
+    assert records[0]["trace_id"] == "trace-1"
+    children = records[0]["spans"]["children"]
+    assert [child["name"] for child in children] == ["upload_read", "handler"]
+    assert children[1]["children"][0]["name"] == "extract_items"
+    assert current_trace_id() is None
+
+def test_trace_should_skip_fast_requests(log_path):
+    # Arrange
+    tracing = TracingServiceImpl(slow_threshold_ms=60_000, log_path=log_path)
+    # Act
+    with tracing.trace("GET /"):
+        pass
+    # Assert
+    assert not os.path.exists(log_path)
+
+def test_trace_should_record_errors(log_path):
+    # Arrange
+    tracing = TracingServiceImpl(slow_threshold_ms=0, log_path=log_path)
+    # Act
+    with pytest.raises(RuntimeError):
+        with tracing.trace("POST /tts"):
+            with tracing.span("tts"):
+                raise RuntimeError("ElevenLabs down")
+    # Assert
+    span = _read(log_path)[0]["spans"]["children"][0]
+    assert "ElevenLabs down" in span["error"]
+
+def test_metrics_time_stage_should_open_span():
+    # Arrange
+    from services.impl.tracing_service_impl import tracing_service
+    metrics = MetricsServiceImpl()
+    # Act
+    with tracing_service.trace("POST /detect-intent") as root:
+        with metrics.time_stage("generate"):
+            pass
+    # Assert
+    assert [child.name for child in root.children] == ["generate"]
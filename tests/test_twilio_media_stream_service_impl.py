@@ -0,0 +1,204 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import base64
+import io
+import json
+import math
+import threading
+import wave
+import pytest
+from array import array
+from unittest.mock import MagicMock, AsyncMock
+from services.impl.admission_service_impl import AdmissionRejectedError
+from services.impl.voice_agent_service_impl import VoiceAgentServiceImpl
+from services.impl.twilio_media_stream_service_impl import (
+    TwilioMediaStreamServiceImpl, IncrementalResampler, ulaw_decode, ulaw_encode, load_recorded_frames
+)
+
+
+def _frames(ms, amplitude):
+    """Build 20 ms Twilio media messages of a 440 Hz tone (amplitude 0 = silence)"""
+    messages = []
+    for frame in range(ms // 20):
+        samples = [int(amplitude * math.sin(2 * math.pi * 440 * (frame * 160 + n) / 8000)) for n in range(160)]
+        payload = base64.b64encode(ulaw_encode(samples)).decode("ascii")
+        messages.append({"event": "media", "streamSid": "MZ123", "media": {"payload": payload}})
+    return messages
+
+
+def _recording(*segments):
+    messages = [
+        {"event": "connected", "protocol": "Call", "version": "1.0.0"},
+        {"event": "start", "streamSid": "MZ123", "start": {"streamSid": "MZ123", "callSid": "CA456"}},
+    ]
+    for ms, amplitude in segments:
+        messages.extend(_frames(ms, amplitude))
+    messages.append({"event": "stop", "streamSid": "MZ123"})
+    return messages
+
+
+@pytest.fixture
+def media_stream_service():
+    whisper = MagicMock()
+    whisper.transcribe_audio = AsyncMock(return_value="بدي شاورما")
+    tts = MagicMock()
+    tts.synthesize_speech.return_value = b"\xff" * 480
+    # A real voice agent, so replies go through its TTS cache
+    voice_agent = VoiceAgentServiceImpl(tts, whisper, MagicMock(), order_service=MagicMock())
+    voice_agent.extract_intent = MagicMock(
+        return_value={"intent": "place_order", "reply_text": "ممتاز! من فضلك أخبرني باسمك."})
+    return TwilioMediaStreamServiceImpl(whisper, voice_agent, tts)
+
+
+def test_ulaw_round_trip_should_stay_close_to_original():
+    # Arrange
+    samples = [0, 100, -100, 1000, -1000, 12000, -12000, 32000]
+    # Act
+    decoded = ulaw_decode(ulaw_encode(samples))
+    # Assert
+    for original, restored in zip(samples, decoded):
+        assert abs(original - restored) <= max(8, abs(original) // 16)
+
+
+def test_incremental_resampler_should_double_sample_count_across_chunks():
+    # Arrange
+    resampler = IncrementalResampler(8000, 16000)
+    chunk = array('h', range(160))
+    # Act
+    total = sum(len(resampler.process(chunk)) for _ in range(50))
+    # Assert
+    assert abs(total - 16000) <= 2
+
+
+@pytest.mark.asyncio
+async def test_replay_should_answer_one_utterance(media_stream_service):
+    # Arrange
+    recording = _recording((200, 0), (1000, 8000), (1000, 0))
+    # Act
+    session, outbound = await media_stream_service.replay(recording)
+    # Assert
+    media_stream_service.whisper_service.transcribe_audio.assert_awaited_once()
+    media_stream_service.tts_service.synthesize_speech.assert_called_once_with(
+        "ممتاز! من فضلك أخبرني باسمك.", output_format="ulaw_8000"
+    )
+    media = [m for m in outbound if m["event"] == "media"]
+    assert len(media) == 3
+    assert all(m["streamSid"] == "MZ123" for m in media)
+    assert outbound[-1]["event"] == "mark"
+    assert session.call_sid == "CA456"
+    assert len(session.reply_latencies) == 1
+    assert session.reply_latencies[0] >= 0
+
+
+@pytest.mark.asyncio
+async def test_replay_should_run_intent_and_tts_off_the_event_loop(media_stream_service):
+    # Arrange
+    loop_thread = threading.get_ident()
+    threads = []
+    voice_agent = media_stream_service.voice_agent_service
+    voice_agent.extract_intent.side_effect = lambda *args: threads.append(threading.get_ident()) or {
+        "intent": "greeting", "reply_text": "أهلاً"}
+    media_stream_service.tts_service.synthesize_speech.side_effect = \
+        lambda *args, **kwargs: threads.append(threading.get_ident()) or b"\xff" * 160
+    # Act
+    await media_stream_service.replay(_recording((1000, 8000), (1000, 0), (1000, 8000), (1000, 0)))
+    # Assert: the second, identical reply came from the TTS cache
+    assert len(threads) == 3
+    assert loop_thread not in threads
+    media_stream_service.tts_service.synthesize_speech.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_replay_should_drop_reply_when_admission_is_rejected(media_stream_service):
+    # Arrange
+    admission = MagicMock()
+    admission.slot.return_value.__aenter__.side_effect = AdmissionRejectedError("voice-agent", "queue full", 5)
+    media_stream_service.admission_service = admission
+    # Act
+    session, outbound = await media_stream_service.replay(_recording((1000, 8000), (1000, 0)))
+    # Assert
+    admission.slot.assert_called_once_with("voice-agent")
+    media_stream_service.whisper_service.transcribe_audio.assert_not_awaited()
+    assert outbound == []
+    assert session.reply_latencies == []
+
+
+@pytest.mark.asyncio
+async def test_replay_should_keep_the_call_after_a_failed_utterance(media_stream_service):
+    # Arrange
+    media_stream_service.whisper_service.transcribe_audio.side_effect = [RuntimeError("whisper crashed"), "بدي شاورما"]
+    # Act
+    session, outbound = await media_stream_service.replay(_recording((1000, 8000), (1000, 0), (1000, 8000), (1000, 0)))
+    # Assert
+    assert media_stream_service.whisper_service.transcribe_audio.await_count == 2
+    assert session.transcriptions == ["بدي شاورما"]
+    assert len(session.reply_latencies) == 1
+    assert outbound[-1]["event"] == "mark"
+
+
+@pytest.mark.asyncio
+async def test_replay_should_send_16khz_wav_to_whisper(media_stream_service):
+    # Arrange
+    recording = _recording((1000, 8000), (1000, 0))
+    # Act
+    await media_stream_service.replay(recording)
+    # Assert
+    wav_bytes = media_stream_service.whisper_service.transcribe_audio.call_args[0][0]
+    with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+        assert wav_file.getframerate() == 16000
+        assert wav_file.getnchannels() == 1
+        assert wav_file.getnframes() >= 16000
+
+
+@pytest.mark.asyncio
+async def test_replay_should_split_utterances_on_silence(media_stream_service):
+    # Arrange
+    recording = _recording((800, 8000), (1000, 0), (800, 8000), (1000, 0))
+    # Act
+    session, _ = await media_stream_service.replay(recording)
+    # Assert
+    assert media_stream_service.whisper_service.transcribe_audio.await_count == 2
+    assert len(session.reply_latencies) == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_should_ignore_silence_and_short_noise(media_stream_service):
+    # Arrange
+    recording = _recording((1000, 0), (100, 8000), (1000, 0))
+    # Act
+    session, outbound = await media_stream_service.replay(recording)
+    # Assert
+    media_stream_service.whisper_service.transcribe_audio.assert_not_awaited()
+    assert outbound == []
+
+
+@pytest.mark.asyncio
+async def test_replay_should_flush_pending_utterance_on_stop(media_stream_service):
+    # Arrange
+    recording = _recording((1000, 8000))
+    # Act
+    session, outbound = await media_stream_service.replay(recording)
+    # Assert
+    media_stream_service.whisper_service.transcribe_audio.assert_awaited_once()
+    assert any(m["event"] == "media" for m in outbound)
+
+
+@pytest.mark.asyncio
+async def test_replay_should_accept_recorded_frames_file(media_stream_service, tmp_path):
+    # Arrange
+    path = tmp_path / "call.jsonl"
+    path.write_text("\n".join(json.dumps(m) for m in _recording((1000, 8000), (1000, 0))), encoding="utf-8")
+    # Act
+    session, outbound = await media_stream_service.replay(load_recorded_frames(str(path)))
+    # Assert
+    assert session.stream_sid == "MZ123"
+    assert len(session.reply_latencies) == 1
+
+
+def test_build_twiml_should_connect_stream():
+    # Act
+    twiml = TwilioMediaStreamServiceImpl.build_twiml("wss://example.com/twilio/media-stream")
+    # Assert
+    assert '<Stream url="wss://example.com/twilio/media-stream" />' in twiml
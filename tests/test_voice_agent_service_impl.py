@@ -218,4 +218,79 @@ def test_extract_intent_should_handle_handler_exception(voice_agent_service):
         
         # Assert
         assert result["intent"] == "unknown"
-        assert "عذراً، لم أفهم ما تقصده" in result["reply_text"] 
\ No newline at end of file
+        assert "عذراً، لم أفهم ما تقصده" in result["reply_text"] 
+def test_extract_intent_should_use_session_name_and_record_turn(mock_services):
+    # Arrange
+    from services.impl.session_service_impl import SessionServiceImpl
+    tts, whisper, intent = mock_services
+    session_service = SessionServiceImpl()
+    session_id = session_service.get_or_create().session_id
+    session_service.record_turn(session_id, {"intent": "provide_name", "name": "أحمد", "items": []})
+    intent.detect_intent.return_value = '{"intent": "place_order"}'
+    service = VoiceAgentServiceImpl(tts, whisper, intent, session_service)
+    
+    # Act
+    result = service.extract_intent("أريد دجاج مشوي", session_id)
+    
+    # Assert
+    assert result["name"] == "أحمد"
+    assert result["order_is_valid"] is True
+    session = session_service.get(session_id)
+    assert session.items == ["دجاج مشوي"]
+    assert session.turn_count == 2
+
+def test_extract_intent_should_cancel_the_sessions_last_order(mock_services, tmp_path):
+    # Arrange
+    from services.impl.session_service_impl import SessionServiceImpl
+    from services.impl.order_service_impl import OrderServiceImpl
+    tts, whisper, intent = mock_services
+    session_service = SessionServiceImpl()
+    order_service = OrderServiceImpl(str(tmp_path / "orders.json"))
+    session_id = session_service.get_or_create().session_id
+    order = order_service.process_order_request("أحمد", ["دجاج مشوي"], [])
+    session_service.record_order(session_id, order)
+    intent.detect_intent.return_value = '{"intent": "cancel_order"}'
+    service = VoiceAgentServiceImpl(tts, whisper, intent, session_service, order_service=order_service)
+    
+    # Act
+    result = service.extract_intent("بدي إلغاء الطلب", session_id)
+    
+    # Assert
+    assert result["order_id"] == order["order_id"]
+    assert order_service.get_order_by_id(order["order_id"])["status"] == "cancelled"
+
+def test_generate_audio_should_serve_repeated_text_from_cache(mock_services):
+    # Arrange
+    from services.impl.metrics_service_impl import MetricsServiceImpl
+    tts, whisper, intent = mock_services
+    tts.synthesize_speech.return_value = b"audio-bytes"
+    metrics = MetricsServiceImpl()
+    service = VoiceAgentServiceImpl(tts, whisper, intent, metrics_service=metrics)
+    
+    # Act
+    first = service.generate_audio("أهلاً")
+    second = service.generate_audio("أهلاً")
+    
+    # Assert
+    assert first == second
+    tts.synthesize_speech.assert_called_once()
+    assert metrics.cache_hits.value(cache="tts") == 1
+    assert metrics.tts_bytes.value() == len(b"audio-bytes")
+
+@pytest.mark.asyncio
+async def test_handle_audio_request_should_time_each_stage(mock_services):
+    # Arrange
+    from services.impl.metrics_service_impl import MetricsServiceImpl
+    tts, whisper, intent = mock_services
+    whisper.transcribe_audio = AsyncMock(return_value="مرحبا")
+    intent.detect_intent.return_value = '{"intent": "greeting", "reply_text": "مرحبا بك"}'
+    tts.synthesize_speech.return_value = b"audio-bytes"
+    metrics = MetricsServiceImpl()
+    service = VoiceAgentServiceImpl(tts, whisper, intent, metrics_service=metrics)
+    
+    # Act
+    await service.handle_audio_request(b"test audio")
+    
+    # Assert
+    for stage in ["transcribe", "detect_intent", "handler", "tts"]:
+        assert metrics.stage_latency.count(stage=stage) == 1
@@ -0,0 +1,88 @@
+"""
+Summarize the slow-request log written by TracingServiceImpl.
+
+    python trace_report.py                    # 10 slowest traces with their span trees
+    python trace_report.py --top 5 --stages   # plus per-span latency percentiles
+"""
+import argparse
+import glob
+import json
+import os
+from collections import defaultdict
+
+from constants.app_constants import SLOW_TRACE_LOG_PATH
+
+
+def load_traces(log_path: str) -> list:
+    traces = []
+    # Include rotated files (slow_traces.jsonl.1, .2, ...)
+    for path in [log_path] + sorted(glob.glob(f"{log_path}.*")):
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    traces.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return traces
+
+
+def format_span_tree(span: dict, depth: int = 0) -> list:
+    error = f"  !! {span['error']}" if span.get("error") else ""
+    lines = [f"{'  ' * depth}{span['name']:<{32 - 2 * depth}} {span['duration_ms']:>10.1f} ms  (+{span['offset_ms']:.1f}){error}"]
+    for child in span.get("children", []):
+        lines.extend(format_span_tree(child, depth + 1))
+    return lines
+
+
+def collect_span_durations(span: dict, durations: dict):
+    for child in span.get("children", []):
+        durations[child["name"]].append(child["duration_ms"])
+        collect_span_durations(child, durations)
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize slow request traces")
+    parser.add_argument("--log", default=os.getenv("SLOW_TRACE_LOG_PATH", SLOW_TRACE_LOG_PATH))
+    parser.add_argument("--top", type=int, default=10, help="number of slowest traces to print")
+    parser.add_argument("--route", help="only traces whose name contains this text, e.g. /voice-agent")
+    parser.add_argument("--stages", action="store_true", help="print per-span latency percentiles")
+    args = parser.parse_args()
+
+    traces = load_traces(args.log)
+    if args.route:
+        traces = [t for t in traces if args.route in t.get("name", "")]
+    if not traces:
+        print(f"No slow traces found in {args.log}")
+        return
+
+    traces.sort(key=lambda t: t["duration_ms"], reverse=True)
+    print(f"{len(traces)} slow traces in {args.log}\n")
+    for trace in traces[:args.top]:
+        print(f"{trace['timestamp']}  {trace['trace_id']}  {trace['name']}  {trace['duration_ms']:.1f} ms")
+        for line in format_span_tree(trace["spans"], 1):
+            print(line)
+        print()
+
+    if args.stages:
+        durations = defaultdict(list)
+        for trace in traces:
+            collect_span_durations(trace["spans"], durations)
+        print(f"{'span':<24} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+        for name, values in sorted(durations.items(), key=lambda item: -sum(item[1])):
+            print(f"{name:<24} {len(values):>6} {percentile(values, 0.5):>10.1f} "
+                  f"{percentile(values, 0.95):>10.1f} {max(values):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()